@@ -0,0 +1,125 @@
+"""基于合成存档的基准测试。
+
+对每个规模依次生成世界并写成 .sav，然后计时编辑器的各个阶段：
+
+    load    convert_sav_to_dict，参数与 Application.select_source 相同
+    index   index_world，构建公会、玩家、帕鲁对象及筛选索引
+    filter  select_pals，按每个容器 ID 和每个角色 ID 各筛选一次
+    sort    按帕鲁列表的每一列排序一次，与 Application.sort_by 使用相同的键
+    edit    对至多 1000 只帕鲁调用 Pal.config (会触发 RawData 的完整解码)
+    save    palbin.dumps 与 convert_dict_to_sav
+
+Treeview 的插入和重绘需要显示器，不在计时范围内::
+
+    python bench.py --scales 1000 10000 100000
+"""
+
+from __future__ import annotations
+
+import gc
+import random
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+import palbin
+from run import (
+    PASSTHROUGH_SECTIONS,
+    convert_dict_to_sav,
+    convert_sav_to_dict,
+    index_world,
+    select_pals,
+    sort_key,
+)
+from synth import generate_world, write_sav
+
+DEFAULT_SCALES = (1000, 10000, 100000)
+STAGES = ("load", "index", "filter", "sort", "edit", "save_palbin", "save_sav")
+EDIT_COUNT = 1000
+
+
+def world_for_scale(pals: int, seed: int = 0):
+    # 每 100 只帕鲁对应一名玩家，每个公会 4 名玩家
+    players = 4
+    guilds = max(1, pals // (100 * players))
+    return generate_world(guilds, players, pals, seed=seed)
+
+
+def timed(results: dict, stage: str, func, *args, **kwargs):
+    gc.collect()
+    start = perf_counter()
+    result = func(*args, **kwargs)
+    results[stage] = perf_counter() - start
+    return result
+
+
+def sort_all_columns(pals: list):
+    for col in range(len(pals[0].values) if pals else 0):
+        data = [(str(pal.values[col]), pal) for pal in pals]
+        data.sort(key=lambda x: sort_key(x[0]))
+
+
+def filter_all(world_index):
+    for container_id in world_index.kv_container_id:
+        select_pals(world_index, container_id=container_id)
+    for character_id in world_index.kv_character_id:
+        select_pals(world_index, character_id=character_id)
+    select_pals(world_index)
+
+
+def edit_pals(pals: list, seed: int = 0):
+    rng = random.Random(seed)
+    for pal in rng.sample(pals, min(EDIT_COUNT, len(pals))):
+        pal.config("talent_hp", rng.randint(0, 100))
+        pal.config("exp", pal.exp + 1)
+
+
+def run_scale(pals: int, workdir: Path, seed: int = 0):
+    results = {}
+    sav_path = workdir / f"synth-{pals}.sav"
+    write_sav(world_for_scale(pals, seed), sav_path, keep_data=False)
+    data = timed(
+        results,
+        "load",
+        convert_sav_to_dict,
+        sav_path,
+        passthrough_sections=PASSTHROUGH_SECTIONS,
+        lazy_character_data=True,
+    )
+    world_save_data = data["properties"]["worldSaveData"]["value"]
+    world_index = timed(results, "index", index_world, world_save_data)
+    timed(results, "filter", filter_all, world_index)
+    timed(results, "sort", sort_all_columns, world_index.pals)
+    timed(results, "edit", edit_pals, world_index.pals, seed)
+    timed(results, "save_palbin", palbin.dumps, data)
+    timed(results, "save_sav", convert_dict_to_sav, data, workdir / "out.sav")
+    return results
+
+
+def run_benchmarks(scales=DEFAULT_SCALES, seed: int = 0):
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for pals in scales:
+            results[pals] = run_scale(pals, Path(workdir), seed)
+    return results
+
+
+def print_results(results: dict):
+    print(f"{'stage':<12}" + "".join(f"{pals:>12}" for pals in results))
+    for stage in STAGES:
+        print(
+            f"{stage:<12}"
+            + "".join(f"{results[pals][stage]:>12.3f}" for pals in results)
+        )
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="在合成存档上运行基准测试")
+    parser.add_argument(
+        "--scales", type=int, nargs="+", default=list(DEFAULT_SCALES)
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    print_results(run_benchmarks(args.scales, args.seed))
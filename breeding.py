@@ -0,0 +1,205 @@
+"""配种表与配种路线搜索。
+
+按 DT_PalMonsterParameter 的 CombiRank 预先计算 CHARACTER_IDS 中所有种族两两
+配种的结果：子代的 CombiRank 目标为 (父 + 母 + 1) // 2，取 CombiRank 最接近的
+种族，距离相同时取 CombiRank 较小者；同种族配种得到同种族。BOSS_ 前缀的种族按
+普通种族参与配种。数据表中没有特殊配种组合 (DT_PalCombiUnique)，因此这些组合
+不在表内。
+
+结果以种族下标的二维数组缓存到 CACHE_PATH，CombiRank 变化时自动重建。
+路线搜索从已拥有的种族出发逐代扩展，每个新种族只与已可得的种族配对一次，
+得到代数最少的配种步骤 (不考虑性别)::
+
+    python breeding.py --pair SheepBall PinkCat
+    python breeding.py Level.sav --player 玩家昵称或 UID --target Anubis
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from bisect import bisect_left
+from pathlib import Path
+from typing import Iterable
+
+from unpack import BOSS_PREFIX, CHARACTER_IDS, DT_PMP
+
+CACHE_PATH = Path.home() / ".cache" / "palworld-save-editor" / "breeding.json"
+
+
+def breeding_species():
+    return [c for c in CHARACTER_IDS if not c.startswith(BOSS_PREFIX)]
+
+
+def fingerprint(species: list[str]):
+    ranks = [(c, DT_PMP[c]["CombiRank"]) for c in species]
+    return hashlib.sha1(json.dumps(ranks).encode()).hexdigest()
+
+
+def compute_children(species: list[str]):
+    ranks = [DT_PMP[c]["CombiRank"] for c in species]
+    # CombiRank 相同的种族取表中最靠前的一个，目标值的最近邻只需比较二分位置两侧
+    first_with_rank: dict[int, int] = {}
+    for i, rank in enumerate(ranks):
+        first_with_rank.setdefault(rank, i)
+    distinct = sorted(first_with_rank)
+
+    def closest(target: int):
+        position = bisect_left(distinct, target)
+        if position == len(distinct):
+            return first_with_rank[distinct[-1]]
+        if position > 0 and (
+            target - distinct[position - 1] <= distinct[position] - target
+        ):
+            return first_with_rank[distinct[position - 1]]
+        return first_with_rank[distinct[position]]
+
+    children = [[0] * len(species) for _ in species]
+    for a in range(len(species)):
+        for b in range(a, len(species)):
+            child = a if a == b else closest((ranks[a] + ranks[b] + 1) // 2)
+            children[a][b] = children[b][a] = child
+    return children
+
+
+class BreedingTable:
+    def __init__(self, species: list[str], children: list[list[int]]):
+        self.species = species
+        self.children = children
+        self.index = {c.casefold(): i for i, c in enumerate(species)}
+        self._parents: list[list[tuple[int, int]]] = None
+
+    def species_index(self, character_id: str):
+        # 存档中的 CharacterID 大小写不一定与数据表一致，且可能带 BOSS_ 前缀
+        key = character_id.casefold()
+        if key.startswith(BOSS_PREFIX.casefold()):
+            key = key[len(BOSS_PREFIX) :]
+        return self.index.get(key)
+
+    def child(self, parent_a: str, parent_b: str):
+        a = self.species_index(parent_a)
+        b = self.species_index(parent_b)
+        if a is None or b is None:
+            return None
+        return self.species[self.children[a][b]]
+
+    def parents(self, child: str) -> list[tuple[str, str]]:
+        if self._parents is None:
+            self._parents = [[] for _ in self.species]
+            for a, row in enumerate(self.children):
+                for b in range(a, len(row)):
+                    self._parents[row[b]].append((a, b))
+        c = self.species_index(child)
+        if c is None:
+            return []
+        return [(self.species[a], self.species[b]) for a, b in self._parents[c]]
+
+    def breeding_path(self, owned: Iterable[str], target: str):
+        # 返回按顺序执行的 (父, 母, 子) 步骤；已拥有目标时为空列表，无法得到时为 None
+        goal = self.species_index(target)
+        if goal is None:
+            return None
+        known: dict[int, tuple[int, int] | None] = {}
+        for character_id in owned:
+            i = self.species_index(character_id)
+            if i is not None:
+                known[i] = None
+        if goal in known:
+            return []
+        children = self.children
+        frontier = list(known)
+        while frontier and goal not in known:
+            found: dict[int, tuple[int, int]] = {}
+            pool = list(known)
+            for a in frontier:
+                row = children[a]
+                for b in pool:
+                    child = row[b]
+                    if child not in known and child not in found:
+                        found[child] = (a, b)
+            known.update(found)
+            frontier = list(found)
+        if goal not in known:
+            return None
+        steps: list[tuple[str, str, str]] = []
+        done: set[int] = set()
+
+        def visit(i: int):
+            if i in done or known[i] is None:
+                return
+            done.add(i)
+            a, b = known[i]
+            visit(a)
+            visit(b)
+            steps.append((self.species[a], self.species[b], self.species[i]))
+
+        visit(goal)
+        return steps
+
+
+def load_breeding_table(cache_path: Path = CACHE_PATH):
+    species = breeding_species()
+    key = fingerprint(species)
+    try:
+        cached = json.loads(cache_path.read_text(encoding="utf-8"))
+        if cached["fingerprint"] == key and cached["species"] == species:
+            return BreedingTable(species, cached["children"])
+    except (OSError, ValueError, KeyError):
+        pass
+    children = compute_children(species)
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        cache_path.write_text(
+            json.dumps(
+                {"fingerprint": key, "species": species, "children": children},
+                separators=(",", ":"),
+            ),
+            encoding="utf-8",
+        )
+    except OSError as e:
+        print(f"Warning: breeding table cache not written: {e}")
+    return BreedingTable(species, children)
+
+
+if __name__ == "__main__":
+    import argparse
+    from time import perf_counter
+
+    parser = argparse.ArgumentParser(description="查询配种结果与配种路线")
+    parser.add_argument("save", type=Path, nargs="?")
+    parser.add_argument("--player", help="玩家 UID 或昵称，从其拥有的帕鲁出发")
+    parser.add_argument("--target", help="目标种族 CharacterID")
+    parser.add_argument("--pair", nargs=2, metavar=("PARENT", "PARENT"))
+    parser.add_argument(
+        "--parents-of", metavar="CHILD", help="列出能配出该种族的组合"
+    )
+    args = parser.parse_args()
+
+    start = perf_counter()
+    table = load_breeding_table()
+    print(f"Breeding table loaded in {(perf_counter() - start) * 1000:.1f} ms")
+    if args.pair:
+        print(f"{args.pair[0]} + {args.pair[1]} = {table.child(*args.pair)}")
+    if args.parents_of:
+        for a, b in table.parents(args.parents_of):
+            print(f"{a} + {b}")
+    if args.target:
+        if not args.save or not args.player:
+            parser.error("--target requires a save file and --player")
+        from run import find_player, load_world
+
+        ownership = load_world(args.save).ownership
+        player_uid = find_player(ownership, args.player)
+        if player_uid is None:
+            parser.error(f"player not found: {args.player}")
+        owned = {pal.character_id for pal in ownership.pals_of_player(player_uid)}
+        start = perf_counter()
+        path = table.breeding_path(owned, args.target)
+        elapsed = (perf_counter() - start) * 1000
+        if path is None:
+            print(f"{args.target} cannot be bred from the {len(owned)} owned species")
+        elif not path:
+            print(f"{args.target} is already owned")
+        for a, b, child in path or []:
+            print(f"{a} + {b} -> {child}")
+        print(f"Searched in {elapsed:.2f} ms")
@@ -0,0 +1,84 @@
+"""统计 GVAS 自定义属性解码器 / 编码器的调用次数、耗时与处理的字节数。
+
+convert_sav_to_dict 与 convert_dict_to_sav 接受 codec_timer 参数；在编辑器中
+设置环境变量 PALWORLD_SAVE_EDITOR_CODEC_TIMING 后，每次加载和保存 .sav 都会
+输出一张表::
+
+    PALWORLD_SAVE_EDITOR_CODEC_TIMING=1 python run.py
+
+耗时包含嵌套调用的时间，例如 GroupSaveDataMap 的解码器内部对 RawData 的解析。
+"""
+
+from __future__ import annotations
+
+import os
+from time import perf_counter
+
+ENV_VAR = "PALWORLD_SAVE_EDITOR_CODEC_TIMING"
+
+
+def is_enabled():
+    return bool(os.environ.get(ENV_VAR))
+
+
+class CodecTimer:
+    def __init__(self):
+        # (路径, "decode" 或 "encode") -> [调用次数, 总耗时, 字节数]
+        self.stats: dict[tuple[str, str], list] = {}
+
+    def record(self, path: str, direction: str, seconds: float, size: int):
+        entry = self.stats.get((path, direction))
+        if entry is None:
+            entry = self.stats[(path, direction)] = [0, 0.0, 0]
+        entry[0] += 1
+        entry[1] += seconds
+        entry[2] += size
+
+    def wrap(self, custom_properties: dict):
+        return {
+            path: (self.wrap_decoder(path, decode), self.wrap_encoder(path, encode))
+            for path, (decode, encode) in custom_properties.items()
+        }
+
+    def wrap_decoder(self, path: str, decode):
+        def timed_decode(reader, type_name: str, size: int, decode_path: str):
+            position = reader.data.tell()
+            start = perf_counter()
+            value = decode(reader, type_name, size, decode_path)
+            self.record(
+                path, "decode", perf_counter() - start, reader.data.tell() - position
+            )
+            return value
+
+        return timed_decode
+
+    def wrap_encoder(self, path: str, encode):
+        def timed_encode(writer, property_type: str, properties: dict):
+            position = writer.data.tell()
+            start = perf_counter()
+            size = encode(writer, property_type, properties)
+            self.record(
+                path, "encode", perf_counter() - start, writer.data.tell() - position
+            )
+            return size
+
+        return timed_encode
+
+    def reset(self):
+        self.stats.clear()
+
+    def print_table(self, title: str = ""):
+        if title:
+            print(f"== {title} ==")
+        print(
+            f"{'property':<64}{'op':>7}{'calls':>9}{'time (s)':>10}"
+            f"{'MiB':>9}{'MiB/s':>9}"
+        )
+        for (path, direction), (count, seconds, size) in sorted(
+            self.stats.items(), key=lambda item: item[1][1], reverse=True
+        ):
+            rate = size / 2**20 / seconds if seconds else 0.0
+            print(
+                f"{path[-63:]:<64}{direction:>7}{count:>9}{seconds:>10.3f}"
+                f"{size / 2**20:>9.2f}{rate:>9.1f}"
+            )
@@ -0,0 +1,233 @@
+"""孤立数据检测与世界存档压缩。
+
+先为 GroupSaveDataMap 的 group_id 和 CharacterContainerSaveData 的容器 ID 建立
+哈希索引，再遍历一遍 CharacterSaveParameterMap，找出：
+
+    missing container   帕鲁的 SlotID 指向不存在的容器
+    missing group       角色的 group_id 指向不存在的组
+    unknown group       select_source 因结构未知而跳过的组 (没有 base_camp_level)
+
+加上 --prune 后删除孤立的帕鲁 (玩家角色只报告不删除)，并同步清理组中的
+individual_character_handle_ids 与容器中指向它们的槽位；--prune-unknown-groups
+额外删除不再引用任何角色的未知结构组。最后写出压缩后的存档并对比前后体积::
+
+    python compact.py Level.sav
+    python compact.py Level.sav --prune -o Level.compact.sav
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from run import (
+    ZERO_GUID,
+    character_group_id,
+    decompress_sav_file,
+    extract_character_fields,
+    load_save,
+    write_save,
+)
+
+MISSING_CONTAINER = "missing container"
+MISSING_GROUP = "missing group"
+UNKNOWN_GROUP = "unknown group"
+
+
+@dataclass
+class Orphan:
+    reason: str
+    instance_id: str
+    player_uid: str = ZERO_GUID
+    character_id: str = ""
+    reference: str = ""
+    # 未知结构组引用的角色数，角色条目为 None
+    handle_count: int | None = None
+
+    @property
+    def is_player(self):
+        return self.player_uid != ZERO_GUID
+
+
+@dataclass
+class OrphanReport:
+    characters: list[Orphan] = field(default_factory=list)
+    groups: list[Orphan] = field(default_factory=list)
+
+    def prunable_instance_ids(self):
+        return {orphan.instance_id for orphan in self.characters if not orphan.is_player}
+
+
+def world_save_data(data: dict):
+    return data["properties"]["worldSaveData"]["value"]
+
+
+def group_entries(data: dict):
+    return world_save_data(data).get("GroupSaveDataMap", {}).get("value", [])
+
+
+def container_entries(data: dict):
+    return world_save_data(data).get("CharacterContainerSaveData", {}).get("value", [])
+
+
+def find_orphans(data: dict):
+    group_ids = set()
+    report = OrphanReport()
+    for entry in group_entries(data):
+        group_data = entry["value"]["RawData"]["value"]
+        group_ids.add(group_data["group_id"])
+        if not group_data.get("base_camp_level"):
+            handle_count = len(group_data["individual_character_handle_ids"])
+            report.groups.append(
+                Orphan(
+                    UNKNOWN_GROUP,
+                    group_data["group_id"],
+                    character_id=group_data.get("group_type", ""),
+                    reference=str(handle_count),
+                    handle_count=handle_count,
+                )
+            )
+    container_ids = {entry["key"]["ID"]["value"] for entry in container_entries(data)}
+
+    for entry in world_save_data(data)["CharacterSaveParameterMap"]["value"]:
+        raw_data = entry["value"]["RawData"]
+        character = extract_character_fields(raw_data)
+        instance_id = entry["key"]["InstanceId"]["value"]
+        player_uid = entry["key"]["PlayerUId"]["value"]
+        character_id = (
+            character["CharacterID"]["value"] if character.get("CharacterID") else ""
+        )
+        if character.get("SlotID"):
+            container_id = character["SlotID"]["value"]["ContainerId"]["value"]["ID"][
+                "value"
+            ]
+            if container_id != ZERO_GUID and container_id not in container_ids:
+                report.characters.append(
+                    Orphan(
+                        MISSING_CONTAINER,
+                        instance_id,
+                        player_uid,
+                        character_id,
+                        container_id,
+                    )
+                )
+                continue
+        group_id = character_group_id(raw_data)
+        if group_id != ZERO_GUID and group_id not in group_ids:
+            report.characters.append(
+                Orphan(MISSING_GROUP, instance_id, player_uid, character_id, group_id)
+            )
+    return report
+
+
+def remove_characters(data: dict, instance_ids: set[str]):
+    # 删除角色条目，并清理组与容器中对它们的引用，返回删除的条目数
+    if not instance_ids:
+        return 0
+    character_map = world_save_data(data)["CharacterSaveParameterMap"]
+    before = len(character_map["value"])
+    character_map["value"] = [
+        entry
+        for entry in character_map["value"]
+        if entry["key"]["InstanceId"]["value"] not in instance_ids
+    ]
+    for entry in group_entries(data):
+        group_data = entry["value"]["RawData"]["value"]
+        group_data["individual_character_handle_ids"] = [
+            handle
+            for handle in group_data["individual_character_handle_ids"]
+            if handle["instance_id"] not in instance_ids
+        ]
+    for entry in container_entries(data):
+        for slot in entry["value"]["Slots"]["value"]["values"]:
+            slot_data = slot["RawData"]["value"]
+            if slot_data and slot_data["instance_id"] in instance_ids:
+                slot_data["player_uid"] = ZERO_GUID
+                slot_data["instance_id"] = ZERO_GUID
+    return before - len(character_map["value"])
+
+
+def remove_groups(data: dict, group_ids: set[str]):
+    if not group_ids:
+        return 0
+    group_map = world_save_data(data)["GroupSaveDataMap"]
+    before = len(group_map["value"])
+    group_map["value"] = [
+        entry
+        for entry in group_map["value"]
+        if entry["value"]["RawData"]["value"]["group_id"] not in group_ids
+    ]
+    return before - len(group_map["value"])
+
+
+def prune(data: dict, report: OrphanReport, *, unknown_groups: bool = False):
+    removed_characters = remove_characters(data, report.prunable_instance_ids())
+    removed_groups = 0
+    if unknown_groups:
+        removed_groups = remove_groups(
+            data,
+            {
+                orphan.instance_id
+                for orphan in report.groups
+                if orphan.handle_count == 0
+            },
+        )
+    return removed_characters, removed_groups
+
+
+def print_report(report: OrphanReport):
+    print(f"{'reason':<20}{'instance / group id':<40}{'character':<24}reference")
+    for orphan in report.characters + report.groups:
+        name = orphan.character_id or ("(player)" if orphan.is_player else "")
+        print(
+            f"{orphan.reason:<20}{orphan.instance_id:<40}{name:<24}{orphan.reference}"
+        )
+    counts = {}
+    for orphan in report.characters + report.groups:
+        counts[orphan.reason] = counts.get(orphan.reason, 0) + 1
+    print(", ".join(f"{reason}: {count}" for reason, count in counts.items()) or "No orphans")
+
+
+def save_sizes(path: Path):
+    raw_gvas, _ = decompress_sav_file(path)
+    return path.stat().st_size, len(raw_gvas)
+
+
+def print_size_report(before: tuple[int, int], after: Path):
+    # before 在写出前取得，输出覆盖原存档时也能对比
+    print(f"{'':<12}{'sav (bytes)':>16}{'GVAS (bytes)':>16}")
+    sizes = [before, save_sizes(after)]
+    for name, (sav, gvas) in zip(("before", "after"), sizes):
+        print(f"{name:<12}{sav:>16}{gvas:>16}")
+    (sav_before, gvas_before), (sav_after, gvas_after) = sizes
+    print(
+        f"{'saved':<12}{sav_before - sav_after:>16}{gvas_before - gvas_after:>16}"
+    )
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="检测并清理存档中的孤立数据")
+    parser.add_argument("save", type=Path)
+    parser.add_argument("--prune", action="store_true", help="删除孤立的帕鲁")
+    parser.add_argument(
+        "--prune-unknown-groups",
+        action="store_true",
+        help="同时删除不引用任何角色的未知结构组",
+    )
+    parser.add_argument("-o", "--output", type=Path, help="压缩后存档的输出路径")
+    args = parser.parse_args()
+
+    data = load_save(args.save)
+    report = find_orphans(data)
+    print_report(report)
+    if args.prune or args.prune_unknown_groups:
+        removed_characters, removed_groups = prune(
+            data, report, unknown_groups=args.prune_unknown_groups
+        )
+        print(f"Removed {removed_characters} characters, {removed_groups} groups")
+        output = args.output or args.save.with_name(f"{args.save.stem}.compact.sav")
+        before = save_sizes(args.save)
+        write_save(data, output)
+        print_size_report(before, output)
@@ -0,0 +1,158 @@
+"""游戏数据表的索引查询。
+
+unpack.py 中的 DT_PMP、DT_WDT、DT_PSM 是原始的行字典，按条件查询需要遍历所有行。
+IndexedTable 在加载时为常用的枚举字段建立 值 -> 行键集合 的二级索引 (枚举值同时
+以 “::” 之后的短名登记)，为数值字段建立排序数组以便二分查找范围。select 的每个
+条件都只取索引中的集合，再求交集::
+
+    PAL_MONSTER_TABLE.select(Element="Dark", Rarity=(8, None))
+    WAZA_TABLE.select(Category="Shot", Power=(101, None))
+    PASSIVE_SKILL_TABLE.select(EffectType="CraftSpeed")
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from typing import Callable, Iterable
+
+from unpack import DT_PMP, DT_PSM, DT_WDT
+
+ENUM_SEPARATOR = "::"
+
+
+def short_name(value):
+    if isinstance(value, str) and ENUM_SEPARATOR in value:
+        return value.split(ENUM_SEPARATOR, 1)[1]
+    return value
+
+
+class IndexedTable:
+    def __init__(
+        self,
+        rows: dict[str, dict],
+        *,
+        equality: Iterable[str] = (),
+        ranges: Iterable[str] = (),
+        derived: dict[str, Callable[[dict], Iterable]] = None,
+    ):
+        self.rows = rows
+        self.order = {key: i for i, key in enumerate(rows)}
+        # 字段 -> 值 -> 行键集合；derived 字段的函数可以为一行返回多个值
+        self.equality: dict[str, dict[object, set[str]]] = {}
+        extractors = {
+            field: (lambda row, field=field: (row[field],)) for field in equality
+        }
+        extractors.update(derived or {})
+        for field, extract in extractors.items():
+            index: dict[object, set[str]] = {}
+            for key, row in rows.items():
+                for value in extract(row):
+                    index.setdefault(value, set()).add(key)
+                    if short_name(value) != value:
+                        index.setdefault(short_name(value), set()).add(key)
+            self.equality[field] = index
+        # 字段 -> (按值排序的值列表, 对应的行键列表)
+        self.ranges: dict[str, tuple[list, list[str]]] = {}
+        for field in ranges:
+            pairs = sorted((row[field], key) for key, row in rows.items())
+            self.ranges[field] = ([v for v, _ in pairs], [k for _, k in pairs])
+
+    def values(self, field: str, *, short: bool = True):
+        values = self.equality[field]
+        return sorted(
+            (v for v in values if not short or short_name(v) == v),
+            key=lambda v: (isinstance(v, str), v),
+        )
+
+    def equal(self, field: str, value) -> set[str]:
+        return self.equality[field].get(value, set())
+
+    def between(self, field: str, low=None, high=None) -> set[str]:
+        # 闭区间 [low, high]，None 表示不限
+        values, keys = self.ranges[field]
+        start = 0 if low is None else bisect_left(values, low)
+        end = len(values) if high is None else bisect_right(values, high)
+        return set(keys[start:end])
+
+    def match(self, field: str, condition) -> set[str]:
+        # 条件为 (low, high) 时按范围查找，为 list / set 时取任一值，否则为相等
+        if isinstance(condition, tuple) and field in self.ranges:
+            return self.between(field, *condition)
+        if isinstance(condition, (list, set, frozenset)):
+            result: set[str] = set()
+            for value in condition:
+                result |= self.equal(field, value)
+            return result
+        if field in self.equality:
+            return self.equal(field, condition)
+        return self.between(field, condition, condition)
+
+    def select(self, **conditions) -> list[str]:
+        result: set[str] = None
+        # 先取最小的集合，交集的代价与最小集合成正比
+        for matched in sorted(
+            (self.match(field, condition) for field, condition in conditions.items()),
+            key=len,
+        ):
+            result = matched.copy() if result is None else result & matched
+            if not result:
+                return []
+        if result is None:
+            return list(self.rows)
+        return sorted(result, key=self.order.__getitem__)
+
+    def select_rows(self, **conditions) -> dict[str, dict]:
+        return {key: self.rows[key] for key in self.select(**conditions)}
+
+
+def pal_elements(row: dict):
+    return {row["ElementType1"], row["ElementType2"]} - {"EPalElementType::None"}
+
+
+def passive_effect_types(row: dict):
+    return {row[f"EffectType{n}"] for n in (1, 2, 3)} - {
+        "EPalPassiveSkillEffectType::no"
+    }
+
+
+PAL_MONSTER_TABLE = IndexedTable(
+    DT_PMP,
+    equality=(
+        "Tribe",
+        "Size",
+        "Rarity",
+        "GenusCategory",
+        "Organization",
+        "Weapon",
+        "IsBoss",
+        "Nocturnal",
+        "Predator",
+    ),
+    ranges=(
+        "Rarity",
+        "HP",
+        "MeleeAttack",
+        "ShotAttack",
+        "Defense",
+        "CraftSpeed",
+        "CombiRank",
+        "Price",
+    ),
+    derived={"Element": pal_elements},
+)
+WAZA_TABLE = IndexedTable(
+    DT_WDT,
+    equality=("WazaType", "Element", "Category"),
+    ranges=("Power", "CoolTime", "MinRange", "MaxRange"),
+)
+PASSIVE_SKILL_TABLE = IndexedTable(
+    DT_PSM,
+    equality=("Rank", "TargetElementType"),
+    ranges=("Rank",),
+    derived={"EffectType": passive_effect_types},
+)
+
+
+def species_ids(**conditions) -> set[str]:
+    # 满足条件的种族 ID (小写)，用于与存档中的 CharacterID 关联
+    return {key.casefold() for key in PAL_MONSTER_TABLE.select(**conditions)}
@@ -0,0 +1,78 @@
+"""等级与经验值的换算表。
+
+由 DT_PalExpTable 预先计算玩家 (TotalEXP) 与帕鲁 (PalTotalEXP) 两条累计经验曲线，
+等级 → 经验值是数组下标，经验值 → 等级用 bisect 二分查找，均不再按字符串等级
+查询数据表。最高等级取两条曲线都未饱和到 int32 上限 (数据表中不可达的等级) 的
+最后一级::
+
+    EXP_TABLE.pal.exp_for_level(30)
+    EXP_TABLE.player.level_for_exp(123456)
+    EXP_TABLE.pal.levels_for_exps([0, 25, 10**6])
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import Iterable
+
+from unpack import DT_PET
+
+INT32_MAX = 2**31 - 1
+
+
+class ExpCurve:
+    def __init__(self, totals: list[int]):
+        # totals[i] 是达到 i + 1 级所需的累计经验值，严格递增
+        self.totals = totals
+        self.max_level = len(totals)
+
+    def clamp_level(self, level: int):
+        return min(max(level, 1), self.max_level)
+
+    def exp_for_level(self, level: int):
+        return self.totals[self.clamp_level(level) - 1]
+
+    def level_for_exp(self, exp: int):
+        return max(bisect_right(self.totals, exp), 1)
+
+    def exp_to_next_level(self, exp: int):
+        level = self.level_for_exp(exp)
+        if level >= self.max_level:
+            return 0
+        return self.totals[level] - exp
+
+    def exps_for_levels(self, levels: Iterable[int]):
+        totals = self.totals
+        clamp_level = self.clamp_level
+        return [totals[clamp_level(level) - 1] for level in levels]
+
+    def levels_for_exps(self, exps: Iterable[int]):
+        # 批量换算时把查找函数与数组绑定到局部变量，省去每次的属性查找
+        totals = self.totals
+        return [max(bisect_right(totals, exp), 1) for exp in exps]
+
+
+@dataclass
+class ExpTable:
+    player: ExpCurve
+    pal: ExpCurve
+
+    @property
+    def max_level(self):
+        return min(self.player.max_level, self.pal.max_level)
+
+
+def build_exp_table(rows: dict[str, dict]):
+    player_totals = []
+    pal_totals = []
+    for _, row in sorted(rows.items(), key=lambda item: int(item[0])):
+        if row["TotalEXP"] >= INT32_MAX or row["PalTotalEXP"] >= INT32_MAX:
+            break
+        player_totals.append(row["TotalEXP"])
+        pal_totals.append(row["PalTotalEXP"])
+    return ExpTable(ExpCurve(player_totals), ExpCurve(pal_totals))
+
+
+EXP_TABLE = build_exp_table(DT_PET)
+MAX_LEVEL = EXP_TABLE.max_level
@@ -0,0 +1,161 @@
+"""按阶段记录 tracemalloc 快照，定位加载和保存过程中的内存占用。
+
+设置环境变量 PALWORLD_SAVE_EDITOR_TRACEMALLOC 后启动编辑器即可启用，其值为
+每个阶段列出的分配位置数量 (默认 10)::
+
+    PALWORLD_SAVE_EDITOR_TRACEMALLOC=20 python run.py
+
+每个阶段输出 Python 堆的当前占用与峰值、进程常驻内存，以及与上一阶段相比
+增长最多的分配位置。Tk 控件的内存由 Tcl 分配，不在 tracemalloc 的统计范围内，
+只体现在常驻内存的变化中。
+"""
+
+from __future__ import annotations
+
+import functools
+import os
+import sys
+import tracemalloc
+from time import perf_counter
+
+ENV_VAR = "PALWORLD_SAVE_EDITOR_TRACEMALLOC"
+DEFAULT_TOP = 10
+
+_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def configured_top():
+    value = os.environ.get(ENV_VAR, "")
+    if not value:
+        return 0
+    return int(value) if value.isdigit() and int(value) > 0 else DEFAULT_TOP
+
+
+def rss_bytes():
+    if sys.platform.startswith("linux"):
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    if sys.platform == "win32":
+        import ctypes
+        from ctypes import wintypes
+
+        class ProcessMemoryCounters(ctypes.Structure):
+            _fields_ = [
+                ("cb", wintypes.DWORD),
+                ("PageFaultCount", wintypes.DWORD),
+                ("PeakWorkingSetSize", ctypes.c_size_t),
+                ("WorkingSetSize", ctypes.c_size_t),
+                ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                ("PagefileUsage", ctypes.c_size_t),
+                ("PeakPagefileUsage", ctypes.c_size_t),
+            ]
+
+        counters = ProcessMemoryCounters()
+        counters.cb = ctypes.sizeof(counters)
+        ctypes.windll.psapi.GetProcessMemoryInfo(
+            ctypes.windll.kernel32.GetCurrentProcess(),
+            ctypes.byref(counters),
+            counters.cb,
+        )
+        return counters.WorkingSetSize
+    return None
+
+
+def format_size(size):
+    return "n/a" if size is None else f"{size / 2**20:.1f} MiB"
+
+
+class MemoryTracer:
+    # 未启用时所有方法都是空操作，可以无条件地放在调用路径中
+    def __init__(self, operation: str, top: int = None):
+        self.operation = operation
+        self.top = configured_top() if top is None else top
+        self.enabled = self.top > 0
+        self.started = False
+        if not self.enabled:
+            return
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.started = True
+        self.start_time = perf_counter()
+        self.previous_stage = "start"
+        self.previous = self.take_snapshot()
+        self.first = self.previous
+        self.rss = rss_bytes()
+        print(f"[tracemalloc] {operation}: start, RSS {format_size(self.rss)}")
+
+    def take_snapshot(self):
+        return tracemalloc.take_snapshot().filter_traces(_FILTERS)
+
+    def snapshot(self, stage: str):
+        if not self.enabled:
+            return
+        snapshot = self.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        rss = rss_bytes()
+        stats = snapshot.compare_to(self.previous, "lineno")
+        growth = sum(stat.size_diff for stat in stats)
+        rss_growth = (
+            "n/a" if rss is None or self.rss is None else format_size(rss - self.rss)
+        )
+        print(
+            f"[tracemalloc] {self.operation}: {self.previous_stage} -> {stage}"
+            f" ({perf_counter() - self.start_time:.2f}s)"
+        )
+        print(
+            f"  traced {format_size(current)} (peak {format_size(peak)}),"
+            f" growth {format_size(growth)}; RSS {format_size(rss)},"
+            f" growth {rss_growth}"
+        )
+        for stat in stats[: self.top]:
+            frame = stat.traceback[0]
+            print(
+                f"  {stat.size_diff / 2**20:+10.1f} MiB {stat.count_diff:+10d} blocks"
+                f"  {frame.filename}:{frame.lineno}"
+            )
+        self.previous_stage = stage
+        self.previous = snapshot
+        self.rss = rss
+        tracemalloc.reset_peak()
+
+    def stop(self):
+        if not self.enabled:
+            return
+        stats = self.take_snapshot().compare_to(self.first, "filename")
+        print(f"[tracemalloc] {self.operation}: total growth by file")
+        for stat in stats[: self.top]:
+            print(
+                f"  {stat.size_diff / 2**20:+10.1f} MiB"
+                f"  {stat.traceback[0].filename}"
+            )
+        self.previous = self.first = None
+        if self.started:
+            tracemalloc.stop()
+
+
+def traced(operation: str):
+    # 装饰 Application 的方法：调用期间 self.memory_tracer 指向本次操作的 MemoryTracer，
+    # 嵌套调用 (如 save_and_convert 中的 save) 结束后恢复外层的 tracer
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            outer = getattr(self, "memory_tracer", None)
+            self.memory_tracer = MemoryTracer(operation)
+            try:
+                return func(self, *args, **kwargs)
+            finally:
+                self.memory_tracer.stop()
+                self.memory_tracer = outer
+
+        return wrapper
+
+    return decorator
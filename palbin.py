@@ -0,0 +1,284 @@
+"""Palworld 存档编辑器的二进制中间格式 (.palbin)。
+
+用于替代带缩进的 JSON 保存 / 读取 Application.data，二者表示的是同一棵
+由 dict / list / str / int / float / bool / None 组成的树，可以无损互转。
+
+文件布局 (所有整数均为小端序)::
+
+    magic       4 字节   b"PSEB"
+    version     u8       当前为 1
+    flags       u8       bit0 = 正文经过 zlib 压缩
+    body        剩余全部字节 (flags bit0 置位时为 zlib 流)
+
+body 的布局::
+
+    string table    u32 数量 N，随后 N 个 (u32 字节长度 + UTF-8 字节)
+    shape table     u32 数量 M，随后 M 个 (u32 键数量 K + K 个 u32 字符串索引)
+    root            一个值
+
+每个值以 1 字节类型标签开头::
+
+    0x00 None
+    0x01 False
+    0x02 True
+    0x03 int      i64
+    0x04 float    f64
+    0x05 str      u32 字符串表索引
+    0x06 list     u32 元素数量，随后依次为各元素
+    0x07 dict     u32 形状表索引，随后按形状中键的顺序依次为各值
+    0x08 bytes    u32 字节长度，随后为原始字节
+    0x09 bigint   u32 字符串表索引，内容为超出 i64 范围的十进制整数
+
+所有字符串 (包括 dict 的键) 只在字符串表中出现一次；键集合相同且顺序相同的
+dict 共用同一个形状，例如存档里数以百万计的 {"id", "value", "type"}。
+读取时相同的字符串和键元组都是同一个对象，因此也会比 JSON 占用更少的内存。
+
+直接运行本模块可以对一个 .sav / .json / .palbin 文件做 JSON 与 palbin 的
+读写基准测试::
+
+    python palbin.py Level.sav
+"""
+
+from __future__ import annotations
+
+import gc
+import json
+import struct
+import zlib
+
+MAGIC = b"PSEB"
+VERSION = 1
+FLAG_ZLIB = 0x01
+
+T_NONE = 0x00
+T_FALSE = 0x01
+T_TRUE = 0x02
+T_INT = 0x03
+T_FLOAT = 0x04
+T_STR = 0x05
+T_LIST = 0x06
+T_DICT = 0x07
+T_BYTES = 0x08
+T_BIGINT = 0x09
+
+I64_MIN = -(1 << 63)
+I64_MAX = (1 << 63) - 1
+
+_u32 = struct.Struct("<I")
+_tag_u32 = struct.Struct("<BI")
+_tag_i64 = struct.Struct("<Bq")
+_tag_f64 = struct.Struct("<Bd")
+_header = struct.Struct("<4sBB")
+
+
+class PalbinError(ValueError):
+    pass
+
+
+def dumps(data, *, compress: bool = True, level: int = 1) -> bytes:
+    strings: dict[str, int] = {}
+    shapes: dict[tuple, int] = {}
+    body = bytearray()
+    write = body.extend
+    pack_u32 = _tag_u32.pack
+    pack_i64 = _tag_i64.pack
+    pack_f64 = _tag_f64.pack
+
+    def string_index(s: str):
+        index = strings.get(s)
+        if index is None:
+            index = strings[s] = len(strings)
+        return index
+
+    def encode(value):
+        if value is None:
+            body.append(T_NONE)
+        elif value is True:
+            body.append(T_TRUE)
+        elif value is False:
+            body.append(T_FALSE)
+        elif type(value) is str:
+            write(pack_u32(T_STR, string_index(value)))
+        elif type(value) is dict:
+            keys = tuple(value)
+            shape = shapes.get(keys)
+            if shape is None:
+                for k in keys:
+                    if type(k) is not str:
+                        raise PalbinError(f"dict 的键必须是字符串：{k!r}")
+                    string_index(k)
+                shape = shapes[keys] = len(shapes)
+            write(pack_u32(T_DICT, shape))
+            for v in value.values():
+                encode(v)
+        elif type(value) is list or type(value) is tuple:
+            write(pack_u32(T_LIST, len(value)))
+            for v in value:
+                encode(v)
+        elif type(value) is int:
+            if I64_MIN <= value <= I64_MAX:
+                write(pack_i64(T_INT, value))
+            else:
+                write(pack_u32(T_BIGINT, string_index(str(value))))
+        elif type(value) is float:
+            write(pack_f64(T_FLOAT, value))
+        elif type(value) in (bytes, bytearray, memoryview):
+            write(pack_u32(T_BYTES, len(value)))
+            write(value)
+        else:
+            raise PalbinError(f"不支持的类型：{type(value).__name__}")
+
+    encode(data)
+
+    tables = bytearray()
+    tables += _u32.pack(len(strings))
+    for s in strings:
+        encoded = s.encode("utf-8", errors="surrogatepass")
+        tables += _u32.pack(len(encoded))
+        tables += encoded
+    tables += _u32.pack(len(shapes))
+    for keys in shapes:
+        tables += _u32.pack(len(keys))
+        tables += struct.pack(f"<{len(keys)}I", *(strings[k] for k in keys))
+    payload = bytes(tables + body)
+    flags = 0
+    if compress:
+        payload = zlib.compress(payload, level)
+        flags |= FLAG_ZLIB
+    return _header.pack(MAGIC, VERSION, flags) + payload
+
+
+def loads(data: bytes):
+    buf = memoryview(data)
+    if len(buf) < _header.size:
+        raise PalbinError("文件过短，不是 palbin 文件")
+    magic, version, flags = _header.unpack_from(buf, 0)
+    if magic != MAGIC:
+        raise PalbinError(f"不是 palbin 文件，找到 {bytes(magic)!r} 而不是 {MAGIC!r}")
+    if version != VERSION:
+        raise PalbinError(f"不支持的 palbin 版本：{version}")
+    buf = buf[_header.size :]
+    if flags & FLAG_ZLIB:
+        buf = memoryview(zlib.decompress(buf))
+
+    unpack_u32 = _u32.unpack_from
+    pos = 0
+    (count,) = unpack_u32(buf, pos)
+    pos += 4
+    strings: list[str] = []
+    for _ in range(count):
+        (size,) = unpack_u32(buf, pos)
+        pos += 4
+        strings.append(str(buf[pos : pos + size], "utf-8", "surrogatepass"))
+        pos += size
+    (count,) = unpack_u32(buf, pos)
+    pos += 4
+    shapes: list[tuple] = []
+    for _ in range(count):
+        (size,) = unpack_u32(buf, pos)
+        pos += 4
+        indexes = struct.unpack_from(f"<{size}I", buf, pos)
+        pos += 4 * size
+        shapes.append(tuple(strings[i] for i in indexes))
+
+    unpack_i64 = struct.Struct("<q").unpack_from
+    unpack_f64 = struct.Struct("<d").unpack_from
+
+    def decode():
+        nonlocal pos
+        tag = buf[pos]
+        pos += 1
+        if tag == T_STR:
+            (index,) = unpack_u32(buf, pos)
+            pos += 4
+            return strings[index]
+        if tag == T_DICT:
+            (index,) = unpack_u32(buf, pos)
+            pos += 4
+            keys = shapes[index]
+            return {k: decode() for k in keys}
+        if tag == T_INT:
+            (value,) = unpack_i64(buf, pos)
+            pos += 8
+            return value
+        if tag == T_NONE:
+            return None
+        if tag == T_TRUE:
+            return True
+        if tag == T_FALSE:
+            return False
+        if tag == T_LIST:
+            (size,) = unpack_u32(buf, pos)
+            pos += 4
+            return [decode() for _ in range(size)]
+        if tag == T_FLOAT:
+            (value,) = unpack_f64(buf, pos)
+            pos += 8
+            return value
+        if tag == T_BYTES:
+            (size,) = unpack_u32(buf, pos)
+            pos += 4
+            value = bytes(buf[pos : pos + size])
+            pos += size
+            return value
+        if tag == T_BIGINT:
+            (index,) = unpack_u32(buf, pos)
+            pos += 4
+            return int(strings[index])
+        raise PalbinError(f"未知的类型标签 0x{tag:02x}，位置 {pos - 1}")
+
+    # 解码会创建数以百万计的容器对象，期间关闭分代 GC 可以避免反复的全量扫描
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        result = decode()
+    finally:
+        if gc_enabled:
+            gc.enable()
+    if pos != len(buf):
+        raise PalbinError(f"数据末尾有 {len(buf) - pos} 字节未被解析")
+    return result
+
+
+def benchmark(data: dict, repeat: int = 3):
+    from time import perf_counter
+
+    def best(func):
+        timings = []
+        for _ in range(repeat):
+            start = perf_counter()
+            result = func()
+            timings.append(perf_counter() - start)
+        return min(timings), result
+
+    json_dump, json_text = best(
+        lambda: json.dumps(data, ensure_ascii=False, indent="\t")
+    )
+    json_bytes = json_text.encode("utf-8")
+    json_load, _ = best(lambda: json.loads(json_bytes.decode("utf-8")))
+    rows = [("json", json_dump, json_load, len(json_bytes))]
+    for compress in (False, True):
+        dump, raw = best(lambda: dumps(data, compress=compress))
+        load, result = best(lambda: loads(raw))
+        if result != data:
+            raise PalbinError("往返结果与原数据不一致")
+        rows.append(("palbin" + ("+zlib" if compress else ""), dump, load, len(raw)))
+    print(f"{'format':<12}{'save (s)':>10}{'load (s)':>10}{'size (MiB)':>12}")
+    for name, dump, load, size in rows:
+        print(f"{name:<12}{dump:>10.3f}{load:>10.3f}{size / 2**20:>12.2f}")
+
+
+if __name__ == "__main__":
+    import sys
+    from pathlib import Path
+
+    path = Path(sys.argv[1])
+    if path.suffix == ".sav":
+        from run import convert_sav_to_dict
+
+        data = convert_sav_to_dict(path)
+    elif path.suffix == ".palbin":
+        data = loads(path.read_bytes())
+    else:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    benchmark(data)
@@ -0,0 +1,49 @@
+"""帕鲁列表中被动技能的本地化名称。
+
+名称来自 Exports 中各语言的 DT_SkillNameText。ID 不区分大小写，找不到名称时显示
+ID 本身。解析结果按 (语言, ID) 缓存，切换语言后再切回不会重新查表。Exports 中
+没有种族名称的文本表，种族仍显示 CharacterID::
+
+    PAL_NAMES.passive_skills("en", ["Legend", "CraftSpeed_up1"])
+"""
+
+from __future__ import annotations
+
+from unpack import PASSIVE_SKILLS_NAME_TEXT_EN, PASSIVE_SKILLS_NAME_TEXT_ZH
+
+PASSIVE_SKILL_TEXT = {
+    "en": PASSIVE_SKILLS_NAME_TEXT_EN,
+    "zh_Hans": PASSIVE_SKILLS_NAME_TEXT_ZH,
+}
+PASSIVE_SKILL_SEPARATOR = ", "
+
+
+class NameResolver:
+    def __init__(self):
+        # 语言 -> 小写 ID -> 名称，某种语言第一次用到时才整理
+        self.tables: dict[str, dict[str, str]] = {}
+        self.cache: dict[tuple[str, str], str] = {}
+
+    def table(self, locale: str):
+        table = self.tables.get(locale)
+        if table is None:
+            texts = PASSIVE_SKILL_TEXT.get(locale, {})
+            table = self.tables[locale] = {k.casefold(): v for k, v in texts.items()}
+        return table
+
+    def passive_skill(self, locale: str, skill_id: str):
+        cache_key = (locale, skill_id)
+        name = self.cache.get(cache_key)
+        if name is None:
+            name = self.cache[cache_key] = self.table(locale).get(
+                skill_id.casefold(), skill_id
+            )
+        return name
+
+    def passive_skills(self, locale: str, skill_ids: list[str]):
+        return PASSIVE_SKILL_SEPARATOR.join(
+            self.passive_skill(locale, skill_id) for skill_id in skill_ids
+        )
+
+
+PAL_NAMES = NameResolver()
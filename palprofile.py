@@ -0,0 +1,80 @@
+"""用 cProfile 记录 GUI 操作，便于复现用户反馈的卡顿。
+
+在状态栏的 “Debug” 菜单中勾选 “Profile operations” 或设置环境变量
+PALWORLD_SAVE_EDITOR_PROFILE 即可启用。环境变量的值若是目录则作为输出目录，
+否则输出到当前目录下的 profiles::
+
+    PALWORLD_SAVE_EDITOR_PROFILE=1 python run.py
+
+每次操作生成两个文件：可用 pstats / snakeviz 打开的 <操作>-<时间>.pstats，以及
+按累计耗时排序的前 TOP_N 项文本摘要 <操作>-<时间>.txt。
+"""
+
+from __future__ import annotations
+
+import cProfile
+import functools
+import io
+import os
+import pstats
+import threading
+from datetime import datetime
+from pathlib import Path
+
+ENV_VAR = "PALWORLD_SAVE_EDITOR_PROFILE"
+DEFAULT_OUTPUT_DIR = Path("profiles")
+TOP_N = 40
+
+_enabled = bool(os.environ.get(ENV_VAR))
+_output_dir = (
+    Path(os.environ[ENV_VAR])
+    if _enabled and Path(os.environ[ENV_VAR]).is_dir()
+    else DEFAULT_OUTPUT_DIR
+)
+# 同一线程中嵌套的操作 (如 save_and_convert 中的 save) 由外层的 profiler 统一记录
+_active = threading.local()
+
+
+def is_enabled():
+    return _enabled
+
+
+def set_enabled(enabled: bool):
+    global _enabled
+    _enabled = enabled
+
+
+def output_dir():
+    return _output_dir
+
+
+def write_report(profiler: cProfile.Profile, operation: str, top: int = TOP_N):
+    _output_dir.mkdir(parents=True, exist_ok=True)
+    stem = f"{operation}-{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}"
+    pstats_path = _output_dir / f"{stem}.pstats"
+    profiler.dump_stats(pstats_path)
+    summary = io.StringIO()
+    stats = pstats.Stats(profiler, stream=summary)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top)
+    (_output_dir / f"{stem}.txt").write_text(summary.getvalue(), encoding="utf-8")
+    print(f"Profile of {operation} written to {pstats_path}")
+    return pstats_path
+
+
+def profiled(operation: str):
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled or getattr(_active, "profiling", False):
+                return func(*args, **kwargs)
+            profiler = cProfile.Profile()
+            _active.profiling = True
+            try:
+                return profiler.runcall(func, *args, **kwargs)
+            finally:
+                _active.profiling = False
+                write_report(profiler, operation)
+
+        return wrapper
+
+    return decorator
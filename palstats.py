@@ -0,0 +1,111 @@
+"""帕鲁的实际属性 (HP、近战攻击、远程攻击、防御力)。
+
+DT_PalMonsterParameter 的种族值在加载时整理为按列存放的数组，被动技能中作用于
+自身的 MaxHP / MeleeAttack / ShotAttack / Defense 百分比加成也预先汇总。计算时
+先把所有帕鲁的等级、个体值、强化等级等取成列，再逐列算出结果，公式为::
+
+    HP     = (500 + 5 * 等级 + 种族值 * 0.5 * 等级 * (1 + 个体值 * 0.003))
+    攻击    = (100 + 种族值 * 0.075 * 等级 * (1 + 个体值 * 0.003))
+    防御力  = (50 + 种族值 * 0.075 * 等级 * (1 + 个体值 * 0.003))
+    实际值  = 上式 * (1 + 灵魂强化 * 0.03) * (1 + 被动加成) * (1 + (星级 - 1) * 0.05)
+
+种族不在数据表中的帕鲁各项均为 0。
+"""
+
+from __future__ import annotations
+
+from typing import Iterable
+
+from unpack import DT_PMP, DT_PSM
+
+STAT_COLUMNS = ("HP", "MeleeAttack", "ShotAttack", "Defense")
+PASSIVE_EFFECT_TYPES = {
+    "EPalPassiveSkillEffectType::MaxHP": 0,
+    "EPalPassiveSkillEffectType::MeleeAttack": 1,
+    "EPalPassiveSkillEffectType::ShotAttack": 2,
+    "EPalPassiveSkillEffectType::Defense": 3,
+}
+SELF_TARGET_TYPES = {
+    "EPalPassiveSkillEffectTargetType::ToSelf",
+    "EPalPassiveSkillEffectTargetType::ToSelfAndTrainer",
+}
+# 每项属性的 (常数项, 每级常数, 种族值系数)
+STAT_FORMULAS = ((500, 5, 0.5), (100, 0, 0.075), (100, 0, 0.075), (50, 0, 0.075))
+TALENT_RATE = 0.003
+SOUL_RATE = 0.03
+CONDENSER_RATE = 0.05
+NO_PASSIVE_BONUS = (0.0, 0.0, 0.0, 0.0)
+
+
+class StatEngine:
+    def __init__(self, monster_parameters: dict, passive_skills: dict):
+        # 种族 ID 不区分大小写；base[列][行] 为种族值
+        self.species_index: dict[str, int] = {}
+        self.base: list[list[int]] = [[] for _ in STAT_COLUMNS]
+        for character_id, param in monster_parameters.items():
+            self.species_index[character_id.casefold()] = len(self.base[0])
+            for column, name in zip(self.base, STAT_COLUMNS):
+                column.append(param[name])
+        self.passive_bonus: dict[str, tuple[float, ...]] = {}
+        for skill_id, skill in passive_skills.items():
+            bonus = [0.0, 0.0, 0.0, 0.0]
+            for n in (1, 2, 3):
+                stat = PASSIVE_EFFECT_TYPES.get(skill[f"EffectType{n}"])
+                if stat is not None and skill[f"TargetType{n}"] in SELF_TARGET_TYPES:
+                    bonus[stat] += skill[f"EffectValue{n}"] / 100
+            if any(bonus):
+                self.passive_bonus[skill_id] = tuple(bonus)
+
+    def species_row(self, character_id: str):
+        return self.species_index.get(character_id.casefold())
+
+    def passive_multipliers(self, passive_skill_list: list[str]):
+        bonus = [1.0, 1.0, 1.0, 1.0]
+        passive_bonus = self.passive_bonus
+        for skill_id in passive_skill_list:
+            for stat, value in enumerate(passive_bonus.get(skill_id, NO_PASSIVE_BONUS)):
+                bonus[stat] += value
+        return bonus
+
+    def compute(self, pals: Iterable) -> list[tuple[int, int, int, int]]:
+        pals = list(pals)
+        species_row = self.species_row
+        rows = [species_row(pal.character_id) for pal in pals]
+        levels = [pal.level for pal in pals]
+        condensers = [1 + (max(pal.rank, 1) - 1) * CONDENSER_RATE for pal in pals]
+        passives = [self.passive_multipliers(pal.passive_skill_list) for pal in pals]
+        talents = (
+            [pal.talent_hp for pal in pals],
+            [pal.talent_melee for pal in pals],
+            [pal.talent_shot for pal in pals],
+            [pal.talent_defense for pal in pals],
+        )
+        souls = (
+            [pal.rank_hp for pal in pals],
+            [pal.rank_attack for pal in pals],
+            [pal.rank_attack for pal in pals],
+            [pal.rank_defense for pal in pals],
+        )
+        columns = []
+        for stat, (constant, per_level, rate) in enumerate(STAT_FORMULAS):
+            base = self.base[stat]
+            column = []
+            for row, level, talent, soul, passive, condenser in zip(
+                rows, levels, talents[stat], souls[stat], passives, condensers
+            ):
+                if row is None:
+                    column.append(0)
+                    continue
+                value = (
+                    constant
+                    + per_level * level
+                    + int(base[row] * rate * level * (1 + talent * TALENT_RATE))
+                )
+                column.append(
+                    int(value * (1 + soul * SOUL_RATE) * passive[stat] * condenser)
+                )
+            columns.append(column)
+        return list(zip(*columns))
+
+
+STAT_ENGINE = StatEngine(DT_PMP, DT_PSM)
@@ -0,0 +1,131 @@
+"""多线程 zlib 压缩，用于回写 .sav 文件。
+
+把数据切成若干块，在线程池中分别做 raw deflate (zlib 在压缩时会释放 GIL)，
+再拼接成一个标准的 zlib 流：除最后一块外每块都以 Z_SYNC_FLUSH 结尾，使块与块
+在字节边界上衔接；每块以前一块末尾 32 KiB 作为预设字典，压缩率与单线程几乎
+相同。外层加上 zlib 头和整段数据的 Adler-32 校验，因此任何 zlib 解压器
+(包括游戏本身) 都能直接读取。
+
+直接运行本模块可以对比单线程与多线程在不同压缩级别下的吞吐量和体积::
+
+    python palzip.py Level.sav
+"""
+
+from __future__ import annotations
+
+import os
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+MAGIC_BYTES = b"PlZ"
+WINDOW_SIZE = 32 * 1024
+DEFAULT_CHUNK_SIZE = 4 * 1024 * 1024
+
+
+def zlib_header(level: int):
+    # CMF = deflate + 32 KiB 窗口，FLG 中的 FLEVEL 只是提示，FCHECK 使头部能被 31 整除
+    if level == zlib.Z_DEFAULT_COMPRESSION:
+        level = 6
+    if level < 2:
+        flevel = 0
+    elif level < 6:
+        flevel = 1
+    elif level == 6:
+        flevel = 2
+    else:
+        flevel = 3
+    cmf = 0x78
+    flg = flevel << 6
+    flg |= 31 - (cmf * 256 + flg) % 31
+    return bytes([cmf, flg])
+
+
+def compress(
+    data: bytes,
+    level: int = zlib.Z_DEFAULT_COMPRESSION,
+    workers: int = 1,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> bytes:
+    if workers <= 1 or len(data) <= chunk_size:
+        return zlib.compress(data, level)
+    view = memoryview(data)
+    offsets = range(0, len(view), chunk_size)
+    last = offsets[-1]
+
+    def deflate(start: int):
+        kwargs = {}
+        if start:
+            kwargs["zdict"] = view[max(0, start - WINDOW_SIZE) : start]
+        compressor = zlib.compressobj(
+            level, zlib.DEFLATED, -zlib.MAX_WBITS, **kwargs
+        )
+        out = compressor.compress(view[start : start + chunk_size])
+        return out + compressor.flush(
+            zlib.Z_FINISH if start == last else zlib.Z_SYNC_FLUSH
+        )
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        parts = executor.map(deflate, offsets)
+        checksum = zlib.adler32(view)
+        result = bytearray(zlib_header(level))
+        for part in parts:
+            result += part
+    result += checksum.to_bytes(4, byteorder="big")
+    return bytes(result)
+
+
+def compress_gvas_to_sav(
+    data: bytes,
+    save_type: int,
+    level: int = zlib.Z_DEFAULT_COMPRESSION,
+    workers: int = 1,
+) -> bytes:
+    # 与 palsav.compress_gvas_to_sav 的输出格式相同，额外支持压缩级别和线程数
+    uncompressed_len = len(data)
+    compressed_data = compress(data, level, workers)
+    compressed_len = len(compressed_data)
+    if save_type == 0x32:
+        compressed_data = compress(compressed_data, level, workers)
+
+    result = bytearray()
+    result.extend(uncompressed_len.to_bytes(4, byteorder="little"))
+    result.extend(compressed_len.to_bytes(4, byteorder="little"))
+    result.extend(MAGIC_BYTES)
+    result.extend(bytes([save_type]))
+    result.extend(compressed_data)
+    return bytes(result)
+
+
+def default_workers():
+    return os.cpu_count() or 1
+
+
+def benchmark(raw_gvas: bytes, save_type: int = 0x32, repeat: int = 3):
+    from time import perf_counter
+
+    cpu_count = default_workers()
+    worker_counts = sorted({1, 2, 4, cpu_count})
+    print(f"GVAS size: {len(raw_gvas) / 2**20:.2f} MiB, CPUs: {cpu_count}")
+    print(f"{'level':>6}{'workers':>9}{'time (s)':>10}{'MiB/s':>9}{'size (MiB)':>12}")
+    for level in (1, 6, 9):
+        for workers in worker_counts:
+            timings = []
+            for _ in range(repeat):
+                start = perf_counter()
+                sav = compress_gvas_to_sav(raw_gvas, save_type, level, workers)
+                timings.append(perf_counter() - start)
+            elapsed = min(timings)
+            print(
+                f"{level:>6}{workers:>9}{elapsed:>10.3f}"
+                f"{len(raw_gvas) / 2**20 / elapsed:>9.1f}{len(sav) / 2**20:>12.2f}"
+            )
+
+
+if __name__ == "__main__":
+    import sys
+    from pathlib import Path
+
+    from run import decompress_sav_file
+
+    raw_gvas, save_type = decompress_sav_file(Path(sys.argv[1]))
+    benchmark(raw_gvas, save_type)
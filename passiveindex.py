@@ -0,0 +1,244 @@
+"""被动技能位图索引。
+
+每个被动技能按其在 unpack.PASSIVE_SKILLS 中的位置分配一个位，存档中出现的
+未知技能在其后依次追加；每只帕鲁的被动技能编码为一个整数掩码
+(Pal.passive_skill_mask)。索引再为每个技能保存一个覆盖全部帕鲁的位图
+(第 i 位表示第 i 只帕鲁拥有该技能)，组合查询只需对这些大整数做按位与 / 或::
+
+    index.with_all(["MoveSpeed_up_3", "Legend"])
+    index.best_parents(["MoveSpeed_up_3", "Legend", "PAL_ALLAttack_up3"])
+    python passiveindex.py Level.sav --all MoveSpeed_up_3 Legend --parents
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Iterable
+
+from unpack import PASSIVE_SKILLS
+
+# 0~255 每个字节中为 1 的位
+BYTE_BITS = [tuple(bit for bit in range(8) if byte >> bit & 1) for byte in range(256)]
+PARENTS_PER_GROUP = 3
+
+
+class PassiveSkillBits:
+    def __init__(self, skills: Iterable[str]):
+        self.skills: list[str] = []
+        self.bits: dict[str, int] = {}
+        for skill in skills:
+            self.bit(skill)
+
+    def bit(self, skill: str):
+        bit = self.bits.get(skill)
+        if bit is None:
+            bit = self.bits[skill] = 1 << len(self.skills)
+            self.skills.append(skill)
+        return bit
+
+    def encode(self, skills: Iterable[str]):
+        mask = 0
+        for skill in skills:
+            mask |= self.bit(skill)
+        return mask
+
+    def lookup_mask(self, skills: Iterable[str]):
+        # 查询用，不为未知技能分配新的位；含未知技能时返回 None
+        mask = 0
+        for skill in skills:
+            bit = self.bits.get(skill)
+            if bit is None:
+                return None
+            mask |= bit
+        return mask
+
+    def known(self, skills: Iterable[str]):
+        return [skill for skill in skills if skill in self.bits]
+
+    def decode(self, mask: int):
+        return [self.skills[i] for i in positions(mask)]
+
+
+PASSIVE_SKILL_BITS = PassiveSkillBits(PASSIVE_SKILLS)
+
+
+def positions(bitset: int):
+    # 逐字节查表列出为 1 的位，避免对大整数反复移位
+    data = bitset.to_bytes((bitset.bit_length() + 7) // 8, "little")
+    for offset, byte in enumerate(data):
+        if byte:
+            base = offset * 8
+            for bit in BYTE_BITS[byte]:
+                yield base + bit
+
+
+@dataclass
+class ParentPair:
+    father: object
+    mother: object
+    covered: list[str]
+    extra: int
+
+
+class PassiveSkillIndex:
+    def __init__(self, pals: Iterable = ()):
+        self.pals: list = []
+        self.masks: list[int] = []
+        self.position: dict[str, int] = {}
+        # 技能位的序号 -> 拥有该技能的帕鲁位图
+        self.postings: dict[int, int] = {}
+        for pal in pals:
+            self.add(pal)
+
+    @property
+    def everyone(self):
+        return (1 << len(self.pals)) - 1
+
+    def add(self, pal):
+        i = len(self.pals)
+        self.pals.append(pal)
+        self.masks.append(0)
+        self.position[pal.instance_id] = i
+        self.set_mask(i, pal.passive_skill_mask)
+        # Pal.config 修改被动技能时通过它同步更新索引
+        pal.passive_index = self
+
+    def set_mask(self, i: int, mask: int):
+        pal_bit = 1 << i
+        old = self.masks[i]
+        for skill in positions(old & ~mask):
+            self.postings[skill] &= ~pal_bit
+        for skill in positions(mask & ~old):
+            self.postings[skill] = self.postings.get(skill, 0) | pal_bit
+        self.masks[i] = mask
+
+    def update(self, pal):
+        # 编辑帕鲁的被动技能后调用
+        i = self.position.get(pal.instance_id)
+        if i is None:
+            self.add(pal)
+        else:
+            self.set_mask(i, pal.passive_skill_mask)
+
+    def select_all(self, mask: int, within: int = None):
+        result = self.everyone if within is None else within
+        for skill in positions(mask):
+            result &= self.postings.get(skill, 0)
+            if not result:
+                break
+        return result
+
+    def select_any(self, mask: int, within: int = None):
+        result = 0
+        for skill in positions(mask):
+            result |= self.postings.get(skill, 0)
+        return result if within is None else result & within
+
+    def bitset_of(self, pals: Iterable):
+        bitset = 0
+        for pal in pals:
+            i = self.position.get(pal.instance_id)
+            if i is not None:
+                bitset |= 1 << i
+        return bitset
+
+    def pals_in(self, bitset: int):
+        return [self.pals[i] for i in positions(bitset)]
+
+    def with_all(self, skills: Iterable[str]):
+        mask = PASSIVE_SKILL_BITS.lookup_mask(skills)
+        return [] if mask is None else self.pals_in(self.select_all(mask))
+
+    def with_any(self, skills: Iterable[str]):
+        mask = PASSIVE_SKILL_BITS.lookup_mask(PASSIVE_SKILL_BITS.known(skills))
+        return self.pals_in(self.select_any(mask))
+
+    def count_with_all(self, skills: Iterable[str]):
+        mask = PASSIVE_SKILL_BITS.lookup_mask(skills)
+        return 0 if mask is None else self.select_all(mask).bit_count()
+
+    def best_parents(
+        self, skills: Iterable[str], within: int = None, limit: int = 10
+    ) -> list[ParentPair]:
+        # 按 (覆盖的目标技能, 性别) 分组，每组只保留多余技能最少的几只，
+        # 再两两组合父母：覆盖的目标技能越多越好，其次多余技能越少越好
+        # 未知的技能不可能被覆盖，只按已知的技能挑选
+        target = PASSIVE_SKILL_BITS.lookup_mask(PASSIVE_SKILL_BITS.known(skills))
+        groups: dict[tuple[int, str], list[tuple[int, int]]] = {}
+        for i in positions(self.select_any(target, within)):
+            mask = self.masks[i]
+            gender = self.pals[i].gender
+            if gender not in ("Male", "Female"):
+                continue
+            group = groups.setdefault((mask & target, gender), [])
+            group.append(((mask & ~target).bit_count(), i))
+        for group in groups.values():
+            group.sort()
+            del group[PARENTS_PER_GROUP:]
+        fathers = [(c, g) for (c, gender), g in groups.items() if gender == "Male"]
+        mothers = [(c, g) for (c, gender), g in groups.items() if gender == "Female"]
+        candidates = []
+        for father_covered, father_group in fathers:
+            for mother_covered, mother_group in mothers:
+                covered = father_covered | mother_covered
+                for _, f in father_group:
+                    for _, m in mother_group:
+                        extra = ((self.masks[f] | self.masks[m]) & ~target).bit_count()
+                        candidates.append((-covered.bit_count(), extra, f, m, covered))
+        candidates.sort()
+        return [
+            ParentPair(
+                self.pals[f], self.pals[m], PASSIVE_SKILL_BITS.decode(covered), extra
+            )
+            for _, extra, f, m, covered in candidates[:limit]
+        ]
+
+
+if __name__ == "__main__":
+    import argparse
+    from pathlib import Path
+    from time import perf_counter
+
+    from run import find_player, load_world
+
+    parser = argparse.ArgumentParser(description="按被动技能组合查询帕鲁")
+    parser.add_argument("save", type=Path)
+    parser.add_argument("--all", nargs="+", default=[], metavar="SKILL")
+    parser.add_argument("--any", nargs="+", default=[], metavar="SKILL")
+    parser.add_argument("--player", help="只在该玩家 (UID 或昵称) 的帕鲁中查询")
+    parser.add_argument(
+        "--parents", action="store_true", help="列出最能凑齐 --all 技能的父母组合"
+    )
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    world_index = load_world(args.save)
+    index = world_index.passive_index
+    within = None
+    if args.player:
+        ownership = world_index.ownership
+        player_uid = find_player(ownership, args.player)
+        if player_uid is None:
+            parser.error(f"player not found: {args.player}")
+        within = index.bitset_of(ownership.pals_of_player(player_uid))
+
+    start = perf_counter()
+    result = index.everyone if within is None else within
+    if args.all:
+        mask = PASSIVE_SKILL_BITS.lookup_mask(args.all)
+        result = 0 if mask is None else index.select_all(mask, result)
+    if args.any:
+        mask = PASSIVE_SKILL_BITS.lookup_mask(PASSIVE_SKILL_BITS.known(args.any))
+        result = index.select_any(mask, result)
+    elapsed = (perf_counter() - start) * 1000
+    pals = index.pals_in(result)
+    for pal in pals[: args.limit]:
+        print(f"{pal.instance_id}  {pal.character_id:<24}{pal.passive_skill_list}")
+    print(f"{len(pals)} pals matched in {elapsed:.2f} ms")
+    if args.parents and args.all:
+        for pair in index.best_parents(args.all, within, args.limit):
+            print(
+                f"{pair.father.character_id} ({pair.father.instance_id}) x "
+                f"{pair.mother.character_id} ({pair.mother.instance_id}): "
+                f"covers {pair.covered}, {pair.extra} other passives"
+            )
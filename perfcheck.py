@@ -0,0 +1,288 @@
+"""性能回归检查。
+
+在合成存档上运行转换、模型构建 (Guild / Player / Pal.__post_init__)、索引和
+序列化各路径，记录每项的耗时 (多次运行取最小值) 与 tracemalloc 峰值内存，并与
+基线 JSON 文件比较。任一项超出容差即以非零状态退出，可用于发布前在本机把关::
+
+    python perfcheck.py --update          # 记录当前结果为基线
+    python perfcheck.py                   # 与基线比较，回归时退出码为 1
+
+基线与机器相关，只应与同一台机器上的结果比较；基线记录的主机名与本机不同时
+拒绝比较。
+"""
+
+from __future__ import annotations
+
+import gc
+import json
+import platform
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+from time import perf_counter
+
+import palbin
+from bench import world_for_scale
+from run import (
+    PASSTHROUGH_SECTIONS,
+    Guild,
+    Pal,
+    Player,
+    convert_dict_to_sav,
+    convert_sav_to_dict,
+    index_world,
+)
+from synth import write_sav
+
+BASELINE_VERSION = 1
+DEFAULT_BASELINE = Path("perf_baseline.json")
+DEFAULT_PALS = 10000
+DEFAULT_REPEAT = 5
+DEFAULT_TIME_TOLERANCE = 0.25
+DEFAULT_MEMORY_TOLERANCE = 0.10
+# 低于该值的耗时受计时抖动影响太大，只在超出此绝对值时才算回归
+MIN_TIME_DELTA = 0.01
+
+EXIT_OK = 0
+EXIT_REGRESSION = 1
+EXIT_NO_BASELINE = 2
+
+
+def world_save_data(data: dict):
+    return data["properties"]["worldSaveData"]["value"]
+
+
+def copy_data(data: dict):
+    # palbin 往返比 copy.deepcopy 快得多
+    return palbin.loads(palbin.dumps(data, compress=False))
+
+
+def group_data_list(data: dict):
+    return [
+        i["value"]["RawData"]["value"]
+        for i in world_save_data(data)["GroupSaveDataMap"]["value"]
+    ]
+
+
+def character_entries(data: dict):
+    return [
+        (
+            i["key"]["PlayerUId"]["value"],
+            i["key"]["InstanceId"]["value"],
+            i["value"]["RawData"]["value"]["object"]["SaveParameter"]["value"],
+        )
+        for i in world_save_data(data)["CharacterSaveParameterMap"]["value"]
+    ]
+
+
+def construct_guilds(group_data_list: list):
+    return [Guild(group_data) for group_data in group_data_list]
+
+
+def construct_players(group_data_list: list, characters: dict):
+    return [
+        Player(characters[player["player_uid"]], guild, player["player_uid"], "")
+        for guild in construct_guilds(group_data_list)
+        for player in guild.players
+    ]
+
+
+def construct_pals(entries: list):
+    return [
+        Pal(instance_id, character_data)
+        for player_uid, instance_id, character_data in entries
+        if character_data.get("CharacterID")
+    ]
+
+
+def build_benchmarks(sav_path: Path, workdir: Path):
+    # 每项为 (名称, setup, func)：setup 不计时，其返回值作为 func 的参数
+    full_data = convert_sav_to_dict(sav_path)
+    lazy_data = convert_sav_to_dict(
+        sav_path, passthrough_sections=PASSTHROUGH_SECTIONS, lazy_character_data=True
+    )
+    groups = group_data_list(full_data)
+    entries = character_entries(full_data)
+    players = {
+        player_uid: character_data
+        for player_uid, instance_id, character_data in entries
+        if character_data.get("IsPlayer")
+    }
+    palbin_bytes = palbin.dumps(full_data)
+    json_text = json.dumps(full_data, ensure_ascii=False, indent="\t")
+    return [
+        ("convert_sav_to_dict", lambda: (sav_path,), convert_sav_to_dict),
+        (
+            "convert_sav_to_dict_lazy",
+            lambda: (sav_path,),
+            lambda path: convert_sav_to_dict(
+                path,
+                passthrough_sections=PASSTHROUGH_SECTIONS,
+                lazy_character_data=True,
+            ),
+        ),
+        (
+            "convert_dict_to_sav",
+            lambda: (copy_data(full_data), workdir / "out.sav"),
+            convert_dict_to_sav,
+        ),
+        ("guild_init", lambda: (groups,), construct_guilds),
+        ("player_init", lambda: (groups, players), construct_players),
+        ("pal_init", lambda: (entries,), construct_pals),
+        (
+            "index_world",
+            lambda: (world_save_data(copy_data(lazy_data)),),
+            index_world,
+        ),
+        ("palbin_dumps", lambda: (full_data,), palbin.dumps),
+        ("palbin_loads", lambda: (palbin_bytes,), palbin.loads),
+        (
+            "json_dumps",
+            lambda: (full_data,),
+            lambda data: json.dumps(data, ensure_ascii=False, indent="\t"),
+        ),
+        ("json_loads", lambda: (json_text,), json.loads),
+    ]
+
+
+def measure(setup, func, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        args = setup()
+        gc.collect()
+        start = perf_counter()
+        result = func(*args)
+        timings.append(perf_counter() - start)
+        del args, result
+    # 内存单独测一次：tracemalloc 会显著拖慢执行，不能与计时同时进行
+    args = setup()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = func(*args)
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del args, result
+    return min(timings), peak
+
+
+def run_checks(pals: int = DEFAULT_PALS, repeat: int = DEFAULT_REPEAT, seed: int = 0):
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        workdir = Path(workdir)
+        sav_path = workdir / "synth.sav"
+        write_sav(world_for_scale(pals, seed), sav_path, keep_data=False)
+        benchmarks = build_benchmarks(sav_path, workdir)
+        for name, setup, func in benchmarks:
+            seconds, peak = measure(setup, func, repeat)
+            results[name] = {"seconds": seconds, "peak_bytes": peak}
+            print(f"{name:<28}{seconds:>10.3f} s{peak / 2**20:>10.1f} MiB", flush=True)
+    return {
+        "version": BASELINE_VERSION,
+        "pals": pals,
+        "seed": seed,
+        "python": platform.python_version(),
+        "machine": platform.node(),
+        "results": results,
+    }
+
+
+def compare(
+    baseline: dict,
+    current: dict,
+    time_tolerance: float = DEFAULT_TIME_TOLERANCE,
+    memory_tolerance: float = DEFAULT_MEMORY_TOLERANCE,
+):
+    regressions = []
+    print(
+        f"{'benchmark':<28}{'time':>10}{'baseline':>10}{'ratio':>8}"
+        f"{'MiB':>10}{'baseline':>10}{'ratio':>8}  status"
+    )
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            print(f"{name:<28}{result['seconds']:>10.3f}{'-':>10}  new")
+            continue
+        time_ratio = result["seconds"] / base["seconds"] if base["seconds"] else 1.0
+        memory_ratio = (
+            result["peak_bytes"] / base["peak_bytes"] if base["peak_bytes"] else 1.0
+        )
+        slower = (
+            time_ratio > 1 + time_tolerance
+            and result["seconds"] - base["seconds"] > MIN_TIME_DELTA
+        )
+        larger = memory_ratio > 1 + memory_tolerance
+        status = []
+        if slower:
+            status.append("SLOWER")
+        if larger:
+            status.append("MORE MEMORY")
+        if status:
+            regressions.append(name)
+        print(
+            f"{name:<28}{result['seconds']:>10.3f}{base['seconds']:>10.3f}"
+            f"{time_ratio:>8.2f}{result['peak_bytes'] / 2**20:>10.1f}"
+            f"{base['peak_bytes'] / 2**20:>10.1f}{memory_ratio:>8.2f}"
+            f"  {', '.join(status) or 'ok'}"
+        )
+    return regressions
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="与基线比较，检查性能回归")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument(
+        "--update", action="store_true", help="把本次结果写入基线文件"
+    )
+    parser.add_argument("--pals", type=int, default=None)
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument(
+        "--time-tolerance", type=float, default=DEFAULT_TIME_TOLERANCE
+    )
+    parser.add_argument(
+        "--memory-tolerance", type=float, default=DEFAULT_MEMORY_TOLERANCE
+    )
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        if baseline.get("version") != BASELINE_VERSION:
+            print(f"Unsupported baseline version: {baseline.get('version')}")
+            return EXIT_NO_BASELINE
+    elif not args.update:
+        # 没有基线时不运行基准测试，避免白白跑完一遍
+        print(f"No baseline at {args.baseline}, run with --update first")
+        return EXIT_NO_BASELINE
+    pals = args.pals or (baseline["pals"] if baseline else DEFAULT_PALS)
+    if baseline and not args.update and baseline["pals"] != pals:
+        print(f"Baseline was recorded with {baseline['pals']} pals, not {pals}")
+        return EXIT_NO_BASELINE
+    if baseline and not args.update and baseline.get("machine") != platform.node():
+        print(
+            f"Baseline was recorded on {baseline.get('machine')}, not"
+            f" {platform.node()}, run with --update to record one for this machine"
+        )
+        return EXIT_NO_BASELINE
+
+    current = run_checks(pals, args.repeat, baseline["seed"] if baseline else 0)
+    if args.update:
+        args.baseline.write_text(json.dumps(current, indent="\t"), encoding="utf-8")
+        print(f"Baseline written to {args.baseline}")
+        return EXIT_OK
+    regressions = compare(
+        baseline, current, args.time_tolerance, args.memory_tolerance
+    )
+    if regressions:
+        print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+        return EXIT_REGRESSION
+    print("No regressions")
+    return EXIT_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main())
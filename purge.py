@@ -0,0 +1,219 @@
+"""清理长期未上线的玩家。
+
+以 GameTimeSaveData.RealDateTimeTicks 为当前时间，找出 last_online_real_time
+早于 N 天的公会成员，在一次遍历建立的索引上级联删除：
+
+    - 玩家的角色条目，以及 OwnerPlayerUId 为该玩家的帕鲁
+    - 公会成员列表中的该玩家 (管理员被删除时由剩余的第一名成员接任)
+    - 组中的角色引用与容器中指向被删除帕鲁的槽位 (见 compact.remove_characters)
+    - 玩家自己的队伍与帕鲁终端容器 (ID 取自 Players 目录下的玩家存档)；其他
+      容器 (例如仍被 BaseCampSaveData 引用的据点工作容器) 只清空槽位并保留
+    - 没有成员的公会及其据点工作帕鲁；仍拥有据点的公会会保留并在报告中列出，
+      因为据点数据还被 BaseCampSaveData 等段引用
+
+    python purge.py Level.sav --days 30
+    python purge.py Level.sav --days 30 --apply -o Level.sav --delete-player-files
+
+--delete-player-files 只在新存档覆盖原存档时可用，且在写出成功后才执行；玩家
+存档不会直接删除，而是移到 Players/purged 目录下。
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterable
+
+from compact import (
+    container_entries,
+    group_entries,
+    print_size_report,
+    remove_characters,
+    remove_groups,
+    save_sizes,
+    world_save_data,
+)
+from run import (
+    TICKS_PER_DAY,
+    ZERO_GUID,
+    character_group_id,
+    extract_character_fields,
+    load_save,
+    write_save,
+)
+
+PLAYER_CONTAINER_KEYS = ("OtomoCharacterContainerId", "PalStorageContainerId")
+
+
+@dataclass
+class PurgePlan:
+    players: dict[str, str] = field(default_factory=dict)
+    instance_ids: set[str] = field(default_factory=set)
+    groups: set[str] = field(default_factory=set)
+    kept_groups: dict[str, int] = field(default_factory=dict)
+    containers: set[str] = field(default_factory=set)
+
+
+def index_characters(data: dict):
+    # 一次遍历：所有者 (玩家 UID 或 group_id) -> 实例 ID，容器 ID -> 实例 ID
+    by_owner: dict[str, list[str]] = {}
+    by_group: dict[str, list[str]] = {}
+    by_container: dict[str, list[str]] = {}
+    for entry in world_save_data(data)["CharacterSaveParameterMap"]["value"]:
+        instance_id = entry["key"]["InstanceId"]["value"]
+        owner = entry["key"]["PlayerUId"]["value"]
+        raw_data = entry["value"]["RawData"]
+        character = extract_character_fields(raw_data)
+        if owner == ZERO_GUID and character.get("OwnerPlayerUId"):
+            owner = character["OwnerPlayerUId"]["value"]
+        by_owner.setdefault(owner, []).append(instance_id)
+        if owner == ZERO_GUID:
+            by_group.setdefault(character_group_id(raw_data), []).append(instance_id)
+        if character.get("SlotID"):
+            container_id = character["SlotID"]["value"]["ContainerId"]["value"]["ID"][
+                "value"
+            ]
+            by_container.setdefault(container_id, []).append(instance_id)
+    return by_owner, by_group, by_container
+
+
+def plan_purge(
+    data: dict,
+    days: float,
+    containers_of_player: Callable[[str], set[str]] = None,
+):
+    # containers_of_player 返回玩家自己的容器 ID，未提供时不删除任何容器
+    world = world_save_data(data)
+    now = world["GameTimeSaveData"]["value"]["RealDateTimeTicks"]["value"]
+    threshold = now - days * TICKS_PER_DAY
+    by_owner, by_group, by_container = index_characters(data)
+    plan = PurgePlan()
+    for entry in group_entries(data):
+        group_data = entry["value"]["RawData"]["value"]
+        players = group_data.get("players")
+        if not players:
+            continue
+        inactive = [
+            player
+            for player in players
+            if player["player_info"]["last_online_real_time"] < threshold
+        ]
+        for player in inactive:
+            plan.players[player["player_uid"]] = player["player_info"]["player_name"]
+            plan.instance_ids.update(by_owner.get(player["player_uid"], []))
+            if containers_of_player:
+                plan.containers.update(containers_of_player(player["player_uid"]))
+        if len(inactive) == len(players):
+            group_id = group_data["group_id"]
+            if group_data.get("base_ids"):
+                plan.kept_groups[group_id] = len(group_data["base_ids"])
+            else:
+                plan.groups.add(group_id)
+                plan.instance_ids.update(by_group.get(group_id, []))
+    # 玩家的容器中如果还有不被清理的角色，只清空槽位
+    plan.containers = {
+        container_id
+        for container_id in plan.containers - {ZERO_GUID}
+        if plan.instance_ids.issuperset(by_container.get(container_id, []))
+    }
+    return plan
+
+
+def apply_purge(data: dict, plan: PurgePlan):
+    for entry in group_entries(data):
+        group_data = entry["value"]["RawData"]["value"]
+        if not group_data.get("players"):
+            continue
+        group_data["players"] = [
+            player
+            for player in group_data["players"]
+            if player["player_uid"] not in plan.players
+        ]
+        if group_data.get("admin_player_uid") in plan.players:
+            group_data["admin_player_uid"] = (
+                group_data["players"][0]["player_uid"]
+                if group_data["players"]
+                else ZERO_GUID
+            )
+    removed_characters = remove_characters(data, plan.instance_ids)
+    removed_groups = remove_groups(data, plan.groups)
+    container_map = world_save_data(data).get("CharacterContainerSaveData")
+    removed_containers = 0
+    if container_map and plan.containers:
+        before = len(container_map["value"])
+        container_map["value"] = [
+            entry
+            for entry in container_entries(data)
+            if entry["key"]["ID"]["value"] not in plan.containers
+        ]
+        removed_containers = before - len(container_map["value"])
+    return removed_characters, removed_groups, removed_containers
+
+
+def player_save_path(save_path: Path, player_uid: str):
+    return save_path.parent / "Players" / f"{player_uid.replace('-', '').upper()}.sav"
+
+
+def backup_player_files(save_path: Path, player_uids: Iterable[str]):
+    # 把玩家存档移到 Players/purged，而不是直接删除
+    backup_dir = save_path.parent / "Players" / "purged"
+    for player_uid in player_uids:
+        path = player_save_path(save_path, player_uid)
+        if path.exists():
+            backup_dir.mkdir(exist_ok=True)
+            path.replace(backup_dir / path.name)
+            print(f"Moved {path} to {backup_dir}")
+
+
+def player_container_ids(save_path: Path, player_uid: str):
+    path = player_save_path(save_path, player_uid)
+    if not path.exists():
+        print(f"Warning: {path.name} not found, containers of {player_uid} are kept")
+        return set()
+    save_data = load_save(path)["properties"]["SaveData"]["value"]
+    return {
+        save_data[key]["value"]["ID"]["value"]
+        for key in PLAYER_CONTAINER_KEYS
+        if save_data.get(key)
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="清理长期未上线的玩家")
+    parser.add_argument("save", type=Path)
+    parser.add_argument("--days", type=float, required=True)
+    parser.add_argument("--apply", action="store_true", help="执行清理并写出新存档")
+    parser.add_argument(
+        "--delete-player-files",
+        action="store_true",
+        help="同时把 Players 目录下对应的玩家存档移到 Players/purged",
+    )
+    parser.add_argument("-o", "--output", type=Path, help="新存档的输出路径")
+    args = parser.parse_args()
+    output = args.output or args.save.with_name(f"{args.save.stem}.purged.sav")
+    if args.delete_player_files and output.resolve() != args.save.resolve():
+        # 原存档仍引用这些玩家，不能让它失去对应的玩家存档
+        parser.error("--delete-player-files requires -o to overwrite the input save")
+
+    data = load_save(args.save)
+    plan = plan_purge(
+        data, args.days, lambda player_uid: player_container_ids(args.save, player_uid)
+    )
+    for player_uid, name in plan.players.items():
+        print(f"player  {player_uid}  {name}")
+    for group_id, bases in plan.kept_groups.items():
+        print(f"kept    {group_id}  guild has no members left but owns {bases} bases")
+    print(
+        f"{len(plan.players)} players, {len(plan.instance_ids)} characters,"
+        f" {len(plan.groups)} guilds, {len(plan.containers)} containers to remove"
+    )
+    if args.apply:
+        removed = apply_purge(data, plan)
+        print("Removed {} characters, {} guilds, {} containers".format(*removed))
+        before = save_sizes(args.save)
+        write_save(data, output)
+        print_size_report(before, output)
+        if args.delete_player_files:
+            backup_player_files(args.save, plan.players)
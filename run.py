@@ -1,31 +1,50 @@
 from __future__ import annotations
 
 import asyncio
+import base64
+import copy
 import json
+import mmap
+import re
 import threading
 import tkinter as tk
-from dataclasses import dataclass
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from sys import modules
+from sys import intern, modules
 from tkinter import filedialog, messagebox, ttk
 
 from save_tools import palworld_save_tools
 
 modules["palworld_save_tools"] = palworld_save_tools
+# 必须与 gvas 及 rawdata 解码器使用同一份 archive 模块，否则 UUID 等类型不一致
+from palworld_save_tools.archive import FArchiveReader
+from palworld_save_tools.rawdata.character import (
+    decode_bytes as decode_character_bytes,
+)
+import codectiming
+import palbin
+import palprofile
+import palzip
+from exptable import EXP_TABLE, MAX_LEVEL
+from memtrace import MemoryTracer, traced
+from palnames import PAL_NAMES
+from palstats import STAT_ENGINE
+from passiveindex import PASSIVE_SKILL_BITS, PassiveSkillIndex
+from skillsearch import skill_search_index
+from datatable import PAL_MONSTER_TABLE, species_ids
 from L10N import L10N
-from save_tools.palworld_save_tools.gvas import GvasFile
+from save_tools.palworld_save_tools.gvas import GvasFile, GvasHeader
 from save_tools.palworld_save_tools.json_tools import CustomEncoder
-from save_tools.palworld_save_tools.palsav import (
-    compress_gvas_to_sav,
-    decompress_sav_to_gvas,
-)
+from save_tools.palworld_save_tools.palsav import decompress_sav_to_gvas
 from save_tools.palworld_save_tools.paltypes import (
     DISABLED_PROPERTIES,
     PALWORLD_CUSTOM_PROPERTIES,
     PALWORLD_TYPE_HINTS,
 )
-from unpack import CHARACTER_IDS, DT_PET, KV_PASSIVE_SKILL, KV_WAZA
+from unpack import CHARACTER_IDS, KV_PASSIVE_SKILL
 
 
 async def get_submodule_commit():
@@ -40,30 +59,533 @@ async def get_submodule_commit():
 KNOWN_PROPS = list(set(PALWORLD_CUSTOM_PROPERTIES.keys()) - DISABLED_PROPERTIES)
 
 
+class ZeroCopyArchiveReader(FArchiveReader):
+    # 原版 byte_list 会把 RawData 逐字节解包成 tuple，解码时再 bytes() 复制一次；
+    # 直接返回 bytes 时 bytes(...) 不会再复制，也不会产生数以百万计的 tuple 元素
+    def byte_list(self, size: int):
+        return self.data.read(size)
+
+    def internal_copy(self, data, debug: bool):
+        return type(self)(
+            data,
+            self.type_hints,
+            self.custom_properties,
+            debug=debug,
+            allow_nan=self.allow_nan,
+        )
+
+
+class SaveEncoder(CustomEncoder):
+    def default(self, obj):
+        if isinstance(obj, (bytes, bytearray, memoryview)):
+            return list(obj)
+        return super().default(obj)
+
+
+# 类型名、枚举值、GUID 等短字符串在存档中重复数百万次，超过该长度的 (如 base64) 不驻留
+MAX_INTERN_LENGTH = 64
+
+
+def intern_object_pairs(pairs: list[tuple]):
+    # json.loads 的 object_pairs_hook：把键、字符串值和字符串数组的元素都驻留，
+    # 使整个世界中相同的字符串只保留一份
+    result = {}
+    for k, v in pairs:
+        if type(v) is str:
+            if len(v) <= MAX_INTERN_LENGTH:
+                v = intern(v)
+        elif type(v) is list and v and type(v[0]) is str:
+            v = [
+                intern(x) if type(x) is str and len(x) <= MAX_INTERN_LENGTH else x
+                for x in v
+            ]
+        result[intern(k)] = v
+    return result
+
+
+def load_json(text: str, intern_strings=True):
+    if intern_strings:
+        return json.loads(text, object_pairs_hook=intern_object_pairs)
+    return json.loads(text)
+
+
+def string_memory(data):
+    # 统计树中 str 对象的引用数、不同对象数及其实际占用的字节数 (同一对象只计一次)
+    from sys import getsizeof
+
+    seen = set()
+    references = 0
+    size = 0
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        if type(value) is dict:
+            stack.extend(value)
+            stack.extend(value.values())
+        elif type(value) is list:
+            stack.extend(value)
+        elif type(value) is str:
+            references += 1
+            if id(value) not in seen:
+                seen.add(id(value))
+                size += getsizeof(value)
+    return references, len(seen), size
+
+
+def measure_string_interning(file_path: Path):
+    # python -c "import run; run.measure_string_interning(run.Path('Level.sav'))"
+    from time import perf_counter
+
+    print(f"{'mode':<10}{'time (s)':>10}{'strings':>12}{'objects':>12}{'MiB':>10}")
+    rows = {}
+    for intern_strings in (False, True):
+        start = perf_counter()
+        data = convert_sav_to_dict(file_path, intern_strings=intern_strings)
+        elapsed = perf_counter() - start
+        references, objects, size = rows[intern_strings] = string_memory(data)
+        del data
+        print(
+            f"{'interned' if intern_strings else 'plain':<10}{elapsed:>10.3f}"
+            f"{references:>12}{objects:>12}{size / 2**20:>10.2f}"
+        )
+    print(f"Saved: {(rows[False][2] - rows[True][2]) / 2**20:.2f} MiB")
+
+
+def read_gvas_file(
+    raw_gvas: bytes,
+    custom_properties: dict,
+    allow_nan=True,
+    reader_class=ZeroCopyArchiveReader,
+) -> GvasFile:
+    # 等价于 GvasFile.read，但使用 ZeroCopyArchiveReader。
+    # raw_gvas 必须是 bytes：io.BytesIO 对 bytes 是零复制的，对 memoryview 则会复制
+    gvas_file = GvasFile()
+    with reader_class(
+        raw_gvas,
+        type_hints=PALWORLD_TYPE_HINTS,
+        custom_properties=custom_properties,
+        allow_nan=allow_nan,
+    ) as reader:
+        gvas_file.header = GvasHeader.read(reader)
+        gvas_file.properties = reader.properties_until_end()
+        gvas_file.trailer = reader.read_to_end()
+        if gvas_file.trailer != b"\x00\x00\x00\x00":
+            print(
+                f"{len(gvas_file.trailer)} bytes of trailer data, file may not have fully parsed"
+            )
+    return gvas_file
+
+
+# 编辑器不会读取的大型 worldSaveData 段，开启透传后以原始字节保留并原样写回
+PASSTHROUGH_SECTIONS = [
+    "MapObjectSaveData",
+    "ItemContainerSaveData",
+    "FoliageGridSaveDataMap",
+    "MapObjectSpawnerInStageSaveData",
+    "DynamicItemSaveData",
+    "WorkSaveData",
+    "EnemyCampSaveData",
+    "DungeonSaveData",
+    "DungeonPointMarkerSaveData",
+    "InvaderSaveData",
+    "OilrigSaveData",
+    "SupplySaveData",
+]
+
+
+def decode_passthrough(reader: FArchiveReader, type_name: str, size: int, path: str):
+    # 只解析属性自身的类型头，size 字节的内容以 base64 保存，这样 JSON 也能往返
+    if type_name == "StructProperty":
+        value = {
+            "struct_type": reader.fstring(),
+            "struct_id": reader.guid(),
+            "id": reader.optional_guid(),
+        }
+    elif type_name == "MapProperty":
+        value = {
+            "key_type": reader.fstring(),
+            "value_type": reader.fstring(),
+            "id": reader.optional_guid(),
+        }
+    elif type_name == "ArrayProperty":
+        value = {"array_type": reader.fstring(), "id": reader.optional_guid()}
+    else:
+        raise Exception(f"Passthrough is not supported for {type_name} ({path})")
+    value["value"] = base64.b64encode(reader.read(size)).decode("ascii")
+    value["passthrough"] = True
+    return value
+
+
+def encode_passthrough(writer, property_type: str, properties: dict) -> int:
+    if property_type == "StructProperty":
+        writer.fstring(properties["struct_type"])
+        writer.guid(properties["struct_id"])
+        writer.optional_guid(properties.get("id", None))
+    elif property_type == "MapProperty":
+        writer.fstring(properties["key_type"])
+        writer.fstring(properties["value_type"])
+        writer.optional_guid(properties.get("id", None))
+    elif property_type == "ArrayProperty":
+        writer.fstring(properties["array_type"])
+        writer.optional_guid(properties.get("id", None))
+    else:
+        raise Exception(f"Passthrough is not supported for {property_type}")
+    raw = base64.b64decode(properties["value"])
+    writer.write(raw)
+    return len(raw)
+
+
+def get_write_custom_properties(data: dict):
+    # 透传的段在写回时也必须走 encode_passthrough，即使它的路径另有解码器
+    custom_properties = dict(PALWORLD_CUSTOM_PROPERTIES)
+    custom_properties[CHARACTER_RAW_DATA] = (
+        decode_character_lazy,
+        encode_character_lazy,
+    )
+    world_save_data = data["properties"].get("worldSaveData", {}).get("value", {})
+    for section in world_save_data.values():
+        if isinstance(section, dict) and section.get("passthrough"):
+            custom_properties[section["custom_type"]] = (
+                decode_passthrough,
+                encode_passthrough,
+            )
+    return custom_properties
+
+
+CHARACTER_RAW_DATA = ".worldSaveData.CharacterSaveParameterMap.Value.RawData"
+ZERO_GUID = "00000000-0000-0000-0000-000000000000"
+# 存档中的时间为 .NET ticks (100 纳秒)
+TICKS_PER_DAY = 24 * 60 * 60 * 10**7
+# 帕鲁列表及索引所需的字段，其余字段在打开编辑窗口时才完整解码
+LIST_FIELDS = {
+    "CharacterID",
+    "Gender",
+    "Level",
+    "Exp",
+    "Talent_HP",
+    "Talent_Melee",
+    "Talent_Shot",
+    "Talent_Defense",
+    "PassiveSkillList",
+    "Rank",
+    "Rank_HP",
+    "Rank_Attack",
+    "Rank_Defence",
+    "Rank_CraftSpeed",
+    "IsPlayer",
+    "SlotID",
+    "OwnerPlayerUId",
+    "OldOwnerPlayerUIds",
+}
+
+
+def decode_character_lazy(
+    reader: FArchiveReader, type_name: str, size: int, path: str
+):
+    # 只读出 RawData 的字节，保存为 base64，留待 decode_character_raw_data 按需解码
+    if type_name != "ArrayProperty":
+        raise Exception(f"Expected ArrayProperty, got {type_name}")
+    array_type = reader.fstring()
+    _id = reader.optional_guid()
+    count = reader.u32()
+    return {
+        "array_type": array_type,
+        "id": _id,
+        "value": {"raw": base64.b64encode(reader.read(count)).decode("ascii")},
+        "type": type_name,
+    }
+
+
+def encode_character_lazy(writer, property_type: str, properties: dict) -> int:
+    # 未解码的条目原样写回，已解码的条目交给 save_tools 重新编码
+    if "raw" not in properties["value"]:
+        return PALWORLD_CUSTOM_PROPERTIES[CHARACTER_RAW_DATA][1](
+            writer, property_type, properties
+        )
+    raw = base64.b64decode(properties["value"]["raw"])
+    writer.fstring(properties["array_type"])
+    writer.optional_guid(properties.get("id", None))
+    writer.u32(len(raw))
+    writer.write(raw)
+    return len(raw) + 4
+
+
+def is_character_raw_data_decoded(raw_data: dict):
+    return "raw" not in raw_data["value"]
+
+
+def decode_character_raw_data(raw_data: dict):
+    if is_character_raw_data_decoded(raw_data):
+        return raw_data["value"]
+    reader = ZeroCopyArchiveReader(b"", type_hints=PALWORLD_TYPE_HINTS)
+    decoded = decode_character_bytes(
+        reader, base64.b64decode(raw_data["value"]["raw"])
+    )
+    # 与 convert_sav_to_dict 一样经 JSON 规范化，UUID 转为字符串
+    raw_data["value"] = load_json(json.dumps(decoded, cls=SaveEncoder))
+    return raw_data["value"]
+
+
+def extract_character_fields(raw_data: dict, fields=LIST_FIELDS):
+    # 在不完整解码的情况下取出 SaveParameter 中的部分字段：
+    # 逐个读取顶层属性的名称、类型和长度，不需要的属性直接按长度跳过
+    if is_character_raw_data_decoded(raw_data):
+        return raw_data["value"]["object"]["SaveParameter"]["value"]
+    result = {}
+    with ZeroCopyArchiveReader(
+        base64.b64decode(raw_data["value"]["raw"]), type_hints=PALWORLD_TYPE_HINTS
+    ) as reader:
+        if reader.fstring() != "SaveParameter":
+            raise Exception("Unexpected character RawData layout")
+        reader.fstring()
+        reader.u64()
+        reader.fstring()
+        reader.guid()
+        reader.optional_guid()
+        while True:
+            name = reader.fstring()
+            if name == "None":
+                break
+            type_name = reader.fstring()
+            size = reader.u64()
+            if name in fields:
+                result[name] = reader.property(
+                    type_name, size, f".SaveParameter.{name}"
+                )
+                continue
+            if type_name == "StructProperty":
+                reader.fstring()
+                reader.skip(16)
+            elif type_name in ("EnumProperty", "ByteProperty", "ArrayProperty"):
+                reader.fstring()
+            elif type_name == "MapProperty":
+                reader.fstring()
+                reader.fstring()
+            elif type_name == "BoolProperty":
+                reader.skip(1)
+            reader.optional_guid()
+            reader.skip(size)
+    return load_json(json.dumps(result, cls=SaveEncoder))
+
+
+def character_group_id(raw_data: dict):
+    # group_id 是 RawData 的最后 16 字节，未解码时无需解析整个属性流
+    if is_character_raw_data_decoded(raw_data):
+        return raw_data["value"]["group_id"]
+    raw = base64.b64decode(raw_data["value"]["raw"])
+    with ZeroCopyArchiveReader(raw[-16:]) as reader:
+        return str(reader.guid())
+
+
+def decode_character_chunk(raw_values: list[str], allow_nan=True):
+    # 在子进程中运行：解码一批 RawData 并做与 convert_sav_to_dict 相同的 JSON 规范化
+    reader = ZeroCopyArchiveReader(b"", type_hints=PALWORLD_TYPE_HINTS)
+    return load_json(
+        json.dumps(
+            [
+                decode_character_bytes(reader, base64.b64decode(raw))
+                for raw in raw_values
+            ],
+            cls=SaveEncoder,
+            allow_nan=allow_nan,
+        )
+    )
+
+
+def decode_character_map(
+    data: dict, workers: int, chunk_size: int = 1024, allow_nan=True
+):
+    # 按顺序收集尚未解码的 RawData，分块交给进程池解码后再按原顺序写回
+    entries = [
+        i["value"]["RawData"]
+        for i in data["properties"]["worldSaveData"]["value"][
+            "CharacterSaveParameterMap"
+        ]["value"]
+        if not is_character_raw_data_decoded(i["value"]["RawData"])
+    ]
+    chunks = [
+        [raw_data["value"]["raw"] for raw_data in entries[i : i + chunk_size]]
+        for i in range(0, len(entries), chunk_size)
+    ]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(
+            decode_character_chunk, chunks, [allow_nan] * len(chunks)
+        )
+        position = 0
+        for values in results:
+            for value in values:
+                entries[position]["value"] = value
+                position += 1
+    return data
+
+
+def benchmark_decode_workers(file_path: Path, worker_counts=(1, 2, 4, 8)):
+    # python -c "import run; run.benchmark_decode_workers(run.Path('Level.sav'))"
+    from time import perf_counter
+
+    serial = None
+    print(f"{'workers':>8}{'time (s)':>10}{'identical':>11}")
+    for workers in worker_counts:
+        start = perf_counter()
+        data = convert_sav_to_dict(file_path, decode_workers=workers)
+        elapsed = perf_counter() - start
+        text = json.dumps(data)
+        del data
+        if serial is None:
+            serial = text
+        print(f"{workers:>8}{elapsed:>10.3f}{str(text == serial):>11}")
+
+
+# memoryview 切片的 repr，出现在 palsav 魔数不符的错误信息中
+MEMORYVIEW_REPR = re.compile(r"<memory at 0x[0-9a-fA-F]+>")
+
+
+def sav_magic_bytes(buffer):
+    magic_bytes = bytes(buffer[8:11])
+    return bytes(buffer[20:23]) if magic_bytes == b"CNK" else magic_bytes
+
+
+def decompress_sav_buffer(buffer) -> tuple[bytes, int]:
+    # 解压交给 palsav.decompress_sav_to_gvas，这里只把它的异常改写成可读的信息。
+    # 在 except 之外抛出，异常中不会链接到引用 buffer 的原异常和回溯
+    try:
+        return decompress_sav_to_gvas(buffer)
+    except IndexError:
+        error = (
+            f"not a compressed Palworld save, file is too short ({len(buffer)} bytes)"
+        )
+    except zlib.error as e:
+        error = f"corrupted Palworld save, decompression failed: {e}"
+    except Exception as e:
+        magic_bytes = repr(sav_magic_bytes(buffer))
+        error = MEMORYVIEW_REPR.sub(lambda match: magic_bytes, str(e))
+    raise Exception(error)
+
+
+def decompress_sav_file(file_path: Path):
+    # 以 mmap 映射源文件，把 memoryview 直接交给 zlib，不再整体读入内存
+    if file_path.stat().st_size == 0:
+        # 空文件不能 mmap
+        return decompress_sav_buffer(file_path.read_bytes())
+    with file_path.open("rb") as f, mmap.mmap(
+        f.fileno(), 0, access=mmap.ACCESS_READ
+    ) as mm:
+        view = memoryview(mm)
+        try:
+            return decompress_sav_buffer(view)
+        except Exception as e:
+            # 回溯中的栈帧引用着 view，丢掉回溯并释放视图后 mmap 才能关闭
+            error = e.with_traceback(None)
+        finally:
+            view.release()
+    raise error
+
+
 def convert_sav_to_dict(
-    file_path: Path, allow_nan=True, custom_properties_keys=KNOWN_PROPS
+    file_path: Path,
+    allow_nan=True,
+    custom_properties_keys=KNOWN_PROPS,
+    passthrough_sections=(),
+    lazy_character_data=False,
+    decode_workers=1,
+    intern_strings=True,
+    memory_tracer: MemoryTracer = None,
+    codec_timer: codectiming.CodecTimer = None,
 ):
     print(f"Converting {file_path.name} to JSON")
     print(f"Decompressing sav file")
-    raw_gvas, _ = decompress_sav_to_gvas(file_path.read_bytes())
+    raw_gvas, _ = decompress_sav_file(file_path)
     print(f"Loading GVAS file")
     custom_properties = {}
     if len(custom_properties_keys) > 0 and custom_properties_keys[0] == "all":
-        custom_properties = PALWORLD_CUSTOM_PROPERTIES
+        custom_properties = dict(PALWORLD_CUSTOM_PROPERTIES)
     else:
         for prop in PALWORLD_CUSTOM_PROPERTIES:
             if prop in custom_properties_keys:
                 custom_properties[prop] = PALWORLD_CUSTOM_PROPERTIES[prop]
-    gvas_file = GvasFile.read(
-        raw_gvas, PALWORLD_TYPE_HINTS, custom_properties, allow_nan=allow_nan
+    # 多进程解码时先只读出 RawData 字节，解析完外层后再交给进程池
+    parallel = (
+        decode_workers > 1
+        and not lazy_character_data
+        and CHARACTER_RAW_DATA in custom_properties
     )
-    return json.loads(
-        json.dumps(gvas_file.dump(), cls=CustomEncoder, allow_nan=allow_nan)
+    if lazy_character_data or parallel:
+        custom_properties[CHARACTER_RAW_DATA] = (
+            decode_character_lazy,
+            encode_character_lazy,
+        )
+    for section in passthrough_sections:
+        custom_properties[f".worldSaveData.{section}"] = (
+            decode_passthrough,
+            encode_passthrough,
+        )
+    if memory_tracer:
+        memory_tracer.snapshot("decompressed")
+    if codec_timer:
+        custom_properties = codec_timer.wrap(custom_properties)
+    gvas_file = read_gvas_file(raw_gvas, custom_properties, allow_nan=allow_nan)
+    if memory_tracer:
+        memory_tracer.snapshot("GVAS parsed")
+    if codec_timer:
+        codec_timer.print_table(f"Decoded {file_path.name}")
+    # 解析完成后即可释放解压后的 GVAS 缓冲区，降低后续 JSON 转换时的内存峰值
+    del raw_gvas
+    data = load_json(
+        json.dumps(gvas_file.dump(), cls=SaveEncoder, allow_nan=allow_nan),
+        intern_strings,
+    )
+    if memory_tracer:
+        memory_tracer.snapshot("JSON round trip")
+    if parallel:
+        print(f"Decoding character data with {decode_workers} processes")
+        decode_character_map(data, decode_workers, allow_nan=allow_nan)
+    return data
+
+
+def has_editor_private_data(data: dict):
+    # 惰性解码的 RawData 与透传段是只有本编辑器能读回的 base64 字节
+    world_save_data = data["properties"].get("worldSaveData", {}).get("value", {})
+    if any(
+        isinstance(section, dict) and section.get("passthrough")
+        for section in world_save_data.values()
+    ):
+        return True
+    character_map = world_save_data.get("CharacterSaveParameterMap", {})
+    return any(
+        not is_character_raw_data_decoded(entry["value"]["RawData"])
+        for entry in character_map.get("value", [])
     )
 
 
-def convert_dict_to_sav(data: dict, output_path: Path):
+def fully_decode(data: dict, allow_nan=True):
+    # 导出 JSON 前经 GVAS 重新编码再完整解析，得到与 palworld-save-tools 相同的结构，
+    # 可以手动编辑并用上游工具转换回 .sav。写出时会就地改写部分 RawData，先复制
+    if not has_editor_private_data(data):
+        return data
+    data = copy.deepcopy(data)
+    raw_gvas = GvasFile.load(data).write(get_write_custom_properties(data))
+    custom_properties = {
+        prop: PALWORLD_CUSTOM_PROPERTIES[prop]
+        for prop in PALWORLD_CUSTOM_PROPERTIES
+        if prop in KNOWN_PROPS
+    }
+    gvas_file = read_gvas_file(raw_gvas, custom_properties, allow_nan=allow_nan)
+    del raw_gvas
+    return load_json(json.dumps(gvas_file.dump(), cls=SaveEncoder, allow_nan=allow_nan))
+
+
+def convert_dict_to_sav(
+    data: dict,
+    output_path: Path,
+    *,
+    compress_level: int = zlib.Z_DEFAULT_COMPRESSION,
+    compress_workers: int = 1,
+    memory_tracer: MemoryTracer = None,
+    codec_timer: codectiming.CodecTimer = None,
+):
     gvas_file = GvasFile.load(data)
+    if memory_tracer:
+        memory_tracer.snapshot("GVAS loaded")
     print(f"Compressing SAV file")
     if (
         "Pal.PalWorldSaveGame" in gvas_file.header.save_game_class_name
@@ -72,9 +594,22 @@ def convert_dict_to_sav(data: dict, output_path: Path):
         save_type = 0x32
     else:
         save_type = 0x31
-    sav_file = compress_gvas_to_sav(
-        gvas_file.write(PALWORLD_CUSTOM_PROPERTIES), save_type
+    custom_properties = get_write_custom_properties(data)
+    if codec_timer:
+        custom_properties = codec_timer.wrap(custom_properties)
+    raw_gvas = gvas_file.write(custom_properties)
+    if memory_tracer:
+        memory_tracer.snapshot("GVAS written")
+    if codec_timer:
+        codec_timer.print_table(f"Encoded {output_path.name}")
+    sav_file = palzip.compress_gvas_to_sav(
+        raw_gvas,
+        save_type,
+        level=compress_level,
+        workers=compress_workers,
     )
+    if memory_tracer:
+        memory_tracer.snapshot("compressed")
     print(f"Writing SAV file to {output_path.name}")
     output_path.write_bytes(sav_file)
 
@@ -82,6 +617,7 @@ def convert_dict_to_sav(data: dict, output_path: Path):
 FILE_TYPES = [
     ["Palworld 主存档", "sav"],
     ["Palworld 主存档 JSON", "json"],
+    ["Palworld 主存档二进制", "palbin"],
 ]
 FILE_TYPES.insert(0, ["所有支持的文件类型", tuple(i[1] for i in FILE_TYPES)])
 
@@ -264,6 +800,7 @@ class GuildEditWindow(tk.Toplevel):
             return False
         return True
 
+    @palprofile.profiled("guild_edit_save")
     def save(self):
         if not self.validate():
             return
@@ -323,13 +860,13 @@ class Player:
             raise ValueError(f"Player.{key} 是无法编辑的。")
 
     def __post_init__(self):
+        self.exp: int = (
+            self.character_data["Exp"]["value"] if self.character_data.get("Exp") else 0
+        )
         self.level: int = (
             self.character_data["Level"]["value"]
             if self.character_data.get("Level")
-            else 1
-        )
-        self.exp: int = (
-            self.character_data["Exp"]["value"] if self.character_data.get("Exp") else 0
+            else EXP_TABLE.player.level_for_exp(self.exp)
         )
         self.nickname: str = self.character_data["NickName"]["value"]
         self.hp: int = self.character_data["HP"]["value"]["Value"]["value"]
@@ -473,7 +1010,7 @@ class PlayerEditWindow(tk.Toplevel):
         self.level_entry = ttk.Spinbox(
             self.level_frame,
             from_=max(2, self.player.level),
-            to=55,
+            to=MAX_LEVEL,
             textvariable=self.level_stringvar,
             validate="key",
             validatecommand=(validate_level_input_command, "%P"),
@@ -530,10 +1067,10 @@ class PlayerEditWindow(tk.Toplevel):
     def validate_level_input(self, level: str):
         if not level.isdigit():
             return False
-        if int(level) > 55:
+        if int(level) > MAX_LEVEL:
             return False
         if int(self.level_entry.get()) != self.player.level:
-            self.exp_stringvar.set(DT_PET[level]["TotalEXP"] - 1)
+            self.exp_stringvar.set(EXP_TABLE.player.exp_for_level(int(level)) - 1)
         else:
             self.exp_stringvar.set(self.player.exp)
         return True
@@ -569,11 +1106,14 @@ class PlayerEditWindow(tk.Toplevel):
             )
             return False
         if int(self.level_entry.get()) != self.player.level:
-            self.exp_stringvar.set(DT_PET[self.level_entry.get()]["TotalEXP"] - 1)
+            self.exp_stringvar.set(
+                EXP_TABLE.player.exp_for_level(int(self.level_entry.get())) - 1
+            )
         else:
             self.exp_stringvar.set(self.player.exp)
         return True
 
+    @palprofile.profiled("player_edit_save")
     def save(self):
         if not self.validate():
             return
@@ -603,16 +1143,33 @@ class PlayerEditWindow(tk.Toplevel):
 
 
 def encode_gender(gender: str):
-    return "EPalGenderType::" + gender
+    return intern("EPalGenderType::" + gender)
 
 
 @dataclass
 class Pal:
     instance_id: str
     character_data: dict
+    raw_data: dict = None
+    # 所在的被动技能索引，由 PassiveSkillIndex.add 设置
+    passive_index = None
+
+    @property
+    def decoded(self):
+        return self.raw_data is None or is_character_raw_data_decoded(self.raw_data)
+
+    def decode(self):
+        # 列表中的帕鲁只解析了 LIST_FIELDS，编辑前需要完整解码 RawData
+        if self.decoded:
+            return
+        self.character_data = decode_character_raw_data(self.raw_data)["object"][
+            "SaveParameter"
+        ]["value"]
+        self.__post_init__()
 
     def config(self, key: str, value):
         if key in self.keys_map:
+            self.decode()
             character_data = self.character_data
             for k in self.keys_map[key][:-1]:
 
@@ -726,16 +1283,32 @@ class Pal:
             else:
                 character_data[self.keys_map[key][-1]] = value
             setattr(self, key, value)
+            if key == "passive_skill_list":
+                self.passive_skill_mask = PASSIVE_SKILL_BITS.encode(value)
+                if self.passive_index is not None:
+                    self.passive_index.update(self)
+            self._effective_stats = None
         else:
             raise ValueError(f"Pal.{key} 是无法编辑的。")
 
+    @property
+    def effective_stats(self) -> tuple[int, int, int, int]:
+        # 加载时由 index_world 批量计算，编辑后在下次读取时重新计算
+        if self._effective_stats is None:
+            self._effective_stats = STAT_ENGINE.compute([self])[0]
+        return self._effective_stats
+
     def __post_init__(self):
+        self._effective_stats = None
         self.character_id: str = self.character_data["CharacterID"]["value"]
         self.gender = get_gender(self.character_data)
+        self.exp: int = (
+            self.character_data["Exp"]["value"] if self.character_data.get("Exp") else 0
+        )
         self.level: int = (
             self.character_data["Level"]["value"]
             if self.character_data.get("Level")
-            else 1
+            else EXP_TABLE.pal.level_for_exp(self.exp)
         )
         self.rank: int = (
             self.character_data["Rank"]["value"]
@@ -762,9 +1335,6 @@ class Pal:
             if self.character_data.get("Rank_CraftSpeed")
             else 0
         )
-        self.exp: int = (
-            self.character_data["Exp"]["value"] if self.character_data.get("Exp") else 0
-        )
         self.is_rare_pal: bool = (
             self.character_data["IsRarePal"]["value"]
             if self.character_data.get("IsRarePal")
@@ -815,19 +1385,35 @@ class Pal:
             if self.character_data.get("PassiveSkillList")
             else []
         )
+        self.passive_skill_mask: int = PASSIVE_SKILL_BITS.encode(
+            self.passive_skill_list
+        )
         self.mp: int = (
             self.character_data["MP"]["value"] if self.character_data.get("MP") else 0
         )
         self.old_owner_player_uids: list[str] = self.character_data[
             "OldOwnerPlayerUIds"
         ]["value"]
+        self.owner_player_uid: str = (
+            self.character_data["OwnerPlayerUId"]["value"]
+            if self.character_data.get("OwnerPlayerUId")
+            else ZERO_GUID
+        )
         self.max_hp: int = (
             self.character_data["MaxHP"]["value"]["Value"]["value"]
             if self.character_data.get("MaxHP")
             else 0
         )
-        self.craft_speed: int = self.character_data["CraftSpeed"]["value"]
-        self.craft_speeds: list[dict] = self.character_data["CraftSpeeds"]["value"]
+        self.craft_speed: int = (
+            self.character_data["CraftSpeed"]["value"]
+            if self.character_data.get("CraftSpeed")
+            else 0
+        )
+        self.craft_speeds: list[dict] = (
+            self.character_data["CraftSpeeds"]["value"]["values"]
+            if self.character_data.get("CraftSpeeds")
+            else []
+        )
         self.sanity_value: float = (
             int(self.character_data["SanityValue"]["value"])
             if self.character_data.get("SanityValue")
@@ -838,9 +1424,11 @@ class Pal:
             if self.character_data.get("ItemContainerId")
             else ""
         )
-        self.equip_item_container_id: str = self.character_data["EquipItemContainerId"][
-            "value"
-        ]
+        self.equip_item_container_id: str = (
+            self.character_data["EquipItemContainerId"]["value"]
+            if self.character_data.get("EquipItemContainerId")
+            else ""
+        )
         self.slot_id: str = self.character_data["SlotID"]["value"]["ContainerId"][
             "value"
         ]["ID"]["value"]
@@ -913,12 +1501,14 @@ class Pal:
             self.talent_shot,
             self.talent_defense,
             self.passive_skill_list,
+            *self.effective_stats,
         ]
 
 
 class PalEditWindow(tk.Toplevel):
     def __init__(self, parent: Application, pal: Pal):
         super().__init__(parent)
+        pal.decode()
         self.parent = parent
         self.pal = pal
         self.l10n = parent.l10n
@@ -1225,7 +1815,7 @@ class PalEditWindow(tk.Toplevel):
         self.level_entry = ttk.Spinbox(
             self.level_frame,
             from_=max(2, self.pal.level),
-            to=55,
+            to=MAX_LEVEL,
             textvariable=self.level_stringvar,
             validate="key",
             validatecommand=(validate_level_input_command, "%P"),
@@ -1656,10 +2246,10 @@ class PalEditWindow(tk.Toplevel):
     def validate_level_input(self, level: str):
         if not level.isdigit():
             return False
-        if int(level) > 55:
+        if int(level) > MAX_LEVEL:
             return False
         if int(self.level_entry.get()) != self.pal.level:
-            self.exp_stringvar.set(DT_PET[level]["PalTotalEXP"] - 1)
+            self.exp_stringvar.set(EXP_TABLE.pal.exp_for_level(int(level)) - 1)
         else:
             self.exp_stringvar.set(self.pal.exp)
         return True
@@ -1816,11 +2406,14 @@ class PalEditWindow(tk.Toplevel):
             )
             return False
         if int(self.level_entry.get()) != self.pal.level:
-            self.exp_stringvar.set(DT_PET[self.level_entry.get()]["PalTotalEXP"] - 1)
+            self.exp_stringvar.set(
+                EXP_TABLE.pal.exp_for_level(int(self.level_entry.get())) - 1
+            )
         else:
             self.exp_stringvar.set(self.pal.exp)
         return True
 
+    @palprofile.profiled("pal_edit_save")
     def save(self):
         if not self.validate():
             return
@@ -1885,9 +2478,9 @@ class PalEditWindow(tk.Toplevel):
         self.parent.pal_list.delete(*self.parent.pal_list.get_children())
         pal_map = {k: v for k, v in self.parent.pal_map.items()}
         self.parent.pal_map.clear()
+        self.parent.pal_list_stale.clear()
         for pal in pal_map.values():
-            row_id = self.parent.pal_list.insert("", "end", values=pal.values)
-            self.parent.pal_map[row_id] = pal
+            self.parent.insert_pal_row(pal, "end")
 
     def destroy(self) -> None:
         self.parent.focus_set()
@@ -2084,6 +2677,7 @@ class WazaEditWindow(tk.Toplevel):
         l = [self.waza_list_listvar.get()[0]] if self.is_equip_waza else []
         self.waza_list_listvar.set(l)
 
+    @palprofile.profiled("waza_edit_save")
     def save(self):
         if self.listvar.get() == self.waza_list_listvar.get():
             self.destroy()
@@ -2111,10 +2705,20 @@ class WazaSelectWindow(tk.Toplevel):
         self.title(self.l10n.get("Select Waza"))
         self.minsize(300, 200)
         self.resizable(False, False)
+        self.search_index = skill_search_index("waza", self.l10n.get_locale())
         self.create_widgets()
-        self.focus_set()
+        self.search_entry.focus_set()
 
     def create_widgets(self):
+        self.search_stringvar = tk.StringVar()
+        self.search_entry = ttk.Entry(self, textvariable=self.search_stringvar)
+        self.search_entry.pack(
+            fill=tk.X, ipadx=self.recommended_ipadx, ipady=self.recommended_ipady
+        )
+        self.search_stringvar.trace_add("write", lambda *_: self.update_waza_list())
+        self.search_entry.bind("<Return>", lambda _: self.confirm())
+        self.search_entry.bind("<Down>", lambda _: self.focus_waza_list())
+
         self.waza_list_frame = ttk.Frame(self)
         self.waza_list_frame.pack(fill=tk.BOTH, expand=True)
 
@@ -2123,8 +2727,9 @@ class WazaSelectWindow(tk.Toplevel):
         )
         self.waza_list_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
 
-        for waza in sorted(list(KV_WAZA[self.l10n.get_locale()])):
-            self.waza_list_listbox.insert(tk.END, waza)
+        self.waza_list_listbox.bind("<Return>", lambda _: self.confirm())
+        self.waza_list_listbox.bind("<Double-1>", lambda _: self.confirm())
+        self.update_waza_list()
 
         self.waza_list_scrollbar = ttk.Scrollbar(
             self.waza_list_frame, command=self.waza_list_listbox.yview
@@ -2141,6 +2746,18 @@ class WazaSelectWindow(tk.Toplevel):
             ipady=self.recommended_ipady,
         )
 
+    def update_waza_list(self):
+        names = self.search_index.search(self.search_stringvar.get())
+        self.waza_list_listbox.delete(0, tk.END)
+        if names:
+            self.waza_list_listbox.insert(tk.END, *names)
+            self.waza_list_listbox.selection_set(0)
+            self.waza_list_listbox.activate(0)
+
+    def focus_waza_list(self):
+        self.waza_list_listbox.focus_set()
+        return "break"
+
     def update_waza_list_scrollbar(self, first, last):
         first, last = float(first), float(last)
         if first <= 0 and last >= 1:
@@ -2154,7 +2771,7 @@ class WazaSelectWindow(tk.Toplevel):
         if not selected:
             return
         selected = selected[0]
-        waza_id = KV_WAZA[self.l10n.get_locale()][self.waza_list_listbox.get(selected)]
+        waza_id = self.search_index.id_of(self.waza_list_listbox.get(selected))
         l = list(self.parent.waza_list_listvar.get())
         if waza_id in l:
             messagebox.showerror(
@@ -2353,6 +2970,7 @@ class PassiveSkillListEditWindow(tk.Toplevel):
     def remove_all(self):
         self.passive_skill_list_listvar.set([])
 
+    @palprofile.profiled("passive_skill_edit_save")
     def save(self):
         if self.listvar.get() == self.passive_skill_list_listvar.get():
             self.destroy()
@@ -2377,10 +2995,22 @@ class PassiveSkillSelectWindow(tk.Toplevel):
         self.title(self.l10n.get("Select Passive Skill"))
         self.minsize(300, 200)
         self.resizable(False, False)
+        self.search_index = skill_search_index("passive_skill", self.l10n.get_locale())
         self.create_widgets()
-        self.focus_set()
+        self.search_entry.focus_set()
 
     def create_widgets(self):
+        self.search_stringvar = tk.StringVar()
+        self.search_entry = ttk.Entry(self, textvariable=self.search_stringvar)
+        self.search_entry.pack(
+            fill=tk.X, ipadx=self.recommended_ipadx, ipady=self.recommended_ipady
+        )
+        self.search_stringvar.trace_add(
+            "write", lambda *_: self.update_passive_skill_list()
+        )
+        self.search_entry.bind("<Return>", lambda _: self.confirm())
+        self.search_entry.bind("<Down>", lambda _: self.focus_passive_skill_list())
+
         self.passive_skill_list_frame = ttk.Frame(self)
         self.passive_skill_list_frame.pack(fill=tk.BOTH, expand=True)
 
@@ -2390,8 +3020,9 @@ class PassiveSkillSelectWindow(tk.Toplevel):
         )
         self.passive_skill_list_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
 
-        for passive_skill in sorted(list(KV_PASSIVE_SKILL[self.l10n.get_locale()])):
-            self.passive_skill_list_listbox.insert(tk.END, passive_skill)
+        self.passive_skill_list_listbox.bind("<Return>", lambda _: self.confirm())
+        self.passive_skill_list_listbox.bind("<Double-1>", lambda _: self.confirm())
+        self.update_passive_skill_list()
 
         self.passive_skill_list_scrollbar = ttk.Scrollbar(
             self.passive_skill_list_frame, command=self.passive_skill_list_listbox.yview
@@ -2408,6 +3039,18 @@ class PassiveSkillSelectWindow(tk.Toplevel):
             ipady=self.recommended_ipady,
         )
 
+    def update_passive_skill_list(self):
+        names = self.search_index.search(self.search_stringvar.get())
+        self.passive_skill_list_listbox.delete(0, tk.END)
+        if names:
+            self.passive_skill_list_listbox.insert(tk.END, *names)
+            self.passive_skill_list_listbox.selection_set(0)
+            self.passive_skill_list_listbox.activate(0)
+
+    def focus_passive_skill_list(self):
+        self.passive_skill_list_listbox.focus_set()
+        return "break"
+
     def update_passive_skill_list_scrollbar(self, first, last):
         first, last = float(first), float(last)
         if first <= 0 and last >= 1:
@@ -2421,15 +3064,289 @@ class PassiveSkillSelectWindow(tk.Toplevel):
         if not selected:
             return
         selected = selected[0]
-        passive_skill_id = KV_PASSIVE_SKILL[self.l10n.get_locale()][
+        passive_skill_id = self.search_index.id_of(
             self.passive_skill_list_listbox.get(selected)
-        ]
+        )
         l = list(self.parent.passive_skill_list_listvar.get())
         l.insert(selected, passive_skill_id)
         self.parent.passive_skill_list_listvar.set(l)
         self.destroy()
 
 
+@dataclass
+class OwnershipGraph:
+    # 公会 ↔ 玩家 ↔ 帕鲁 ↔ 容器 的邻接表，加载时构建一次，之后的查询都是字典查找
+    guilds: dict[str, Guild] = field(default_factory=dict)
+    players: dict[str, Player] = field(default_factory=dict)
+    players_by_guild: dict[str, list[Player]] = field(default_factory=dict)
+    guild_by_player: dict[str, str] = field(default_factory=dict)
+    pals_by_player: dict[str, list[Pal]] = field(default_factory=dict)
+    pals_by_guild: dict[str, list[Pal]] = field(default_factory=dict)
+    guild_by_pal: dict[str, str] = field(default_factory=dict)
+    containers_by_player: dict[str, set[str]] = field(default_factory=dict)
+    players_by_container: dict[str, set[str]] = field(default_factory=dict)
+
+    def add_guild(self, guild: Guild):
+        self.guilds[guild.group_id] = guild
+        self.players_by_guild.setdefault(guild.group_id, [])
+
+    def add_player(self, player: Player):
+        group_id = player.guild_data.group_id
+        self.players[player.player_uid] = player
+        self.players_by_guild.setdefault(group_id, []).append(player)
+        self.guild_by_player[player.player_uid] = group_id
+
+    def add_pal(self, pal: Pal, group_id: str):
+        # 有主人的帕鲁归属主人所在的公会，没有主人的 (如据点工作帕鲁) 归属其 group_id
+        owner = pal.owner_player_uid
+        if owner != ZERO_GUID:
+            self.pals_by_player.setdefault(owner, []).append(pal)
+            self.containers_by_player.setdefault(owner, set()).add(pal.slot_id)
+            self.players_by_container.setdefault(pal.slot_id, set()).add(owner)
+            group_id = self.guild_by_player.get(owner, group_id)
+        self.pals_by_guild.setdefault(group_id, []).append(pal)
+        self.guild_by_pal[pal.instance_id] = group_id
+
+    def pals_of_player(self, player_uid: str) -> list[Pal]:
+        return self.pals_by_player.get(player_uid, [])
+
+    def pals_of_guild(self, group_id: str) -> list[Pal]:
+        return self.pals_by_guild.get(group_id, [])
+
+    def players_of_guild(self, group_id: str) -> list[Player]:
+        return self.players_by_guild.get(group_id, [])
+
+    def guild_of_player(self, player_uid: str) -> Guild | None:
+        return self.guilds.get(self.guild_by_player.get(player_uid))
+
+    def containers_of_player(self, player_uid: str) -> set[str]:
+        return self.containers_by_player.get(player_uid, set())
+
+    def owners_of_container(self, container_id: str) -> set[str]:
+        return self.players_by_container.get(container_id, set())
+
+
+@dataclass
+class WorldIndex:
+    guilds: list[Guild]
+    players: list[Player]
+    pals: list[Pal]
+    kv_container_id: dict[str, list[Pal]]
+    kv_character_id: dict[str, list[Pal]]
+    ownership: OwnershipGraph = field(default_factory=OwnershipGraph)
+    passive_index: PassiveSkillIndex = field(default_factory=PassiveSkillIndex)
+
+
+def index_world(world_save_data: dict, strtime=str, progress=None) -> WorldIndex:
+    # 从 worldSaveData 构建公会、玩家、帕鲁对象及帕鲁的筛选索引，不依赖 Tk
+    progress = progress or (lambda value: None)
+    guilds: list[Guild] = []
+    players: list[Player] = []
+    pals: list[Pal] = []
+    kv_container_id: dict[str, list[Pal]] = {}
+    kv_character_id: dict[str, list[Pal]] = {}
+    ownership = OwnershipGraph()
+    # 玩家角色按 PlayerUId 建立索引并完整解码，帕鲁的 RawData 留到编辑时再解码
+    player_character_map: dict[str, dict] = {}
+    for i in world_save_data["CharacterSaveParameterMap"]["value"]:
+        player_uid = i["key"]["PlayerUId"]["value"]
+        if player_uid != ZERO_GUID:
+            player_character_map[player_uid] = decode_character_raw_data(
+                i["value"]["RawData"]
+            )["object"]["SaveParameter"]["value"]
+    for i in world_save_data["GroupSaveDataMap"]["value"]:
+        group_data: dict = i["value"]["RawData"]["value"]
+        if not group_data.get("base_camp_level"):
+            print(
+                "Warning: Unknown data structure for group_id:",
+                f"{group_data['group_id']}, skipping",
+            )
+            continue
+        guild = Guild(group_data)
+        guilds.append(guild)
+        ownership.add_guild(guild)
+        progress(3)
+        for player in group_data.get("players", []):
+            player_uid = player["player_uid"]
+            character_data = player_character_map.get(player_uid)
+            if character_data is None:
+                print(
+                    "Warning: Character data not found for player_uid:",
+                    f"{player_uid}, skipping",
+                )
+                continue
+            last_online_real_time = strtime(
+                player["player_info"]["last_online_real_time"]
+            )
+            player = Player(character_data, guild, player_uid, last_online_real_time)
+            players.append(player)
+            ownership.add_player(player)
+        progress(4)
+    character_save_parameter_map = world_save_data["CharacterSaveParameterMap"][
+        "value"
+    ]
+    len_ = len(character_save_parameter_map)
+    count = 0
+    for i in character_save_parameter_map:
+        instance_id = i["key"]["InstanceId"]["value"]
+        raw_data: dict = i["value"]["RawData"]
+        character_data: dict = extract_character_fields(raw_data)
+        if not character_data.get("CharacterID"):
+            if (
+                character_data["IsPlayer"]["value"]
+                if character_data.get("IsPlayer")
+                else False
+            ):
+                continue
+            print(
+                "Warning: Unknown data structure for character_id:",
+                f"{character_data['CharacterID']}, skipping",
+            )
+        pal = Pal(instance_id, character_data, raw_data)
+        pals.append(pal)
+        container_id = pal.slot_id
+        if not kv_container_id.get(container_id):
+            kv_container_id[container_id] = []
+        kv_container_id[container_id].append(pal)
+        character_id = pal.character_id
+        if not kv_character_id.get(character_id):
+            kv_character_id[character_id] = []
+        kv_character_id[character_id].append(pal)
+        ownership.add_pal(
+            pal,
+            (
+                ZERO_GUID
+                if pal.owner_player_uid in ownership.guild_by_player
+                else character_group_id(raw_data)
+            ),
+        )
+        count += 1
+        progress(4 + (count / len_) * 96)
+    for pal, effective_stats in zip(pals, STAT_ENGINE.compute(pals)):
+        pal._effective_stats = effective_stats
+    return WorldIndex(
+        guilds,
+        players,
+        pals,
+        kv_container_id,
+        kv_character_id,
+        ownership,
+        PassiveSkillIndex(pals),
+    )
+
+
+def load_save(file_path: Path) -> dict:
+    # 命令行工具共用：惰性解码并透传未使用的段
+    return convert_sav_to_dict(
+        file_path,
+        passthrough_sections=PASSTHROUGH_SECTIONS,
+        lazy_character_data=True,
+    )
+
+
+def write_save(data: dict, output_path: Path):
+    convert_dict_to_sav(data, output_path)
+
+
+def load_world(file_path: Path) -> WorldIndex:
+    data = load_save(file_path)
+    return index_world(data["properties"]["worldSaveData"]["value"])
+
+
+def find_player(ownership: OwnershipGraph, key: str):
+    # 按 UID 或昵称查找玩家，返回 UID
+    return next(
+        (
+            player_uid
+            for player_uid, player in ownership.players.items()
+            if key in (player_uid, player.nickname)
+        ),
+        None,
+    )
+
+
+def select_pals(
+    world_index: WorldIndex,
+    container_id: str = None,
+    character_id: str = None,
+    guild_id: str = None,
+    player_uid: str = None,
+    passive_skills: list[str] = None,
+    species: set[str] = None,
+):
+    # 取各筛选条件对应的候选列表中最短的一个，再用 O(1) 的条件判断过滤其余条件
+    kv_container_id = world_index.kv_container_id
+    kv_character_id = world_index.kv_character_id
+    ownership = world_index.ownership
+    filters = []
+    if container_id in kv_container_id:
+        filters.append(
+            (kv_container_id[container_id], lambda pal: pal.slot_id == container_id)
+        )
+    if character_id in kv_character_id:
+        filters.append(
+            (
+                kv_character_id[character_id],
+                lambda pal: pal.character_id == character_id,
+            )
+        )
+    if guild_id in ownership.guilds:
+        filters.append(
+            (
+                ownership.pals_of_guild(guild_id),
+                lambda pal: ownership.guild_by_pal.get(pal.instance_id) == guild_id,
+            )
+        )
+    if player_uid in ownership.players:
+        filters.append(
+            (
+                ownership.pals_of_player(player_uid),
+                lambda pal: pal.owner_player_uid == player_uid,
+            )
+        )
+    if passive_skills:
+        mask = PASSIVE_SKILL_BITS.lookup_mask(passive_skills)
+        passive_index = world_index.passive_index
+        if mask is None:
+            # 含未知技能时没有帕鲁满足条件
+            filters.append(([], lambda pal: False))
+        else:
+            filters.append(
+                (
+                    passive_index.pals_in(passive_index.select_all(mask)),
+                    lambda pal: pal.passive_skill_mask & mask == mask,
+                )
+            )
+    if species is not None:
+        # species 为小写的种族 ID，与存档中的 CharacterID 按小写关联
+        filters.append(
+            (
+                [
+                    pal
+                    for character_id, character_pals in kv_character_id.items()
+                    if character_id.casefold() in species
+                    for pal in character_pals
+                ],
+                lambda pal: pal.character_id.casefold() in species,
+            )
+        )
+    if not filters:
+        return [pal for item in kv_container_id for pal in kv_container_id[item]]
+    filters.sort(key=lambda item: len(item[0]))
+    candidates, _ = filters[0]
+    if len(filters) == 1:
+        return candidates
+    predicates = [predicate for _, predicate in filters[1:]]
+    return [
+        pal for pal in candidates if all(predicate(pal) for predicate in predicates)
+    ]
+
+
+def sort_key(value: str):
+    # 与 Treeview 中显示的字符串比较，纯数字按整数排序
+    return int(value) if value.isdigit() else value
+
+
 class Application(tk.Tk):
     def __init__(self):
         super().__init__()
@@ -2440,16 +3357,23 @@ class Application(tk.Tk):
         self.recommended_ipadx = self.base_font_size - 2
         self.recommended_ipady = (self.base_font_size - 2) // 2
         self.l10n = L10N()
+        # 切换语言后名称尚未重新显示的帕鲁列表行
+        self.pal_list_stale: set[str] = set()
         self.create_widgets()
         self.on_startup_threading()
         self.apply_locale(startup=True)
 
     def apply_locale(self, locale: str = None, *, startup: bool = False):
+        # 被动技能筛选框中是当前语言的名称，切换语言前先转换为 ID
+        passive_skills = self.selected_passive_skills()
         self.l10n.set_locale(locale)
         FILE_TYPES[0][0] = self.l10n.get("All supported file types")
         FILE_TYPES[1][0] = self.l10n.get("Palworld main save")
         FILE_TYPES[2][0] = self.l10n.get("Palworld main save JSON")
+        FILE_TYPES[3][0] = self.l10n.get("Palworld main save binary")
         self.title(self.l10n.get("Palworld Save Editor"))
+        self.debug_menu_button.config(text=self.l10n.get("Debug"))
+        self.debug_menu.entryconfig(0, label=self.l10n.get("Profile operations"))
         self.select_source_button.config(text=self.l10n.get("Choose File"))
         self.save_and_convert_button.config(
             text=self.l10n.get("Save and Convert to SAV")
@@ -2459,27 +3383,48 @@ class Application(tk.Tk):
         self.tab_frame.tab(1, text=self.l10n.get("Player List"))
         self.tab_frame.tab(2, text=self.l10n.get("Pal List"))
         self.setup_treeviews(startup=startup)
+        if hasattr(self, "pal_map"):
+            self.pal_list_stale = set(self.pal_map)
+            self.render_visible_pal_rows()
         self.pal_container_label.config(text=self.l10n.get("Filter by Container ID"))
         self.character_id_label.config(text=self.l10n.get("Filter by Character ID"))
-        if self.container_id_list.cget("values"):
-            self.container_id_list.config(
-                values=[self.l10n.get("All")]
-                + sorted(list(self.container_id_list.cget("values")[1:]))
-            )
-            current = self.container_id_list.current()
-            current = 0 if current < 0 else current
-            self.container_id_list.current(current)
-        if self.character_id_list.cget("values"):
-            self.character_id_list.config(
+        self.guild_id_label.config(text=self.l10n.get("Filter by Guild ID"))
+        self.player_uid_label.config(text=self.l10n.get("Filter by Player UID"))
+        self.passive_skill_label.config(text=self.l10n.get("Filter by Passive Skills"))
+        self.passive_skill_filter_list.config(values=self.passive_skill_filter_values())
+        self.passive_skill_filter_list.set(
+            PAL_NAMES.passive_skills(self.l10n.get_locale(), passive_skills)
+            or self.l10n.get("All")
+        )
+        self.element_label.config(text=self.l10n.get("Filter by Element"))
+        self.min_rarity_label.config(text=self.l10n.get("Minimum Rarity"))
+        for combobox, values in (
+            (self.element_list, PAL_MONSTER_TABLE.values("Element")),
+            (self.min_rarity_list, PAL_MONSTER_TABLE.values("Rarity")),
+        ):
+            current = max(combobox.current(), 0)
+            combobox.config(values=[self.l10n.get("All")] + values)
+            combobox.current(current)
+        for combobox in (
+            self.container_id_list,
+            self.character_id_list,
+            self.guild_id_list,
+            self.player_uid_list,
+        ):
+            if not combobox.cget("values"):
+                continue
+            combobox.config(
                 values=[self.l10n.get("All")]
-                + sorted(list(self.character_id_list.cget("values")[1:]))
+                + sorted(list(combobox.cget("values")[1:]))
             )
-            current = self.character_id_list.current()
+            current = combobox.current()
             current = 0 if current < 0 else current
-            self.character_id_list.current(current)
+            combobox.current(current)
         self.status_label.config(text=self.l10n.get("Ready"))
         self.tips_label.config(
             text=self.l10n.get("MB1 to select items, MB3 to edit.")
+            + " "
+            + self.l10n.get("Double-click a guild or player to list its pals.")
             + self.l10n.get(" Please keep a backup in case of data loss.")
         )
 
@@ -2631,6 +3576,121 @@ class Application(tk.Tk):
             expand=True,
         )
 
+        self.pal_list_owner_filter_frame = ttk.Frame(self.pal_list_tab)
+        self.pal_list_owner_filter_frame.pack(side=tk.TOP, fill=tk.X)
+
+        self.guild_id_label = ttk.Label(
+            self.pal_list_owner_filter_frame, text="按公会 ID 筛选"
+        )
+        self.guild_id_label.pack(
+            side=tk.LEFT, padx=self.recommended_ipadx, pady=self.recommended_ipady
+        )
+
+        self.guild_id_list = ttk.Combobox(
+            self.pal_list_owner_filter_frame, justify=tk.CENTER
+        )
+        self.guild_id_list.bind(
+            "<<ComboboxSelected>>", lambda _: self.filter_pal_list()
+        )
+        self.guild_id_list.bind("<Return>", lambda _: self.filter_pal_list())
+        self.guild_id_list.pack(
+            side=tk.LEFT,
+            fill=tk.X,
+            ipadx=self.recommended_ipadx,
+            ipady=self.recommended_ipady,
+            expand=True,
+        )
+
+        self.player_uid_label = ttk.Label(
+            self.pal_list_owner_filter_frame, text="按玩家 UID 筛选"
+        )
+        self.player_uid_label.pack(
+            side=tk.LEFT, padx=self.recommended_ipadx, pady=self.recommended_ipady
+        )
+
+        self.player_uid_list = ttk.Combobox(
+            self.pal_list_owner_filter_frame, justify=tk.CENTER
+        )
+        self.player_uid_list.bind(
+            "<<ComboboxSelected>>", lambda _: self.filter_pal_list()
+        )
+        self.player_uid_list.bind("<Return>", lambda _: self.filter_pal_list())
+        self.player_uid_list.pack(
+            side=tk.LEFT,
+            fill=tk.X,
+            ipadx=self.recommended_ipadx,
+            ipady=self.recommended_ipady,
+            expand=True,
+        )
+
+        self.passive_skill_label = ttk.Label(
+            self.pal_list_owner_filter_frame, text="按被动技能筛选"
+        )
+        self.passive_skill_label.pack(
+            side=tk.LEFT, padx=self.recommended_ipadx, pady=self.recommended_ipady
+        )
+
+        # 可输入以逗号分隔的多个技能，筛选同时拥有这些技能的帕鲁
+        self.passive_skill_filter_list = ttk.Combobox(
+            self.pal_list_owner_filter_frame, justify=tk.CENTER
+        )
+        self.passive_skill_filter_list.bind(
+            "<<ComboboxSelected>>", lambda _: self.filter_pal_list()
+        )
+        self.passive_skill_filter_list.bind(
+            "<Return>", lambda _: self.filter_pal_list()
+        )
+        self.passive_skill_filter_list.pack(
+            side=tk.LEFT,
+            fill=tk.X,
+            ipadx=self.recommended_ipadx,
+            ipady=self.recommended_ipady,
+            expand=True,
+        )
+
+        self.pal_list_species_filter_frame = ttk.Frame(self.pal_list_tab)
+        self.pal_list_species_filter_frame.pack(side=tk.TOP, fill=tk.X)
+
+        self.element_label = ttk.Label(
+            self.pal_list_species_filter_frame, text="按属性筛选"
+        )
+        self.element_label.pack(
+            side=tk.LEFT, padx=self.recommended_ipadx, pady=self.recommended_ipady
+        )
+
+        self.element_list = ttk.Combobox(
+            self.pal_list_species_filter_frame, justify=tk.CENTER, state="readonly"
+        )
+        self.element_list.bind("<<ComboboxSelected>>", lambda _: self.filter_pal_list())
+        self.element_list.pack(
+            side=tk.LEFT,
+            fill=tk.X,
+            ipadx=self.recommended_ipadx,
+            ipady=self.recommended_ipady,
+            expand=True,
+        )
+
+        self.min_rarity_label = ttk.Label(
+            self.pal_list_species_filter_frame, text="最低稀有度"
+        )
+        self.min_rarity_label.pack(
+            side=tk.LEFT, padx=self.recommended_ipadx, pady=self.recommended_ipady
+        )
+
+        self.min_rarity_list = ttk.Combobox(
+            self.pal_list_species_filter_frame, justify=tk.CENTER, state="readonly"
+        )
+        self.min_rarity_list.bind(
+            "<<ComboboxSelected>>", lambda _: self.filter_pal_list()
+        )
+        self.min_rarity_list.pack(
+            side=tk.LEFT,
+            fill=tk.X,
+            ipadx=self.recommended_ipadx,
+            ipady=self.recommended_ipady,
+            expand=True,
+        )
+
         self.pal_list = ttk.Treeview(
             self.pal_list_tab,
             show="headings",
@@ -2680,6 +3740,19 @@ class Application(tk.Tk):
             side=tk.RIGHT, ipadx=self.recommended_ipadx, ipady=self.recommended_ipady
         )
 
+        self.debug_menu_button = ttk.Menubutton(self.status_bar, text="Debug")
+        self.debug_menu = tk.Menu(self.debug_menu_button, tearoff=False)
+        self.debug_menu_button.config(menu=self.debug_menu)
+        self.profile_enabled = tk.BooleanVar(value=palprofile.is_enabled())
+        self.debug_menu.add_checkbutton(
+            label="Profile operations",
+            variable=self.profile_enabled,
+            command=lambda: palprofile.set_enabled(self.profile_enabled.get()),
+        )
+        self.debug_menu_button.pack(
+            side=tk.RIGHT, ipadx=self.recommended_ipadx, ipady=self.recommended_ipady
+        )
+
         ttk.Separator(self.status_bar, orient=tk.VERTICAL).pack(
             fill=tk.Y, side=tk.RIGHT
         )
@@ -2733,9 +3806,12 @@ class Application(tk.Tk):
         self.guild_list.heading("据点数量", text=self.l10n.get("Base Camp Count"))
         self.guild_list.heading("成员数量", text=self.l10n.get("Member Count"))
         # for i in range(len(self.guild_list.cget("columns"))):
-        for i in [0, 2, 3, 4]:
-            self.guild_list.bind(self.sort_by(self.guild_list, i, True))
+        if startup:
+            # 只在创建时设置表头的排序命令，切换语言不会重新排序
+            for i in [0, 2, 3, 4]:
+                self.set_sort_command(self.guild_list, i, False)
         self.guild_list.bind("<Button-3>", self.on_guild_list_right_click)
+        self.guild_list.bind("<Double-1>", self.on_guild_list_double_click)
 
     def on_guild_list_right_click(self, event):
         guild = self.get_selected_guild()
@@ -2744,6 +3820,12 @@ class Application(tk.Tk):
         self.guild_edit_window = GuildEditWindow(self, guild)
         self.guild_edit_window.grab_set()
 
+    def on_guild_list_double_click(self, event):
+        guild = self.get_selected_guild()
+        if not guild:
+            return
+        self.show_owned_pals(guild_id=guild.group_id)
+
     def get_selected_guild(self):
         item = self.guild_list.focus()
         if not item:
@@ -2809,9 +3891,12 @@ class Application(tk.Tk):
         self.player_list.heading("经验值", text=self.l10n.get("Exp"))
         self.player_list.heading("最后在线", text=self.l10n.get("Last Online"))
         # for i in range(len(self.player_list.cget("columns"))):
-        for i in [0, 2, 4, 5, 6]:
-            self.player_list.bind(self.sort_by(self.player_list, i, True))
+        if startup:
+            # 只在创建时设置表头的排序命令，切换语言不会重新排序
+            for i in [0, 2, 4, 5, 6]:
+                self.set_sort_command(self.player_list, i, False)
         self.player_list.bind("<Button-3>", self.on_player_list_right_click)
+        self.player_list.bind("<Double-1>", self.on_player_list_double_click)
 
     def on_player_list_right_click(self, event):
         player = self.get_selected_player()
@@ -2820,6 +3905,12 @@ class Application(tk.Tk):
         self.player_edit_window = PlayerEditWindow(self, player)
         self.player_edit_window.grab_set()
 
+    def on_player_list_double_click(self, event):
+        player = self.get_selected_player()
+        if not player:
+            return
+        self.show_owned_pals(player_uid=player.player_uid)
+
     def get_selected_player(self):
         item = self.player_list.focus()
         if not item:
@@ -2839,7 +3930,10 @@ class Application(tk.Tk):
                     "远程攻击 个体值",
                     "防御力 个体值",
                     "被动技能",
-                    # "HP",
+                    "HP",
+                    "近战攻击",
+                    "远程攻击",
+                    "防御力",
                     # "SAN 值"
                 )
             )
@@ -2858,6 +3952,10 @@ class Application(tk.Tk):
             "防御力 个体值", width=self.base_font_size * 14, stretch=False
         )
         self.pal_list.column("被动技能", width=self.base_font_size * 9)
+        self.pal_list.column("HP", width=self.base_font_size * 8, stretch=False)
+        self.pal_list.column("近战攻击", width=self.base_font_size * 11, stretch=False)
+        self.pal_list.column("远程攻击", width=self.base_font_size * 11, stretch=False)
+        self.pal_list.column("防御力", width=self.base_font_size * 9, stretch=False)
         self.pal_list.heading("帕鲁 ID", text=self.l10n.get("Character ID"))
         self.pal_list.heading("性别", text=self.l10n.get("Gender"))
         self.pal_list.heading("等级", text=self.l10n.get("Level"))
@@ -2867,11 +3965,16 @@ class Application(tk.Tk):
         self.pal_list.heading("远程攻击 个体值", text=self.l10n.get("Talent: Shot"))
         self.pal_list.heading("防御力 个体值", text=self.l10n.get("Talent: Defense"))
         self.pal_list.heading("被动技能", text=self.l10n.get("Passive Skills"))
-        # self.pal_list.heading("HP", text="HP")
+        self.pal_list.heading("HP", text=self.l10n.get("HP"))
+        self.pal_list.heading("近战攻击", text=self.l10n.get("Melee Attack"))
+        self.pal_list.heading("远程攻击", text=self.l10n.get("Shot Attack"))
+        self.pal_list.heading("防御力", text=self.l10n.get("Defense"))
         # self.pal_list.heading("SAN 值", text="SAN 值")
         # for i in range(len(self.pal_list.cget("columns"))):
-        for i in [0, 2, 3, 7, 6, 5, 4]:
-            self.pal_list.bind(self.sort_by(self.pal_list, i, True))
+        if startup:
+            # 只在创建时设置表头的排序命令，切换语言不会重新排序
+            for i in [0, 2, 3, 7, 6, 5, 4, 12, 11, 10, 9]:
+                self.set_sort_command(self.pal_list, i, False)
         self.pal_list.bind("<Button-3>", self.on_pal_list_right_click)
 
     def on_pal_list_right_click(self, event):
@@ -2893,15 +3996,16 @@ class Application(tk.Tk):
         self.setup_pal_list(startup=startup)
 
     def sort_by(self, tv: ttk.Treeview, col, descending):
+        if tv is self.pal_list:
+            self.render_pal_rows(list(self.pal_list_stale))
         data = [(tv.set(child, col), child) for child in tv.get_children("")]
-        data.sort(
-            reverse=descending, key=lambda x: int(x[0]) if x[0].isdigit() else x[0]
-        )
+        data.sort(reverse=descending, key=lambda x: sort_key(x[0]))
         for ix, item in enumerate(data):
             tv.move(item[1], "", ix)
-        tv.heading(
-            col, command=lambda col=col: self.sort_by(tv, col, int(not descending))
-        )
+        self.set_sort_command(tv, col, not descending)
+
+    def set_sort_command(self, tv: ttk.Treeview, col, descending):
+        tv.heading(col, command=lambda: self.sort_by(tv, col, descending))
 
     def update_guild_list_scrollbar(self, first, last):
         first, last = float(first), float(last)
@@ -2926,36 +4030,104 @@ class Application(tk.Tk):
         else:
             self.pal_list_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
             self.pal_list_scrollbar.set(first, last)
+        if self.pal_list_stale:
+            self.render_visible_pal_rows(first, last)
+
+    def pal_row_values(self, pal: Pal):
+        # 被动技能显示为当前语言的名称，其余列与 Pal.values 相同
+        locale = self.l10n.get_locale()
+        values = pal.values
+        values[8] = PAL_NAMES.passive_skills(locale, pal.passive_skill_list)
+        return values
+
+    def insert_pal_row(self, pal: Pal, index="end"):
+        row_id = self.pal_list.insert("", index, values=self.pal_row_values(pal))
+        self.pal_map[row_id] = pal
+
+    def render_pal_rows(self, items):
+        # 只更新被动技能一列，名称取自 PAL_NAMES 的缓存
+        locale = self.l10n.get_locale()
+        for item in items:
+            if item not in self.pal_list_stale:
+                continue
+            pal = self.pal_map[item]
+            self.pal_list.set(
+                item, 8, PAL_NAMES.passive_skills(locale, pal.passive_skill_list)
+            )
+            self.pal_list_stale.discard(item)
+
+    def render_visible_pal_rows(self, first: float = None, last: float = None):
+        # 切换语言时只重绘可见的行，其余的行滚动到可见或排序时再重绘
+        if first is None:
+            first, last = self.pal_list.yview()
+        children = self.pal_list.get_children()
+        start = int(first * len(children))
+        end = int(last * len(children)) + 1
+        self.render_pal_rows(children[start:end])
+
+    def passive_skill_filter_values(self):
+        return [self.l10n.get("All")] + sorted(
+            KV_PASSIVE_SKILL[self.l10n.get_locale()]
+        )
+
+    def selected_passive_skills(self):
+        # 技能名称按当前语言转换为 ID，无法识别的名称按 ID 处理
+        text = self.passive_skill_filter_list.get()
+        if text == self.l10n.get("All"):
+            return []
+        kv_passive_skill = KV_PASSIVE_SKILL[self.l10n.get_locale()]
+        return [
+            kv_passive_skill.get(name.strip(), name.strip())
+            for name in text.replace("，", ",").split(",")
+            if name.strip()
+        ]
+
+    def selected_species(self):
+        # 属性与稀有度条件经数据表索引转换为种族 ID 集合，均为 “全部” 时不筛选
+        conditions = {}
+        if self.element_list.current() > 0:
+            conditions["Element"] = self.element_list.get()
+        if self.min_rarity_list.current() > 0:
+            conditions["Rarity"] = (int(self.min_rarity_list.get()), None)
+        return species_ids(**conditions) if conditions else None
+
+    def show_owned_pals(self, guild_id: str = None, player_uid: str = None):
+        # 从公会 / 玩家列表跳转到帕鲁列表，只保留所有者筛选
+        self.container_id_list.current(0)
+        self.character_id_list.current(0)
+        self.guild_id_list.set(guild_id or self.l10n.get("All"))
+        self.player_uid_list.set(player_uid or self.l10n.get("All"))
+        self.passive_skill_filter_list.current(0)
+        self.element_list.current(0)
+        self.min_rarity_list.current(0)
+        self.tab_frame.select(self.pal_list_tab)
+        self.filter_pal_list()
 
     def filter_pal_list(self):
+        # 还没有加载存档时筛选框也可以操作
+        if not hasattr(self, "world_index"):
+            return
         container_id = self.container_id_list.get()
         character_id = self.character_id_list.get()
+        guild_id = self.guild_id_list.get()
+        player_uid = self.player_uid_list.get()
         container_id = None if container_id == self.l10n.get("All") else container_id
         character_id = None if character_id == self.l10n.get("All") else character_id
+        guild_id = None if guild_id == self.l10n.get("All") else guild_id
+        player_uid = None if player_uid == self.l10n.get("All") else player_uid
         self.pal_list.delete(*self.pal_list.get_children())
-        # pal_map = {k: v for k, v in self.pal_map.items()}
         self.pal_map.clear()
-        if (
-            container_id in self.kv_container_id
-            and character_id in self.kv_character_id
+        self.pal_list_stale.clear()
+        for pal in select_pals(
+            self.world_index,
+            container_id,
+            character_id,
+            guild_id,
+            player_uid,
+            self.selected_passive_skills(),
+            self.selected_species(),
         ):
-            for pal in self.kv_container_id[container_id]:
-                if pal.character_id == character_id:
-                    row_id = self.pal_list.insert("", 0, values=pal.values)
-                    self.pal_map[row_id] = pal
-        elif container_id in self.kv_container_id:
-            for pal in self.kv_container_id[container_id]:
-                row_id = self.pal_list.insert("", 0, values=pal.values)
-                self.pal_map[row_id] = pal
-        elif character_id in self.kv_character_id:
-            for pal in self.kv_character_id[character_id]:
-                row_id = self.pal_list.insert("", 0, values=pal.values)
-                self.pal_map[row_id] = pal
-        else:
-            for item in self.kv_container_id:
-                for pal in self.kv_container_id[item]:
-                    row_id = self.pal_list.insert("", 0, values=pal.values)
-                    self.pal_map[row_id] = pal
+            self.insert_pal_row(pal, 0)
 
     def update_source_filename(self, filename: str = ""):
         self.source_filename.set(filename)
@@ -3000,12 +4172,17 @@ class Application(tk.Tk):
         if hasattr(self, "kv_character_id"):
             del self.kv_character_id
         self.character_id_list.config(values=[])
+        self.guild_id_list.config(values=[])
+        self.player_uid_list.config(values=[])
         if hasattr(self, "guild_map"):
             del self.guild_map
         if hasattr(self, "player_map"):
             del self.player_map
         if hasattr(self, "pal_map"):
             del self.pal_map
+        self.pal_list_stale.clear()
+        if hasattr(self, "world_index"):
+            del self.world_index
 
         # 离开帕鲁列表标签页，不然加载速度会很慢
         # if self.tab_frame.index("current") == self.tab_frame.index(self.pal_list_tab):
@@ -3019,8 +4196,10 @@ class Application(tk.Tk):
         threading.Thread(target=self.select_source).start()
 
     @switch_state_decorator
-    def select_source(self):
-        filename = filedialog.askopenfilename(
+    @palprofile.profiled("select_source")
+    @traced("select_source")
+    def select_source(self, filename: str = ""):
+        filename = filename or filedialog.askopenfilename(
             title=self.l10n.get("Choose Palworld main save"), filetypes=FILE_TYPES
         )
         if not filename:
@@ -3035,9 +4214,20 @@ class Application(tk.Tk):
         self.clean_all()
         self.progress(1)
         if self.file_path.suffix == ".sav":
-            self.data = convert_sav_to_dict(self.file_path)
+            self.data = convert_sav_to_dict(
+                self.file_path,
+                passthrough_sections=PASSTHROUGH_SECTIONS,
+                lazy_character_data=True,
+                memory_tracer=self.memory_tracer,
+                codec_timer=(
+                    codectiming.CodecTimer() if codectiming.is_enabled() else None
+                ),
+            )
         elif self.file_path.suffix == ".json":
-            self.data = json.loads(self.file_path.read_text(encoding="utf-8"))
+            self.data = load_json(self.file_path.read_text(encoding="utf-8"))
+        elif self.file_path.suffix == ".palbin":
+            self.data = palbin.loads(self.file_path.read_bytes())
+        self.memory_tracer.snapshot("data loaded")
         self.progress(2)
         # print(find_value_path(self.data, "无名公会"))
         # print(find_value_path(self.data, "Unnamed Guild"))
@@ -3045,94 +4235,48 @@ class Application(tk.Tk):
         self.real_date_time_ticks = self.world_save_data["GameTimeSaveData"]["value"][
             "RealDateTimeTicks"
         ]["value"]
+        self.world_index = index_world(
+            self.world_save_data, self.strtime, progress=self.progress
+        )
+        self.memory_tracer.snapshot("world indexed")
         self.guild_map: dict[str, Guild] = {}
         self.player_map: dict[str, Player] = {}
         self.pal_map: dict[str, Pal] = {}
-        for i in self.world_save_data["GroupSaveDataMap"]["value"]:
-            group_data: dict = i["value"]["RawData"]["value"]
-            print(group_data.keys())
-            if not group_data.get("base_camp_level"):
-                print(
-                    "Warning: Unknown data structure for group_id:",
-                    f"{group_data['group_id']}, skipping",
-                )
-                continue
-            guild = Guild(group_data)
+        for guild in self.world_index.guilds:
             row_id = self.guild_list.insert("", "end", values=guild.values)
             self.guild_map[row_id] = guild
-            self.progress(3)
-            for player in group_data.get("players", []):
-                print(player)
-                keys = find_value_path(
-                    self.world_save_data["CharacterSaveParameterMap"],
-                    player["player_info"]["player_name"],
-                )
-                character_data = {
-                    k: v
-                    for k, v in self.world_save_data[
-                        "CharacterSaveParameterMap"
-                    ].items()
-                }
-                for k in keys[:-2]:
-                    character_data = character_data[k]
-                # print(character_data.keys())
-                # print(character_data["NickName"]["value"])
-                player_uid = player["player_uid"]
-                last_online_real_time = self.strtime(
-                    player["player_info"]["last_online_real_time"]
-                )
-                player = Player(
-                    character_data, guild, player_uid, last_online_real_time
-                )
-                row_id = self.player_list.insert("", "end", values=player.values)
-                self.player_map[row_id] = player
-            self.progress(4)
+        for player in self.world_index.players:
+            row_id = self.player_list.insert("", "end", values=player.values)
+            self.player_map[row_id] = player
         self.sort_by(self.player_list, 6, True)
         self.character_save_parameter_map = self.world_save_data[
             "CharacterSaveParameterMap"
         ]["value"]
-        len_ = len(self.character_save_parameter_map)
-        count = 0
-        self.kv_container_id: dict[str, Pal] = {}
-        self.kv_character_id: dict[str, Pal] = {}
-        for i in self.character_save_parameter_map:
-            instance_id = i["key"]["InstanceId"]["value"]
-            character_data: dict = i["value"]["RawData"]["value"]["object"][
-                "SaveParameter"
-            ]["value"]
-            # print(character_data)
-            if not character_data.get("CharacterID"):
-                if (
-                    character_data["IsPlayer"]["value"]
-                    if character_data.get("IsPlayer")
-                    else False
-                ):
-                    continue
-                print(
-                    "Warning: Unknown data structure for character_id:",
-                    f"{character_data['CharacterID']}, skipping",
-                )
-            pal = Pal(instance_id, character_data)
-            row_id = self.pal_list.insert("", 0, values=pal.values)
-            self.pal_map[row_id] = pal
-            container_id = pal.slot_id
-            if not self.kv_container_id.get(container_id):
-                self.kv_container_id[container_id] = []
-            self.kv_container_id[container_id].append(pal)
-            character_id = pal.character_id
-            if not self.kv_character_id.get(character_id):
-                self.kv_character_id[character_id] = []
-            self.kv_character_id[character_id].append(pal)
-            count += 1
-            self.progress(4 + (count / len_) * 96)
+        for pal in self.world_index.pals:
+            self.insert_pal_row(pal, 0)
+        self.kv_container_id = self.world_index.kv_container_id
+        self.kv_character_id = self.world_index.kv_character_id
+        self.memory_tracer.snapshot("Treeview items inserted")
         self.container_id_list.config(
             values=[self.l10n.get("All")] + sorted(list(self.kv_container_id))
         )
         self.character_id_list.config(
             values=[self.l10n.get("All")] + sorted(list(self.kv_character_id))
         )
+        ownership = self.world_index.ownership
+        self.guild_id_list.config(
+            values=[self.l10n.get("All")] + sorted(list(ownership.guilds))
+        )
+        self.player_uid_list.config(
+            values=[self.l10n.get("All")] + sorted(list(ownership.players))
+        )
         self.container_id_list.current(0)
         self.character_id_list.current(0)
+        self.guild_id_list.current(0)
+        self.player_uid_list.current(0)
+        self.passive_skill_filter_list.current(0)
+        self.element_list.current(0)
+        self.min_rarity_list.current(0)
         self.progress(100)
 
     def strtime(self, ticks: int):
@@ -3145,22 +4289,33 @@ class Application(tk.Tk):
         threading.Thread(target=self.save).start()
 
     @switch_state_decorator
+    @palprofile.profiled("save")
+    @traced("save")
     def save(self, filename: str = "", *, silent: bool = False):
         filename = filename or filedialog.asksaveasfilename(
             title=self.l10n.get("Save as JSON"),
-            filetypes=[FILE_TYPES[2]],
+            filetypes=[FILE_TYPES[2], FILE_TYPES[3]],
             defaultextension=FILE_TYPES[2][1],
             initialfile=self.file_path.stem,
         )
         if not filename:
             return
-        if not filename.endswith(".json"):
+        if not filename.endswith((".json", ".palbin")):
             filename += ".json"
         if not silent:
             self.progress(1)
-        Path(filename).write_text(
-            json.dumps(self.data, ensure_ascii=False, indent="\t"), encoding="utf-8"
-        )
+        if filename.endswith(".palbin"):
+            content = palbin.dumps(self.data)
+            self.memory_tracer.snapshot("serialized")
+            Path(filename).write_bytes(content)
+        else:
+            content = json.dumps(
+                fully_decode(self.data), ensure_ascii=False, indent="\t"
+            )
+            self.memory_tracer.snapshot("serialized")
+            Path(filename).write_text(content, encoding="utf-8")
+        del content
+        self.memory_tracer.snapshot("written")
         if not silent:
             self.progress(100)
             messagebox.showinfo(
@@ -3171,6 +4326,8 @@ class Application(tk.Tk):
         threading.Thread(target=self.save_and_convert).start()
 
     @switch_state_decorator
+    @palprofile.profiled("save_and_convert")
+    @traced("save_and_convert")
     def save_and_convert(self):
         filename = filedialog.asksaveasfilename(
             title=self.l10n.get("Save and Convert to SAV"),
@@ -3181,10 +4338,18 @@ class Application(tk.Tk):
         if not filename:
             return
         self.progress(1)
-        self.save(filename, silent=True)
+        # 旁路副本写成 palbin：无需像 JSON 导出那样先完整解码整个世界，也能再次打开
+        self.save(f"{filename}.palbin", silent=True)
         self.progress(50)
         self.switch_state_to_disabled()
-        convert_dict_to_sav(self.data, Path(filename))
+        self.memory_tracer.snapshot("saved")
+        convert_dict_to_sav(
+            self.data,
+            Path(filename),
+            compress_workers=palzip.default_workers(),
+            memory_tracer=self.memory_tracer,
+            codec_timer=codectiming.CodecTimer() if codectiming.is_enabled() else None,
+        )
         self.progress(100)
         messagebox.showinfo(
             self.l10n.get("Save and Convert to SAV"),
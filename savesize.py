@@ -0,0 +1,269 @@
+"""存档体积分析：统计解压后的 GVAS 中每个字节属于哪里。
+
+完整解析一遍存档，在每次读取属性时记录其占用的字节数，输出三张表：
+
+    section   worldSaveData 下每个段 (含属性头) 的字节数
+    type      按属性类型统计的独占字节数 (不含子属性)，自定义解码的属性
+              以 “类型 (路径末段)” 区分，例如 ArrayProperty (RawData)
+    owner     CharacterSaveParameterMap 与 GroupSaveDataMap 中的条目按公会 / 玩家
+              归属统计；玩家角色归属其本人，帕鲁归属 OwnerPlayerUId，没有主人的
+              帕鲁 (如据点工作帕鲁) 只归属其 group_id 所在的公会
+
+每张表都可以按字节数、数量或名称排序，也可以输出为 CSV::
+
+    python savesize.py Level.sav --sort bytes
+    python savesize.py Level.sav --table owner --csv owner.csv
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from run import (
+    CHARACTER_RAW_DATA,
+    KNOWN_PROPS,
+    PALWORLD_CUSTOM_PROPERTIES,
+    ZERO_GUID,
+    SaveEncoder,
+    ZeroCopyArchiveReader,
+    decompress_sav_file,
+    load_json,
+    read_gvas_file,
+)
+
+GROUP_RAW_DATA = ".worldSaveData.GroupSaveDataMap.Value.RawData"
+SECTION_PREFIX = ".worldSaveData."
+# properties_until_end 在调用 property 之前读取的属性头：名称、类型两个 FString 与 u64 长度
+FSTRING_OVERHEAD = 4 + 1
+SIZE_FIELD = 8
+
+
+@dataclass
+class SizeStats:
+    total: int = 0
+    sections: dict[str, int] = field(default_factory=dict)
+    types: dict[str, list[int]] = field(default_factory=dict)
+    character_sizes: list[int] = field(default_factory=list)
+    group_sizes: list[int] = field(default_factory=list)
+    # 正在读取的属性，每项为 [reader, 同一 reader 中子属性的字节数之和]
+    stack: list[list] = field(default_factory=list)
+    last_blob_key: str = ""
+
+
+def fstring_size(value: str):
+    if value.isascii():
+        return len(value) + FSTRING_OVERHEAD
+    return len(value.encode("utf-16-le")) + 2 + 4
+
+
+class SizeAnalyzingReader(ZeroCopyArchiveReader):
+    # RawData 等字节数组会被自定义解码器交给 internal_copy 出的 reader 再解析一遍。
+    # 每个 reader 只统计自己的字节流：属性的独占字节 = 读取的字节 - 同一流中子属性的字节；
+    # 子 reader 中顶层属性的字节再从字节数组所在的类型中扣除，避免重复计算
+    stats: SizeStats = None
+    blob_key: str = ""
+
+    def internal_copy(self, data, debug: bool):
+        reader = super().internal_copy(data, debug)
+        reader.blob_key = self.stats.last_blob_key
+        return reader
+
+    def properties_until_end(self, path: str = ""):
+        properties = {}
+        stats = self.stats
+        while True:
+            name = self.fstring()
+            if name == "None":
+                if not stats.stack:
+                    self.add_bytes("(property header)", fstring_size(name))
+                break
+            type_name = self.fstring()
+            size = self.u64()
+            header = fstring_size(name) + fstring_size(type_name) + SIZE_FIELD
+            start = self.data.tell()
+            property_path = f"{path}.{name}"
+            properties[name] = self.property(type_name, size, property_path)
+            if not stats.stack:
+                self.add_bytes("(property header)", header)
+            if property_path.count(".") == 2 and property_path.startswith(
+                SECTION_PREFIX
+            ):
+                stats.sections[name] = (
+                    stats.sections.get(name, 0) + header + self.data.tell() - start
+                )
+        return properties
+
+    def add_bytes(self, key: str, size: int, count: int = 0):
+        entry = self.stats.types.setdefault(key, [0, 0])
+        entry[0] += size
+        entry[1] += count
+
+    def property(self, type_name: str, size: int, path: str, nested_caller_path=""):
+        stats = self.stats
+        name = path.rsplit(".", 1)[-1]
+        custom = path in self.custom_properties and (
+            path is not nested_caller_path or nested_caller_path == ""
+        )
+        start = self.data.tell()
+        stats.stack.append([self, 0])
+        try:
+            value = super().property(type_name, size, path, nested_caller_path)
+        finally:
+            _, children = stats.stack.pop()
+        inclusive = self.data.tell() - start
+        blob = type_name == "ArrayProperty" and value.get("array_type") == "ByteProperty"
+        key = f"{type_name} ({name})" if custom or blob else type_name
+        if blob:
+            stats.last_blob_key = key
+        self.add_bytes(key, inclusive - children, 1)
+        if stats.stack:
+            parent = stats.stack[-1]
+            if parent[0] is self:
+                parent[1] += inclusive
+            else:
+                self.add_bytes(self.blob_key, -inclusive)
+        if nested_caller_path == "":
+            if path == CHARACTER_RAW_DATA:
+                stats.character_sizes.append(inclusive)
+            elif path == GROUP_RAW_DATA:
+                stats.group_sizes.append(inclusive)
+        return value
+
+
+def analyze(file_path: Path):
+    raw_gvas, _ = decompress_sav_file(file_path)
+    custom_properties = {
+        prop: PALWORLD_CUSTOM_PROPERTIES[prop]
+        for prop in PALWORLD_CUSTOM_PROPERTIES
+        if prop in KNOWN_PROPS
+    }
+    stats = SizeStats(total=len(raw_gvas))
+    SizeAnalyzingReader.stats = stats
+    try:
+        gvas_file = read_gvas_file(
+            raw_gvas, custom_properties, reader_class=SizeAnalyzingReader
+        )
+    finally:
+        SizeAnalyzingReader.stats = None
+    # GVAS 文件头与结尾等不经过属性读取的字节
+    attributed = sum(size for size, count in stats.types.values())
+    stats.types["(file header)"] = [stats.total - attributed, 1]
+    data = load_json(json.dumps(gvas_file.dump(), cls=SaveEncoder))
+    return stats, owner_rows(data, stats)
+
+
+def owner_rows(data: dict, stats: SizeStats):
+    world_save_data = data["properties"]["worldSaveData"]["value"]
+    guild_names = {}
+    player_guilds = {}
+    player_names = {}
+    rows: dict[tuple[str, str], list[int]] = {}
+
+    def add(guild: str, player: str, size: int):
+        row = rows.setdefault((guild, player), [0, 0])
+        row[0] += size
+        row[1] += 1
+
+    groups = world_save_data.get("GroupSaveDataMap", {}).get("value", [])
+    for entry, size in zip(groups, stats.group_sizes):
+        group_data = entry["value"]["RawData"]["value"]
+        group_id = group_data["group_id"]
+        guild_names[group_id] = group_data.get("guild_name") or group_data.get(
+            "group_name", group_id
+        )
+        for player in group_data.get("players", []):
+            player_guilds[player["player_uid"]] = group_id
+            player_names[player["player_uid"]] = player["player_info"]["player_name"]
+        add(guild_names[group_id], "", size)
+
+    characters = world_save_data["CharacterSaveParameterMap"]["value"]
+    for entry, size in zip(characters, stats.character_sizes):
+        raw_data = entry["value"]["RawData"]["value"]
+        character = raw_data["object"]["SaveParameter"]["value"]
+        owner = entry["key"]["PlayerUId"]["value"]
+        if owner == ZERO_GUID and character.get("OwnerPlayerUId"):
+            owner = character["OwnerPlayerUId"]["value"]
+        group_id = player_guilds.get(owner, raw_data.get("group_id", ZERO_GUID))
+        guild = guild_names.get(group_id, "(no guild)")
+        player = player_names.get(owner, owner) if owner != ZERO_GUID else ""
+        add(guild, player, size)
+    return [
+        {"guild": guild, "player": player, "bytes": size, "count": count}
+        for (guild, player), (size, count) in rows.items()
+    ]
+
+
+def tables(stats: SizeStats, owners: list[dict]):
+    return {
+        "section": [
+            {"name": name, "bytes": size, "count": 1}
+            for name, size in stats.sections.items()
+        ],
+        "type": [
+            {"name": name, "bytes": size, "count": count}
+            for name, (size, count) in stats.types.items()
+        ],
+        "owner": owners,
+    }
+
+
+def sort_rows(rows: list[dict], key: str):
+    if key == "name":
+        return sorted(
+            rows,
+            key=lambda row: [v for k, v in row.items() if k not in ("bytes", "count")],
+        )
+    return sorted(rows, key=lambda row: row[key], reverse=True)
+
+
+def print_table(title: str, rows: list[dict], total: int):
+    columns = [k for k in rows[0] if k not in ("bytes", "count")] if rows else []
+    print(f"== {title} ==")
+    print(
+        "".join(f"{c:<40}" for c in columns)
+        + f"{'bytes':>14}{'MiB':>10}{'%':>8}{'count':>10}"
+    )
+    for row in rows:
+        print(
+            "".join(f"{str(row[c])[:39]:<40}" for c in columns)
+            + f"{row['bytes']:>14}{row['bytes'] / 2**20:>10.2f}"
+            f"{row['bytes'] / total * 100:>8.2f}{row['count']:>10}"
+        )
+    print()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="分析存档中各部分占用的字节数")
+    parser.add_argument("save", type=Path)
+    parser.add_argument(
+        "--table", choices=["section", "type", "owner", "all"], default="all"
+    )
+    parser.add_argument("--sort", choices=["bytes", "count", "name"], default="bytes")
+    parser.add_argument("--limit", type=int, default=0, help="每张表最多显示的行数")
+    parser.add_argument("--csv", type=Path, help="把所选的表写入 CSV")
+    args = parser.parse_args()
+
+    stats, owners = analyze(args.save)
+    result = tables(stats, owners)
+    names = list(result) if args.table == "all" else [args.table]
+    print(f"GVAS size: {stats.total} bytes ({stats.total / 2**20:.2f} MiB)\n")
+    for name in names:
+        rows = sort_rows(result[name], args.sort)
+        print_table(name, rows[: args.limit] if args.limit else rows, stats.total)
+    if args.csv:
+        with args.csv.open("w", newline="", encoding="utf-8") as f:
+            fieldnames = ["table"] + list(
+                dict.fromkeys(k for name in names for row in result[name] for k in row)
+            )
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer.writeheader()
+            for name in names:
+                for row in sort_rows(result[name], args.sort):
+                    writer.writerow({"table": name, **row})
+        print(f"Written to {args.csv}", file=sys.stderr)
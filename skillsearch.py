@@ -0,0 +1,103 @@
+"""技能选择窗口的增量搜索。
+
+SkillSearchIndex 为 名称 -> ID 的字典 (unpack.KV_WAZA / KV_PASSIVE_SKILL 的某个
+语言) 建立两种索引，键都不区分大小写，名称与 ID 都参与匹配：
+
+- 前缀：所有键排序后的数组，前缀匹配是二分查找得到的一段连续区间；
+- 子串：每个字符二元组 (单字符查询用单个字符) 到条目序号集合的倒排表，
+  查询串的所有二元组求交集得到候选，再逐个确认包含关系。
+
+结果中前缀匹配在前，其余子串匹配在后，各自按名称排序。查询在上一次查询的基础上
+追加字符时，只在上一次的结果中过滤。每个 (种类, 语言) 的索引只构建一次::
+
+    skill_search_index("waza", "en").search("fire")
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+
+from unpack import KV_PASSIVE_SKILL, KV_WAZA
+
+SKILL_TABLES = {"waza": KV_WAZA, "passive_skill": KV_PASSIVE_SKILL}
+# 前缀区间的上界，排在任何以该前缀开头的字符串之后
+PREFIX_END = "\U0010ffff"
+
+
+def grams(text: str):
+    if len(text) < 2:
+        return set(text)
+    return {text[i : i + 2] for i in range(len(text) - 1)}
+
+
+class SkillSearchIndex:
+    def __init__(self, entries: dict[str, str]):
+        self.names = sorted(entries)
+        self.ids = [entries[name] for name in self.names]
+        # 每个条目的匹配键：名称与 ID，ID 同时登记 “::” 之后的部分
+        self.keys: list[tuple[str, ...]] = []
+        prefixes: list[tuple[str, int]] = []
+        self.postings: dict[str, set[int]] = {}
+        for i, (name, skill_id) in enumerate(zip(self.names, self.ids)):
+            keys = {name.casefold(), skill_id.casefold()}
+            keys.add(skill_id.rsplit("::", 1)[-1].casefold())
+            self.keys.append(tuple(keys))
+            for key in keys:
+                prefixes.append((key, i))
+                for gram in grams(key) | set(key):
+                    self.postings.setdefault(gram, set()).add(i)
+        prefixes.sort()
+        self.prefix_keys = [key for key, _ in prefixes]
+        self.prefix_rows = [i for _, i in prefixes]
+        self.last_query = ""
+        self.last_result = list(range(len(self.names)))
+
+    def id_of(self, name: str):
+        i = bisect_left(self.names, name)
+        if i < len(self.names) and self.names[i] == name:
+            return self.ids[i]
+        return None
+
+    def prefix_rows_of(self, query: str):
+        start = bisect_left(self.prefix_keys, query)
+        end = bisect_left(self.prefix_keys, query + PREFIX_END, start)
+        return set(self.prefix_rows[start:end])
+
+    def candidates(self, query: str):
+        if query.startswith(self.last_query):
+            return self.last_result
+        rows: set[int] = None
+        for gram in grams(query):
+            matched = self.postings.get(gram, set())
+            rows = matched.copy() if rows is None else rows & matched
+            if not rows:
+                return []
+        return sorted(rows)
+
+    def search_rows(self, query: str) -> list[int]:
+        query = query.strip().casefold()
+        if not query:
+            result = list(range(len(self.names)))
+        else:
+            prefix = self.prefix_rows_of(query)
+            others = [
+                i
+                for i in self.candidates(query)
+                if i not in prefix and any(query in key for key in self.keys[i])
+            ]
+            result = sorted(prefix) + others
+        self.last_query, self.last_result = query, sorted(result)
+        return result
+
+    def search(self, query: str) -> list[str]:
+        return [self.names[i] for i in self.search_rows(query)]
+
+
+_INDEXES: dict[tuple[str, str], SkillSearchIndex] = {}
+
+
+def skill_search_index(kind: str, locale: str):
+    index = _INDEXES.get((kind, locale))
+    if index is None:
+        index = _INDEXES[(kind, locale)] = SkillSearchIndex(SKILL_TABLES[kind][locale])
+    return index
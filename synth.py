@@ -0,0 +1,394 @@
+"""生成结构合法的合成世界存档，用于在没有真实存档时做可复现的基准测试。
+
+角色 ID、技能和被动技能均取自 unpack 中的数据表，生成结果与
+convert_sav_to_dict 的返回值同构，可以直接构建索引，也可以写成 .sav::
+
+    python synth.py world.sav --guilds 10 --players 4 --pals 10000
+"""
+
+from __future__ import annotations
+
+import random
+import uuid
+from pathlib import Path
+
+from exptable import EXP_TABLE
+from run import CHARACTER_RAW_DATA, TICKS_PER_DAY, ZERO_GUID
+from unpack import ACTION_SKILLS, CHARACTER_IDS, PASSIVE_SKILLS
+
+CONTAINER_RAW_DATA = ".worldSaveData.CharacterContainerSaveData.Value.Slots.Slots.RawData"
+GROUP_SAVE_DATA_MAP = ".worldSaveData.GroupSaveDataMap"
+# 2024-01-19 的 .NET ticks，和真实存档处于同一量级
+REAL_DATE_TIME_TICKS = 638412768000000000
+
+
+def new_guid(rng: random.Random):
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def prop(type_name: str, value, **kwargs):
+    return {"id": None, "value": value, "type": type_name, **kwargs}
+
+
+def guid_struct(value: str):
+    return {
+        "struct_type": "Guid",
+        "struct_id": ZERO_GUID,
+        "id": None,
+        "value": value,
+        "type": "StructProperty",
+    }
+
+
+def struct(struct_type: str, value: dict):
+    return {
+        "struct_type": struct_type,
+        "struct_id": ZERO_GUID,
+        "id": None,
+        "value": value,
+        "type": "StructProperty",
+    }
+
+
+def enum(enum_type: str, value: str):
+    return prop("EnumProperty", {"type": enum_type, "value": value})
+
+
+def enum_array(values: list[str], array_type: str = "EnumProperty"):
+    return prop("ArrayProperty", {"values": values}, array_type=array_type)
+
+
+def fixed_point(value: int):
+    return struct("FixedPoint64", {"Value": prop("Int64Property", value)})
+
+
+def craft_speeds(rng: random.Random):
+    return {
+        "array_type": "StructProperty",
+        "id": None,
+        "value": {
+            "prop_name": "CraftSpeeds",
+            "prop_type": "StructProperty",
+            "values": [
+                {
+                    "WorkSuitability": enum(
+                        "EPalWorkSuitability", "EPalWorkSuitability::" + work
+                    ),
+                    "Rank": prop("IntProperty", rng.randint(0, 4)),
+                }
+                for work in ("EmitFlame", "Watering", "Seeding", "Handcraft")
+            ],
+            "type_name": "PalWorkSuitabilityInfo",
+            "id": ZERO_GUID,
+        },
+        "type": "ArrayProperty",
+    }
+
+
+def guid_array(prop_name: str, values: list[str]):
+    return {
+        "array_type": "StructProperty",
+        "id": None,
+        "value": {
+            "prop_name": prop_name,
+            "prop_type": "StructProperty",
+            "values": values,
+            "type_name": "Guid",
+            "id": ZERO_GUID,
+        },
+        "type": "ArrayProperty",
+    }
+
+
+def character_entry(player_uid: str, instance_id: str, group_id: str, params: dict):
+    return {
+        "key": {
+            "PlayerUId": guid_struct(player_uid),
+            "InstanceId": guid_struct(instance_id),
+            "DebugName": prop("StrProperty", ""),
+        },
+        "value": {
+            "RawData": {
+                "array_type": "ByteProperty",
+                "id": None,
+                "value": {
+                    "object": {
+                        "SaveParameter": struct(
+                            "PalIndividualCharacterSaveParameter", params
+                        )
+                    },
+                    "unknown_bytes": [0, 0, 0, 0],
+                    "group_id": group_id,
+                },
+                "type": "ArrayProperty",
+                "custom_type": CHARACTER_RAW_DATA,
+            }
+        },
+    }
+
+
+def player_parameter(rng: random.Random, nickname: str):
+    level = rng.randint(1, 50)
+    return {
+        "Level": prop("IntProperty", level),
+        "Exp": prop("IntProperty", EXP_TABLE.player.exp_for_level(level)),
+        "NickName": prop("StrProperty", nickname),
+        "HP": fixed_point(rng.randint(100, 2000) * 1000),
+        "FullStomach": prop("FloatProperty", 100.0),
+        "IsPlayer": prop("BoolProperty", True),
+        "Support": prop("IntProperty", 100),
+        "CraftSpeed": prop("IntProperty", 100),
+        "CraftSpeeds": craft_speeds(rng),
+        "VoiceID": prop("IntProperty", rng.randint(1, 4)),
+    }
+
+
+def pal_parameter(
+    rng: random.Random, owner_uid: str, container_id: str, slot_index: int
+):
+    level = rng.randint(1, 50)
+    passive_skills = rng.sample(PASSIVE_SKILLS, rng.randint(0, 4))
+    waza = rng.sample(ACTION_SKILLS, rng.randint(1, 6))
+    return {
+        "CharacterID": prop("NameProperty", rng.choice(CHARACTER_IDS)),
+        "Gender": enum(
+            "EPalGenderType",
+            rng.choice(["EPalGenderType::Male", "EPalGenderType::Female"]),
+        ),
+        "Level": prop("IntProperty", level),
+        "Exp": prop("IntProperty", EXP_TABLE.pal.exp_for_level(level)),
+        "Rank": prop("IntProperty", rng.randint(1, 5)),
+        "EquipWaza": enum_array(waza[:3]),
+        "MasteredWaza": enum_array(waza),
+        "HP": fixed_point(rng.randint(100, 5000) * 1000),
+        "MaxHP": fixed_point(rng.randint(100, 5000) * 1000),
+        "Talent_HP": prop("IntProperty", rng.randint(0, 100)),
+        "Talent_Melee": prop("IntProperty", rng.randint(0, 100)),
+        "Talent_Shot": prop("IntProperty", rng.randint(0, 100)),
+        "Talent_Defense": prop("IntProperty", rng.randint(0, 100)),
+        "FullStomach": prop("FloatProperty", float(rng.randint(0, 300))),
+        "PassiveSkillList": enum_array(passive_skills, "NameProperty"),
+        "OwnerPlayerUId": guid_struct(owner_uid),
+        "OldOwnerPlayerUIds": guid_array("OldOwnerPlayerUIds", [owner_uid]),
+        "CraftSpeed": prop("IntProperty", 100),
+        "CraftSpeeds": craft_speeds(rng),
+        "EquipItemContainerId": struct(
+            "PalContainerId", {"ID": guid_struct(ZERO_GUID)}
+        ),
+        "SlotID": struct(
+            "PalCharacterSlotId",
+            {
+                "ContainerId": struct(
+                    "PalContainerId", {"ID": guid_struct(container_id)}
+                ),
+                "SlotIndex": prop("IntProperty", slot_index),
+            },
+        ),
+    }
+
+
+def group_entry(group_id: str, guild_name: str, base_ids: list[str], players: list):
+    return {
+        "key": group_id,
+        "value": {
+            "GroupType": enum("EPalGroupType", "EPalGroupType::Guild"),
+            "RawData": {
+                "array_type": "ByteProperty",
+                "id": None,
+                "value": {
+                    "group_type": "EPalGroupType::Guild",
+                    "group_id": group_id,
+                    "group_name": guild_name,
+                    "individual_character_handle_ids": [],
+                    "org_type": 0,
+                    "base_ids": base_ids,
+                    "base_camp_level": 1 + len(base_ids),
+                    "map_object_instance_ids_base_camp_points": [],
+                    "guild_name": guild_name,
+                    "admin_player_uid": players[0]["player_uid"] if players else ZERO_GUID,
+                    "players": players,
+                },
+                "type": "ArrayProperty",
+            },
+        },
+    }
+
+
+def container_entry(container_id: str, slots: list[tuple[str, str]]):
+    return {
+        "key": {"ID": guid_struct(container_id)},
+        "value": {
+            "Slots": {
+                "array_type": "StructProperty",
+                "id": None,
+                "value": {
+                    "prop_name": "Slots",
+                    "prop_type": "StructProperty",
+                    "values": [
+                        {
+                            "SlotIndex": prop("IntProperty", index),
+                            "RawData": {
+                                "array_type": "ByteProperty",
+                                "id": None,
+                                "value": {
+                                    "player_uid": player_uid,
+                                    "instance_id": instance_id,
+                                    "permission_tribe_id": 0,
+                                },
+                                "type": "ArrayProperty",
+                                "custom_type": CONTAINER_RAW_DATA,
+                            },
+                        }
+                        for index, (player_uid, instance_id) in enumerate(slots)
+                    ],
+                    "type_name": "PalCharacterSlotSaveData",
+                    "id": ZERO_GUID,
+                },
+                "type": "ArrayProperty",
+            }
+        },
+    }
+
+
+def map_property(key_struct_type, value_struct_type, values, **kwargs):
+    return {
+        "key_type": "StructProperty",
+        "value_type": "StructProperty",
+        "key_struct_type": key_struct_type,
+        "value_struct_type": value_struct_type,
+        "id": None,
+        "value": values,
+        "type": "MapProperty",
+        **kwargs,
+    }
+
+
+def generate_world(
+    guilds: int = 10,
+    players: int = 4,
+    pals: int = 1000,
+    *,
+    containers_per_player: int = 2,
+    seed: int = 0,
+):
+    """按给定规模生成一个结构合法的世界存档字典。
+
+    guilds 为公会数量，players 为每个公会的玩家数量，pals 为帕鲁总数。
+    结果与 convert_sav_to_dict 的返回值同构，可直接交给 Application 或
+    convert_dict_to_sav 使用。相同的 seed 总是生成相同的世界。
+    """
+    rng = random.Random(seed)
+    characters = []
+    groups = []
+    containers = []
+    owners = []
+    for g in range(guilds):
+        group_id = new_guid(rng)
+        members = []
+        for p in range(players):
+            player_uid = new_guid(rng)
+            nickname = f"Player {g}-{p}"
+            last_online = REAL_DATE_TIME_TICKS - rng.randint(0, 90) * TICKS_PER_DAY
+            members.append(
+                {
+                    "player_uid": player_uid,
+                    "player_info": {
+                        "last_online_real_time": last_online,
+                        "player_name": nickname,
+                    },
+                }
+            )
+            characters.append(
+                character_entry(
+                    player_uid,
+                    new_guid(rng),
+                    group_id,
+                    player_parameter(rng, nickname),
+                )
+            )
+            for _ in range(containers_per_player):
+                owners.append((player_uid, group_id, new_guid(rng), []))
+        base_ids = [new_guid(rng) for _ in range(rng.randint(0, 3))]
+        groups.append(group_entry(group_id, f"Guild {g}", base_ids, members))
+    for i in range(pals):
+        player_uid, group_id, container_id, slots = owners[i % len(owners)]
+        instance_id = new_guid(rng)
+        characters.append(
+            character_entry(
+                ZERO_GUID,
+                instance_id,
+                group_id,
+                pal_parameter(rng, player_uid, container_id, len(slots)),
+            )
+        )
+        slots.append((ZERO_GUID, instance_id))
+    for player_uid, group_id, container_id, slots in owners:
+        containers.append(container_entry(container_id, slots))
+    world_save_data = {
+        "CharacterSaveParameterMap": map_property(
+            "StructProperty", "StructProperty", characters
+        ),
+        "GroupSaveDataMap": map_property(
+            "Guid", "StructProperty", groups, custom_type=GROUP_SAVE_DATA_MAP
+        ),
+        "CharacterContainerSaveData": map_property(
+            "StructProperty", "StructProperty", containers
+        ),
+        "GameTimeSaveData": struct(
+            "PalGameTimeSaveData",
+            {
+                "GameDateTimeTicks": prop("Int64Property", REAL_DATE_TIME_TICKS),
+                "RealDateTimeTicks": prop("Int64Property", REAL_DATE_TIME_TICKS),
+            },
+        ),
+    }
+    return {
+        "header": {
+            "magic": 0x53415647,
+            "save_game_version": 3,
+            "package_file_version_ue4": 522,
+            "package_file_version_ue5": 1008,
+            "engine_version_major": 5,
+            "engine_version_minor": 1,
+            "engine_version_patch": 1,
+            "engine_version_changelist": 0,
+            "engine_version_branch": "++UE5+Release-5.1",
+            "custom_version_format": 3,
+            "custom_versions": [],
+            "save_game_class_name": "/Script/Pal.PalWorldSaveGame",
+        },
+        "properties": {
+            "worldSaveData": struct("PalWorldSaveData", world_save_data),
+        },
+        "trailer": "AAAAAA==",
+    }
+
+
+def write_sav(data: dict, output_path: Path, *, keep_data: bool = True):
+    # convert_dict_to_sav 会就地改写 RawData，需要继续使用 data 时先复制一份
+    import copy
+
+    from run import convert_dict_to_sav
+
+    convert_dict_to_sav(copy.deepcopy(data) if keep_data else data, output_path)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="生成合成的 Palworld 世界存档")
+    parser.add_argument("output", type=Path, help=".sav 或 .json 输出路径")
+    parser.add_argument("--guilds", type=int, default=10)
+    parser.add_argument("--players", type=int, default=4, help="每个公会的玩家数量")
+    parser.add_argument("--pals", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    world = generate_world(args.guilds, args.players, args.pals, seed=args.seed)
+    if args.output.suffix == ".json":
+        import json
+
+        args.output.write_text(
+            json.dumps(world, ensure_ascii=False, indent="\t"), encoding="utf-8"
+        )
+    else:
+        write_sav(world, args.output, keep_data=False)
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# 编辑器的模块都在仓库根目录下，不是一个包
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
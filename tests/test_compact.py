@@ -0,0 +1,130 @@
+import pytest
+
+from compact import (
+    MISSING_CONTAINER,
+    MISSING_GROUP,
+    UNKNOWN_GROUP,
+    container_entries,
+    find_orphans,
+    group_entries,
+    prune,
+    world_save_data,
+)
+from run import ZERO_GUID
+from synth import generate_world
+
+MISSING_ID = "22222222-2222-2222-2222-222222222222"
+EMPTY_GROUP_ID = "33333333-3333-3333-3333-333333333333"
+USED_GROUP_ID = "44444444-4444-4444-4444-444444444444"
+
+
+def characters(data: dict):
+    return world_save_data(data)["CharacterSaveParameterMap"]["value"]
+
+
+def instance_id(entry: dict):
+    return entry["key"]["InstanceId"]["value"]
+
+
+def raw_value(entry: dict):
+    return entry["value"]["RawData"]["value"]
+
+
+def unknown_group(group_id: str, instance_ids: list[str]):
+    # 没有 base_camp_level 的组，结构与公会不同
+    return {
+        "key": group_id,
+        "value": {
+            "RawData": {
+                "value": {
+                    "group_type": "EPalGroupType::Neutral",
+                    "group_id": group_id,
+                    "individual_character_handle_ids": [
+                        {"guid": ZERO_GUID, "instance_id": i} for i in instance_ids
+                    ],
+                }
+            }
+        },
+    }
+
+
+@pytest.fixture
+def world():
+    data = generate_world(guilds=2, players=2, pals=40, seed=5)
+    entries = characters(data)
+    player = next(e for e in entries if e["key"]["PlayerUId"]["value"] != ZERO_GUID)
+    pals = [e for e in entries if e["key"]["PlayerUId"]["value"] == ZERO_GUID]
+    missing_container, missing_group, kept = pals[:3]
+    raw_value(missing_container)["object"]["SaveParameter"]["value"]["SlotID"][
+        "value"
+    ]["ContainerId"]["value"]["ID"]["value"] = MISSING_ID
+    raw_value(missing_group)["group_id"] = MISSING_ID
+    raw_value(player)["group_id"] = MISSING_ID
+    guild = group_entries(data)[0]["value"]["RawData"]["value"]
+    guild["individual_character_handle_ids"] = [
+        {"guid": ZERO_GUID, "instance_id": instance_id(e)}
+        for e in (missing_container, missing_group, kept)
+    ]
+    group_entries(data).append(unknown_group(EMPTY_GROUP_ID, []))
+    group_entries(data).append(unknown_group(USED_GROUP_ID, [instance_id(kept)]))
+    ids = {
+        "player": instance_id(player),
+        "missing_container": instance_id(missing_container),
+        "missing_group": instance_id(missing_group),
+        "kept": instance_id(kept),
+    }
+    return data, ids
+
+
+def test_find_orphans(world):
+    data, ids = world
+    report = find_orphans(data)
+    assert {(o.reason, o.instance_id) for o in report.characters} == {
+        (MISSING_CONTAINER, ids["missing_container"]),
+        (MISSING_GROUP, ids["missing_group"]),
+        (MISSING_GROUP, ids["player"]),
+    }
+    assert {(o.instance_id, o.handle_count) for o in report.groups} == {
+        (EMPTY_GROUP_ID, 0),
+        (USED_GROUP_ID, 1),
+    }
+    assert all(o.reason == UNKNOWN_GROUP for o in report.groups)
+
+
+def test_prune_never_removes_players(world):
+    data, ids = world
+    report = find_orphans(data)
+    assert ids["player"] not in report.prunable_instance_ids()
+    prune(data, report, unknown_groups=True)
+    assert ids["player"] in {instance_id(e) for e in characters(data)}
+
+
+def test_prune_clears_references(world):
+    data, ids = world
+    orphans = {ids["missing_container"], ids["missing_group"]}
+    removed = prune(data, find_orphans(data))
+    assert removed == (2, 0)
+    remaining = {instance_id(e) for e in characters(data)}
+    assert not orphans & remaining
+    assert ids["kept"] in remaining
+    for entry in group_entries(data):
+        handles = entry["value"]["RawData"]["value"]["individual_character_handle_ids"]
+        assert not orphans & {handle["instance_id"] for handle in handles}
+    slots = {
+        slot["RawData"]["value"]["instance_id"]
+        for entry in container_entries(data)
+        for slot in entry["value"]["Slots"]["value"]["values"]
+    }
+    assert not orphans & slots
+    assert ids["kept"] in slots
+
+
+def test_prune_unknown_groups_only_when_empty(world):
+    data, _ = world
+    report = find_orphans(data)
+    assert prune(data, report)[1] == 0
+    assert len(group_entries(data)) == 4
+    assert prune(data, report, unknown_groups=True)[1] == 1
+    group_ids = {raw_value(entry)["group_id"] for entry in group_entries(data)}
+    assert EMPTY_GROUP_ID not in group_ids
+    assert USED_GROUP_ID in group_ids
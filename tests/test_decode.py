@@ -0,0 +1,53 @@
+import re
+
+import pytest
+
+from run import convert_sav_to_dict, decode_character_map, decompress_sav_file
+from synth import generate_world, write_sav
+
+
+@pytest.fixture(scope="module")
+def sav_path(tmp_path_factory):
+    path = tmp_path_factory.mktemp("decode") / "Level.sav"
+    write_sav(generate_world(guilds=2, players=2, pals=100, seed=2), path)
+    return path
+
+
+@pytest.fixture(scope="module")
+def serial(sav_path):
+    return convert_sav_to_dict(sav_path)
+
+
+@pytest.mark.parametrize("workers", [2, 3])
+def test_parallel_decode_matches_serial(sav_path, serial, workers):
+    assert convert_sav_to_dict(sav_path, decode_workers=workers) == serial
+
+
+def test_chunked_decode_keeps_order(sav_path, serial):
+    # 块大小不整除条目数，检验各块结果按原顺序写回
+    data = convert_sav_to_dict(sav_path, lazy_character_data=True)
+    assert decode_character_map(data, 3, chunk_size=7) == serial
+
+
+@pytest.mark.parametrize(
+    "content, message",
+    [
+        (b"", "file is too short (0 bytes)"),
+        (b"\x00" * 5, "file is too short (5 bytes)"),
+        (b"\x00" * 100, "found too many null bytes"),
+        (b"hello world, not a save", "found b'rld' instead of b'PlZ'"),
+    ],
+)
+def test_decompress_errors(tmp_path, content, message):
+    path = tmp_path / "bad.sav"
+    path.write_bytes(content)
+    with pytest.raises(Exception, match=re.escape(message)):
+        decompress_sav_file(path)
+
+
+def test_decompress_truncated(sav_path, tmp_path):
+    path = tmp_path / "truncated.sav"
+    content = sav_path.read_bytes()
+    path.write_bytes(content[: len(content) // 2])
+    with pytest.raises(Exception, match="Palworld save"):
+        decompress_sav_file(path)
@@ -0,0 +1,28 @@
+import json
+
+from run import MAX_INTERN_LENGTH, load_json
+from synth import generate_world
+
+
+def test_interned_load_matches_json_loads():
+    text = json.dumps(generate_world(guilds=2, players=2, pals=50, seed=4))
+    assert load_json(text) == json.loads(text)
+    assert load_json(text, intern_strings=False) == json.loads(text)
+
+
+def test_short_strings_are_shared():
+    short = "EPalGenderType::Male"
+    data = load_json(json.dumps({"a": {"value": short}, "b": [short, short]}))
+    assert data["a"]["value"] is data["b"][0] is data["b"][1]
+
+
+def test_long_strings_are_not_interned():
+    # 超过 MAX_INTERN_LENGTH 的字符串 (例如 base64 数据) 不驻留
+    boundary = "x" * MAX_INTERN_LENGTH
+    long = "y" * (MAX_INTERN_LENGTH + 1)
+    data = load_json(
+        json.dumps({"a": {"s": boundary, "l": long}, "b": {"s": boundary, "l": long}})
+    )
+    assert data["a"]["s"] is data["b"]["s"]
+    assert data["a"]["l"] == data["b"]["l"]
+    assert data["a"]["l"] is not data["b"]["l"]
@@ -0,0 +1,81 @@
+import copy
+import json
+import math
+from pathlib import Path
+
+import pytest
+
+import palbin
+from run import convert_dict_to_sav, convert_sav_to_dict
+from synth import generate_world, write_sav
+
+
+@pytest.fixture(scope="module")
+def world():
+    return generate_world(guilds=2, players=2, pals=50, seed=1)
+
+
+@pytest.fixture(scope="module")
+def json_dict(world, tmp_path_factory):
+    # 与 “保存为 JSON” 再读回得到的字典相同
+    path = tmp_path_factory.mktemp("palbin") / "Level.sav"
+    write_sav(world, path)
+    return json.loads(json.dumps(convert_sav_to_dict(path)))
+
+
+@pytest.mark.parametrize("compress", [True, False])
+def test_round_trip_synth_world(world, compress):
+    assert palbin.loads(palbin.dumps(world, compress=compress)) == world
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        1 << 64,
+        -(1 << 64) - 1,
+        10**40,
+        palbin.I64_MAX,
+        palbin.I64_MIN,
+        b"",
+        b"\x00\xffRawData",
+        math.inf,
+        -math.inf,
+        -0.0,
+        {},
+        [],
+        "",
+        "帕鲁 Pal ✓ \U0001f600",
+        {"键": ["值", {"ネスト": "é"}]},
+        [{"id": 1, "value": 2}, {"id": 3, "value": 4}, {"value": 5, "id": 6}],
+        {"a": {}, "b": [], "c": [[]], "d": [{}]},
+    ],
+)
+def test_round_trip_edge_values(value):
+    wrapped = {"value": value, "list": [value, value]}
+    assert palbin.loads(palbin.dumps(wrapped)) == wrapped
+
+
+def test_round_trip_nan():
+    result = palbin.loads(palbin.dumps({"nan": math.nan, "list": [math.nan]}))
+    assert math.isnan(result["nan"]) and math.isnan(result["list"][0])
+
+
+def test_bytes_like_values_load_as_bytes():
+    data = {"a": bytearray(b"xy"), "b": memoryview(b"zw")}
+    assert palbin.loads(palbin.dumps(data)) == {"a": b"xy", "b": b"zw"}
+
+
+def test_repeated_shapes_share_keys():
+    data = [{"id": i, "value": str(i), "type": "t"} for i in range(100)]
+    result = palbin.loads(palbin.dumps(data))
+    assert result == data
+    assert all(r.keys() == data[0].keys() for r in result)
+
+
+def test_sav_bytes_match_json_path(json_dict, tmp_path: Path):
+    from_json = tmp_path / "from_json.sav"
+    from_palbin = tmp_path / "from_palbin.sav"
+    # convert_dict_to_sav 会就地改写字典，各自使用一份副本
+    convert_dict_to_sav(copy.deepcopy(json_dict), from_json)
+    convert_dict_to_sav(palbin.loads(palbin.dumps(json_dict)), from_palbin)
+    assert from_palbin.read_bytes() == from_json.read_bytes()
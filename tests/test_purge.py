@@ -0,0 +1,154 @@
+import pytest
+
+from compact import container_entries, group_entries, world_save_data
+from purge import apply_purge, plan_purge
+from run import TICKS_PER_DAY, ZERO_GUID
+from synth import generate_world
+
+BASE_ID = "11111111-1111-1111-1111-111111111111"
+
+
+def save_parameter(entry: dict):
+    return entry["value"]["RawData"]["value"]["object"]["SaveParameter"]["value"]
+
+
+def owner_of(entry: dict):
+    return save_parameter(entry)["OwnerPlayerUId"]["value"]
+
+
+def container_of(entry: dict):
+    return save_parameter(entry)["SlotID"]["value"]["ContainerId"]["value"]["ID"][
+        "value"
+    ]
+
+
+def pal_entries(data: dict):
+    return [
+        entry
+        for entry in world_save_data(data)["CharacterSaveParameterMap"]["value"]
+        if "OwnerPlayerUId" in save_parameter(entry)
+    ]
+
+
+@pytest.fixture
+def world():
+    # 公会 0 全员不活跃且没有据点，公会 1 只有管理员不活跃，公会 2 全员不活跃但有据点
+    data = generate_world(guilds=3, players=2, pals=60, seed=3)
+    now = world_save_data(data)["GameTimeSaveData"]["value"]["RealDateTimeTicks"][
+        "value"
+    ]
+    inactive = {0: [0, 1], 1: [0], 2: [0, 1]}
+    for g, entry in enumerate(group_entries(data)):
+        group_data = entry["value"]["RawData"]["value"]
+        group_data["base_ids"] = [] if g < 2 else [BASE_ID]
+        for p, player in enumerate(group_data["players"]):
+            days = 60 if p in inactive[g] else 1
+            player["player_info"]["last_online_real_time"] = now - days * TICKS_PER_DAY
+    return data
+
+
+def guild(data: dict, index: int):
+    return group_entries(data)[index]["value"]["RawData"]["value"]
+
+
+def player_uids(data: dict, index: int):
+    return [player["player_uid"] for player in guild(data, index)["players"]]
+
+
+def containers_by_owner(data: dict):
+    containers: dict[str, set[str]] = {}
+    for entry in pal_entries(data):
+        containers.setdefault(owner_of(entry), set()).add(container_of(entry))
+    return containers
+
+
+def test_plan_selects_inactive_players(world):
+    plan = plan_purge(world, 30)
+    purged = player_uids(world, 0) + player_uids(world, 1)[:1] + player_uids(world, 2)
+    assert set(plan.players) == set(purged)
+    assert plan.groups == {guild(world, 0)["group_id"]}
+    assert plan.kept_groups == {guild(world, 2)["group_id"]: 1}
+    assert plan.containers == set()
+    owned = {
+        entry["key"]["InstanceId"]["value"]
+        for entry in pal_entries(world)
+        if owner_of(entry) in plan.players
+    }
+    players = {
+        entry["key"]["InstanceId"]["value"]
+        for entry in world_save_data(world)["CharacterSaveParameterMap"]["value"]
+        if entry["key"]["PlayerUId"]["value"] in plan.players
+    }
+    assert plan.instance_ids == owned | players
+
+
+def test_plan_removes_guild_workers(world):
+    # OwnerPlayerUId 为空的帕鲁属于公会，公会被删除时一并删除
+    worker = next(
+        entry
+        for entry in pal_entries(world)
+        if owner_of(entry) in player_uids(world, 0)
+    )
+    save_parameter(worker)["OwnerPlayerUId"]["value"] = ZERO_GUID
+    plan = plan_purge(world, 30)
+    assert worker["key"]["InstanceId"]["value"] in plan.instance_ids
+
+
+def test_apply_removes_characters_and_slots(world):
+    plan = plan_purge(world, 30)
+    removed_characters, removed_groups, removed_containers = apply_purge(world, plan)
+    assert removed_characters == len(plan.instance_ids)
+    assert (removed_groups, removed_containers) == (1, 0)
+    remaining = world_save_data(world)["CharacterSaveParameterMap"]["value"]
+    assert not any(
+        entry["key"]["InstanceId"]["value"] in plan.instance_ids for entry in remaining
+    )
+    assert not any(owner_of(entry) in plan.players for entry in pal_entries(world))
+    for entry in container_entries(world):
+        for slot in entry["value"]["Slots"]["value"]["values"]:
+            assert slot["RawData"]["value"]["instance_id"] not in plan.instance_ids
+
+
+def test_apply_updates_guild_members(world):
+    active = player_uids(world, 1)[1]
+    apply_purge(world, plan_purge(world, 30))
+    # 公会 0 被删除，公会 2 因仍有据点而保留
+    assert len(group_entries(world)) == 2
+    assert player_uids(world, 0) == [active]
+    assert guild(world, 0)["admin_player_uid"] == active
+    assert player_uids(world, 1) == []
+    assert guild(world, 1)["admin_player_uid"] == ZERO_GUID
+
+
+def test_apply_removes_only_player_containers(world):
+    containers = containers_by_owner(world)
+    first, second = player_uids(world, 0)
+    shared = next(iter(containers[player_uids(world, 1)[1]]))
+    own = containers[first] | containers[second]
+    plan = plan_purge(world, 30, lambda player_uid: containers[player_uid] | {shared})
+    # 仍有活跃玩家帕鲁的容器不会被删除
+    assert own <= plan.containers
+    assert shared not in plan.containers
+    apply_purge(world, plan)
+    container_ids = {entry["key"]["ID"]["value"] for entry in container_entries(world)}
+    assert not own & container_ids
+    assert shared in container_ids
+
+
+def test_apply_keeps_other_containers(world):
+    # 未被列为玩家容器的容器 (例如据点工作容器) 只清空槽位
+    plan = plan_purge(world, 30)
+    purged_containers = {
+        container_of(entry)
+        for entry in pal_entries(world)
+        if entry["key"]["InstanceId"]["value"] in plan.instance_ids
+    }
+    apply_purge(world, plan)
+    container_ids = {entry["key"]["ID"]["value"] for entry in container_entries(world)}
+    assert purged_containers <= container_ids
+    for entry in container_entries(world):
+        if entry["key"]["ID"]["value"] in purged_containers:
+            slots = entry["value"]["Slots"]["value"]["values"]
+            assert all(
+                slot["RawData"]["value"]["instance_id"] == ZERO_GUID for slot in slots
+            )
@@ -33,7 +33,8 @@ CHARACTER_IDS = [
     for k, v in DT_PMP.items()
     if v["ZukanIndex"] > 0 and rich_zukan_index(v) != "013B"
 ]
-CHARACTER_IDS += [f"BOSS_{i}" for i in CHARACTER_IDS]
+BOSS_PREFIX = "BOSS_"
+CHARACTER_IDS += [f"{BOSS_PREFIX}{i}" for i in CHARACTER_IDS]
 PREFIX_ACTION_SKILL = "ACTION_SKILL_"
 PREFIX_E_PAL_WAZA_ID = "EPalWazaID::"
 ACTION_SKILLS_NAME_TEXT_ZH = {
@@ -0,0 +1,257 @@
+"""据点工作帕鲁的分配建议。
+
+每只帕鲁对每种工作的得分为::
+
+    种族的 WorkSuitability 等级 * 种族 CraftSpeed / 100
+        * (1 + 作用于自身的 CraftSpeed 被动加成) * (1 + Rank_CraftSpeed * 0.03)
+        * 在岗时间 (夜行性种族或拥有 Nocturnal 被动为 1，否则为 DAYTIME_UPTIME)
+
+只计入在据点工作时生效的被动技能 (InvokeAlways / InvokeWorker /
+InvokeInBaseCamp)。得分先按列为公会拥有的全部帕鲁一次算出，再为每个据点
+依次挑选工作帕鲁：据点的价值是每种工作按得分从高到低以 DECAY 衰减后的总和，
+每次选入边际收益最大的帕鲁 (收益只会随阵容变大而减少，因此用惰性更新的堆，
+大部分候选无需重新计算)，多个据点轮流挑选，同一只帕鲁只会分配到一个据点::
+
+    python workopt.py Level.sav --guild 公会名称或 ID --cap 15
+"""
+
+from __future__ import annotations
+
+import heapq
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+from palstats import SELF_TARGET_TYPES
+from unpack import DT_PMP, DT_PSM
+
+WORK_TYPES = (
+    "EmitFlame",
+    "Watering",
+    "Seeding",
+    "GenerateElectricity",
+    "Handcraft",
+    "Collection",
+    "Deforest",
+    "Mining",
+    "OilExtraction",
+    "ProductMedicine",
+    "Cool",
+    "Transport",
+    "MonsterFarm",
+)
+CRAFT_SPEED_EFFECT = "EPalPassiveSkillEffectType::CraftSpeed"
+NOCTURNAL_EFFECT = "EPalPassiveSkillEffectType::Nocturnal"
+WORKER_INVOKE_FLAGS = ("InvokeAlways", "InvokeWorker", "InvokeInBaseCamp")
+# 世界设置 BaseCampWorkerMaxNum 的默认值
+DEFAULT_WORKER_CAP = 15
+# 非夜行性帕鲁夜间睡觉，按一天中白天所占的比例计算在岗时间
+DAYTIME_UPTIME = 0.6
+SOUL_RATE = 0.03
+# 同一种工作中第 n 好的帕鲁按 DECAY ** n 计入据点价值
+DECAY = 0.5
+
+
+def worker_passive_effects(passive_skills: dict):
+    craft_speed: dict[str, float] = {}
+    nocturnal: set[str] = set()
+    for skill_id, skill in passive_skills.items():
+        if not any(skill.get(flag) for flag in WORKER_INVOKE_FLAGS):
+            continue
+        for n in (1, 2, 3):
+            if skill[f"TargetType{n}"] not in SELF_TARGET_TYPES:
+                continue
+            if skill[f"EffectType{n}"] == CRAFT_SPEED_EFFECT:
+                craft_speed[skill_id] = (
+                    craft_speed.get(skill_id, 0.0) + skill[f"EffectValue{n}"] / 100
+                )
+            elif skill[f"EffectType{n}"] == NOCTURNAL_EFFECT:
+                nocturnal.add(skill_id)
+    return craft_speed, nocturnal
+
+
+class WorkScorer:
+    def __init__(self, monster_parameters: dict, passive_skills: dict):
+        self.species_index: dict[str, int] = {}
+        # suitability[工作][行]，craft_speed[行]，nocturnal[行]
+        self.suitability: list[list[int]] = [[] for _ in WORK_TYPES]
+        self.craft_speed: list[float] = []
+        self.nocturnal: list[bool] = []
+        for character_id, param in monster_parameters.items():
+            self.species_index[character_id.casefold()] = len(self.craft_speed)
+            for column, work in zip(self.suitability, WORK_TYPES):
+                column.append(param[f"WorkSuitability_{work}"])
+            self.craft_speed.append(param["CraftSpeed"] / 100)
+            self.nocturnal.append(param["Nocturnal"])
+        self.passive_craft_speed, self.passive_nocturnal = worker_passive_effects(
+            passive_skills
+        )
+
+    def speed_and_uptime(self, pal):
+        passive_craft_speed = self.passive_craft_speed
+        bonus = 1.0
+        nocturnal = False
+        for skill_id in pal.passive_skill_list:
+            bonus += passive_craft_speed.get(skill_id, 0.0)
+            nocturnal = nocturnal or skill_id in self.passive_nocturnal
+        return max(bonus, 0.0) * (1 + pal.rank_craft_speed * SOUL_RATE), nocturnal
+
+    def score(self, pals: Iterable) -> list[tuple[float, ...]]:
+        # 返回与 pals 对应的每种工作的得分，种族不在数据表中的帕鲁全为 0
+        pals = list(pals)
+        rows = [self.species_index.get(pal.character_id.casefold()) for pal in pals]
+        multipliers = []
+        for pal, row in zip(pals, rows):
+            if row is None:
+                multipliers.append(0.0)
+                continue
+            speed, nocturnal = self.speed_and_uptime(pal)
+            uptime = 1.0 if nocturnal or self.nocturnal[row] else DAYTIME_UPTIME
+            multipliers.append(self.craft_speed[row] * speed * uptime)
+        columns = [
+            [
+                column[row] * multiplier if row is not None else 0.0
+                for row, multiplier in zip(rows, multipliers)
+            ]
+            for column in self.suitability
+        ]
+        return list(zip(*columns))
+
+
+@dataclass
+class Roster:
+    base_id: str
+    pals: list = field(default_factory=list)
+    # 每种工作中已选帕鲁的得分，从高到低
+    scores: list[list[float]] = field(default_factory=lambda: [[] for _ in WORK_TYPES])
+    value: float = 0.0
+
+    def gain(self, pal_scores: tuple[float, ...], weights: tuple[float, ...]):
+        total = 0.0
+        for work, score in enumerate(pal_scores):
+            if not score:
+                continue
+            current = self.scores[work]
+            # 插入位置之后的帕鲁各自再衰减一次
+            rank = 0
+            while rank < len(current) and current[rank] >= score:
+                rank += 1
+            tail = sum(s * DECAY**i for i, s in enumerate(current[rank:], rank))
+            total += weights[work] * (score * DECAY**rank - tail * (1 - DECAY))
+        return total
+
+    def add(self, pal, pal_scores: tuple[float, ...], gain: float):
+        self.pals.append(pal)
+        for work, score in enumerate(pal_scores):
+            if score:
+                self.scores[work].append(score)
+                self.scores[work].sort(reverse=True)
+        self.value += gain
+
+    def coverage(self):
+        return {
+            work: sum(scores) for work, scores in zip(WORK_TYPES, self.scores) if scores
+        }
+
+
+def plan_rosters(
+    pals: list,
+    base_ids: list[str],
+    *,
+    cap: int = DEFAULT_WORKER_CAP,
+    weights: dict[str, float] | None = None,
+    scorer: WorkScorer | None = None,
+):
+    scorer = scorer or WORK_SCORER
+    weights = tuple((weights or {}).get(work, 1.0) for work in WORK_TYPES)
+    scores = scorer.score(pals)
+    rosters = [Roster(base_id) for base_id in base_ids]
+    # 每个据点一个堆，元素为 (-上次计算的收益, 帕鲁序号, 计算时阵容的大小)
+    heaps = []
+    for roster in rosters:
+        heap = [
+            (-roster.gain(pal_scores, weights), i, 0)
+            for i, pal_scores in enumerate(scores)
+            if any(pal_scores)
+        ]
+        heapq.heapify(heap)
+        heaps.append(heap)
+    taken: set[int] = set()
+    for _ in range(cap):
+        for roster, heap in zip(rosters, heaps):
+            while heap:
+                negative_gain, i, size = heapq.heappop(heap)
+                if i in taken:
+                    continue
+                if size == len(roster.pals):
+                    if -negative_gain > 0:
+                        roster.add(pals[i], scores[i], -negative_gain)
+                        taken.add(i)
+                    break
+                heapq.heappush(
+                    heap, (-roster.gain(scores[i], weights), i, len(roster.pals))
+                )
+    return rosters
+
+
+WORK_SCORER = WorkScorer(DT_PMP, DT_PSM)
+
+
+if __name__ == "__main__":
+    import argparse
+    from pathlib import Path
+    from time import perf_counter
+
+    from run import load_world
+
+    parser = argparse.ArgumentParser(description="为公会的每个据点推荐工作帕鲁")
+    parser.add_argument("save", type=Path)
+    parser.add_argument("--guild", required=True, help="公会 ID 或名称")
+    parser.add_argument("--cap", type=int, default=DEFAULT_WORKER_CAP)
+    parser.add_argument(
+        "--weight",
+        nargs=2,
+        action="append",
+        default=[],
+        metavar=("WORK", "WEIGHT"),
+        help="调整某种工作的权重，例如 --weight Mining 2",
+    )
+    args = parser.parse_args()
+    weights = {}
+    for work, weight in args.weight:
+        if work not in WORK_TYPES:
+            parser.error(f"unknown work {work}, choose from {', '.join(WORK_TYPES)}")
+        try:
+            weights[work] = float(weight)
+        except ValueError:
+            parser.error(f"invalid weight for {work}: {weight}")
+
+    ownership = load_world(args.save).ownership
+    guild = next(
+        (
+            guild
+            for group_id, guild in ownership.guilds.items()
+            if args.guild in (group_id, guild.guild_name)
+        ),
+        None,
+    )
+    if guild is None:
+        parser.error(f"guild not found: {args.guild}")
+    if not guild.base_ids:
+        parser.error(f"guild {args.guild} has no base camps")
+    pals = ownership.pals_of_guild(guild.group_id)
+    start = perf_counter()
+    rosters = plan_rosters(
+        pals,
+        guild.base_ids,
+        cap=args.cap,
+        weights=weights,
+    )
+    elapsed = (perf_counter() - start) * 1000
+    for roster in rosters:
+        print(f"== base {roster.base_id} (value {roster.value:.2f}) ==")
+        for pal in roster.pals:
+            passives = ", ".join(pal.passive_skill_list)
+            print(f"  {pal.instance_id}  {pal.character_id:<24}{passives}")
+        coverage = roster.coverage().items()
+        print("  " + ", ".join(f"{work} {value:.2f}" for work, value in coverage))
+    print(f"{len(pals)} pals, {len(rosters)} bases planned in {elapsed:.1f} ms")